@@ -3,20 +3,124 @@ import pandas as pd
 import json
 import re
 from datetime import datetime
-import PyPDF2
 import io
+import os
+import csv
+import copy
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import Dict, Any, List, Optional
-from openrouter_client import OpenRouterClient, get_recommended_models, format_model_info
+from openrouter_client import OpenRouterClient, ResponseCache, Cassette, get_recommended_models, format_model_info, run_concurrent_completions
+from application_tracker import APPLICATION_STATUSES, ApplicationTracker
+from document_ingestion import UnsupportedDocumentError, document_ingestor
+from url_ingestion import parse_url_list, url_ingestor
+from page_cache import PageCache
+from posting_dedup import PostingIndex
+from json_extraction import JSONExtractionError, StreamingJSONParser, extract_json
+from model_router import QUALITY_LABELS, TASK_SETTINGS, DEFAULT_QUALITY_FLOORS, ModelRouter, ModelStats
+from output_schemas import (
+    JOB_DETAILS_FORMAT, JOB_METADATA_FORMAT, JOB_REQUIREMENTS_FORMAT, PROFILE_FORMAT, RESUME_BULLETS_FORMAT
+)
+from resume_chunking import chunk_document, merge_profiles
+from prompt_budget import (
+    DEFAULT_CONTEXT_WINDOW, PromptBudget, context_window_for, estimate_tokens,
+    fit_experience, fit_list, fit_text, key_terms
+)
+from profile_index import get_profile_index, profile_content_hash
+from skill_matcher import match_requirements
+from semantic_matcher import DEFAULT_SEMANTIC_THRESHOLD
 
 # App title and configuration
 st.set_page_config(page_title="Smart Job Application Assistant", layout="wide")
 
+# One response cache shared by every session of this server process
+@st.cache_resource
+def get_response_cache():
+    return ResponseCache(os.environ.get("OPENROUTER_RESPONSE_CACHE", "llm_response_cache.sqlite3"))
+
+# Profile extraction splits documents into chunks of these sizes (resume prompt,
+# free-text prompt) and extracts up to MAX_PROFILE_CHUNKS of them concurrently
+RESUME_CHUNK_CHARS = 7000
+TEXT_CHUNK_CHARS = 10000
+MAX_PROFILE_CHUNKS = 8
+MAX_CONCURRENT_CHUNKS = 4
+
+# Most tokens of job description any generation prompt includes
+JOB_TEXT_MAX_TOKENS = 400
+
+# Characters of an uploaded document that profile extraction can use: as many
+# resume-sized chunks as are extracted (PDFs and DOCX files use the resume prompt)
+DOCUMENT_TEXT_BUDGET = RESUME_CHUNK_CHARS * MAX_PROFILE_CHUNKS
+
+# One application tracker shared by every session; imports the legacy CSV on first use
+@st.cache_resource
+def get_application_tracker():
+    tracker = ApplicationTracker(os.environ.get("JOB_TRACKER_DB", "job_applications.sqlite3"))
+    tracker.migrate_csv("job_applications.csv")
+    return tracker
+
+# Fetched job pages for conditional re-fetching, shared by every session
+@st.cache_resource
+def get_page_cache():
+    return PageCache(os.environ.get("JOB_PAGE_CACHE", "job_page_cache.sqlite3"))
+
+# Observed latency and failures of every model called, shared by every session
+@st.cache_resource
+def get_model_stats():
+    return ModelStats(os.environ.get("MODEL_STATS_DB", "model_stats.sqlite3"))
+
+# Record/replay of OpenRouter traffic, enabled by setting OPENROUTER_CASSETTE
+@st.cache_resource
+def get_cassette():
+    path = os.environ.get("OPENROUTER_CASSETTE")
+    if not path:
+        return None
+    return Cassette(
+        path,
+        mode=os.environ.get("OPENROUTER_CASSETTE_MODE", "replay"),
+        realtime=os.environ.get("OPENROUTER_CASSETTE_REALTIME", "1") != "0"
+    )
+
+
+# Model selection
+def get_actual_model_id(task_type, task=None):
+    """Model ID for a setting ("analysis" or "generation").
+    
+    A custom model or the category chosen in the sidebar; with "Automatic",
+    the router's pick for task (a model_router.TASK_SETTINGS key, defaulting
+    to the setting's main task).
+    """
+    if st.session_state.get('use_custom_model'):
+        return st.session_state.get(f'custom_{task_type}_model', get_recommended_models()["default"])
+    category = st.session_state.get(f'model_{task_type}', "default")
+    if category != "auto":
+        return get_recommended_models()[category]
+    
+    router = ModelRouter(get_model_stats(), floors=st.session_state.get('quality_floors'))
+    client = st.session_state.get('openrouter_client')
+    catalog = client.model_cache.peek(client.base_url) or [] if client is not None else []
+    task = task or ("job_extraction" if task_type == "analysis" else "cover_letter")
+    return router.pick(task, st.session_state.get('routing_objective', "fastest"), catalog)
+
+def model_for(task):
+    """Model ID for a task type (a model_router.TASK_SETTINGS key)"""
+    return get_actual_model_id(TASK_SETTINGS[task], task)
+
 # Configure the OpenRouter API
 def setup_api():
     with st.sidebar:
         st.title("Settings")
+        cassette = get_cassette()
         api_key = st.text_input("Enter your OpenRouter API Key", type="password")
         
+        if cassette is not None:
+            if cassette.replaying:
+                st.info(f"Replaying recorded AI responses from {cassette.path}")
+                # Replay never calls OpenRouter, so no key is needed
+                api_key = api_key or "replay"
+            else:
+                st.info(f"Recording AI responses to {cassette.path}")
+        
         if not api_key:
             st.warning("Please enter your OpenRouter API key to use AI features")
             st.markdown("""
@@ -25,13 +129,43 @@ def setup_api():
             return None
         
         try:
-            client = OpenRouterClient(api_key)
-            # Test the API key by listing models
+            # Reuse the client across reruns so its keep-alive connection pool survives
+            client = st.session_state.get('openrouter_client')
+            if client is None or client.api_key != api_key:
+                new_client = OpenRouterClient(api_key, cassette=cassette)
+                try:
+                    # Test the API key once per new client with an authenticated
+                    # request; the model list below is served from a shared cache
+                    new_client.check_key()
+                except Exception:
+                    new_client.close()
+                    raise
+                if client is not None:
+                    client.close()
+                client = new_client
+            # Warm the shared model catalog (reruns don't re-download it)
             client.list_models()
             
             # Store the client in session state
             st.session_state['openrouter_client'] = client
             
+            # Opt-in response cache: repeat analyses of the same posting are
+            # answered locally instead of calling the model again
+            use_response_cache = st.checkbox(
+                "Cache AI responses",
+                value=False,
+                help="Reuse earlier answers for identical requests (same model, prompt and temperature)"
+            )
+            client.response_cache = get_response_cache() if use_response_cache else None
+            # Every call's latency feeds the p50s below and automatic routing
+            client.model_stats = get_model_stats()
+            if use_response_cache:
+                cache_stats = client.response_cache.stats()
+                st.caption(
+                    f"Cache: {cache_stats['hits']} hits / {cache_stats['misses']} misses, "
+                    f"{cache_stats['entries']} stored responses"
+                )
+            
             # Model selection
             st.subheader("Model Settings")
             
@@ -42,9 +176,20 @@ def setup_api():
                 "powerful": "Claude 3.5 Sonnet (Powerful)",
                 "balanced": "GPT-4o Mini (Balanced)",
                 "creative": "Claude 3 Opus (Creative)",
-                "analysis": "Claude 3.5 Sonnet with Thinking (Analysis)"
+                "analysis": "Claude 3.5 Sonnet with Thinking (Analysis)",
+                "auto": "Automatic (learns from call timings)"
             }
             
+            def model_category_label(category):
+                """Category name with the observed p50 latency of its model, if it has been called"""
+                label = model_categories[category]
+                if category == "auto":
+                    return label
+                summary = get_model_stats().summary(get_recommended_models()[category])
+                if summary is None or summary["p50"] is None:
+                    return label
+                return f"{label} · p50 {summary['p50']:.1f}s"
+            
             # Set default models if not in session state
             if 'model_analysis' not in st.session_state:
                 st.session_state['model_analysis'] = "default"
@@ -56,24 +201,72 @@ def setup_api():
                 "Model for Job Analysis:",
                 options=list(model_categories.keys()),
                 index=list(model_categories.keys()).index(st.session_state['model_analysis']),
-                format_func=lambda x: model_categories[x]
+                format_func=model_category_label
             )
             
             st.session_state['model_generation'] = st.selectbox(
                 "Model for Document Generation:",
                 options=list(model_categories.keys()),
                 index=list(model_categories.keys()).index(st.session_state['model_generation']),
-                format_func=lambda x: model_categories[x]
+                format_func=model_category_label
+            )
+            
+            if "auto" in (st.session_state['model_analysis'], st.session_state['model_generation']):
+                st.session_state['routing_objective'] = st.radio(
+                    "Automatic routing picks the",
+                    ["fastest", "cheapest"],
+                    index=["fastest", "cheapest"].index(st.session_state.get('routing_objective', "fastest")),
+                    format_func=lambda x: f"{x} model",
+                    horizontal=True,
+                    help="Fastest uses the observed p50 latency (penalised by failures); cheapest uses OpenRouter prices"
+                )
+                floors = dict(DEFAULT_QUALITY_FLOORS, **st.session_state.get('quality_floors', {}))
+                for setting in ("analysis", "generation"):
+                    if st.session_state[f'model_{setting}'] == "auto":
+                        floors[setting] = st.select_slider(
+                            f"Minimum model quality for {setting}",
+                            options=list(QUALITY_LABELS),
+                            value=floors[setting],
+                            format_func=QUALITY_LABELS.get
+                        )
+                st.session_state['quality_floors'] = floors
+            
+            # Matching settings
+            # Opt-in: character n-gram similarity also rates different skills that share words as similar
+            use_semantic_matching = st.checkbox(
+                "Semantic skill matching",
+                value=st.session_state.get('semantic_threshold') is not None,
+                help="Also match requirements to similar skills (e.g. 'JS' and 'JavaScript'), computed locally. "
+                     "Lower thresholds also match different skills that share words, such as project and product management"
+            )
+            if use_semantic_matching:
+                st.session_state['semantic_threshold'] = st.slider(
+                    "Semantic match threshold",
+                    min_value=0.1,
+                    max_value=0.9,
+                    value=st.session_state.get('semantic_threshold') or DEFAULT_SEMANTIC_THRESHOLD,
+                    step=0.01
+                )
+            else:
+                st.session_state['semantic_threshold'] = None
+            
+            # Cross-posted copies of a job reuse the analysis of the first copy
+            st.session_state['reuse_duplicates'] = st.checkbox(
+                "Reuse analyses of near-duplicate postings",
+                value=st.session_state.get('reuse_duplicates', True),
+                help="A posting that closely matches one analyzed earlier in this session (e.g. the same job on another board) reuses its extraction and fit analysis instead of calling the model again"
             )
             
             # Custom model option
             use_custom_model = st.checkbox("Use custom model")
+            st.session_state['use_custom_model'] = use_custom_model
             
             if use_custom_model:
                 # Get available models from OpenRouter
                 try:
+                    refresh_models = st.button("Refresh model list")
                     with st.spinner("Loading available models..."):
-                        all_models = client.list_models()
+                        all_models = client.list_models(force_refresh=refresh_models)
                         # Create a list of model options
                         model_options = []
                         for model in all_models:
@@ -113,13 +306,6 @@ def setup_api():
             st.markdown("---")
             st.subheader("Selected Models")
             
-            # Function to get actual model ID
-            def get_actual_model_id(task_type):
-                if use_custom_model:
-                    return st.session_state.get(f'custom_{task_type}_model', get_recommended_models()["default"])
-                else:
-                    return get_recommended_models()[st.session_state[f'model_{task_type}']]
-            
             # Display selected models
             st.write(f"Analysis: `{get_actual_model_id('analysis')}`")
             st.write(f"Generation: `{get_actual_model_id('generation')}`")
@@ -132,40 +318,113 @@ def setup_api():
             st.error(f"Error connecting to OpenRouter: {str(e)}")
             return None
 
-# Extract professional info from uploaded resume
-def extract_info_from_resume(client, uploaded_file):
-    if uploaded_file.type == "application/pdf":
-        pdf_reader = PyPDF2.PdfReader(io.BytesIO(uploaded_file.getvalue()))
-        text = ""
-        for page in pdf_reader.pages:
-            text += page.extract_text()
-        
-        # Use OpenRouter to extract structured information
+# Chunked (map-reduce) profile extraction
+def extract_profile_in_chunks(client, text, model, system_prompt, user_prompt, chunk_chars):
+    """Extract a profile from long text.
+    
+    The text is split on section boundaries into chunks of at most chunk_chars,
+    up to MAX_PROFILE_CHUNKS chunks are extracted concurrently and the partial
+    profiles are merged, so wall time stays close to that of a single chunk.
+    user_prompt may contain {part}, filled with "(part i of n)".
+    
+    Chunks past MAX_PROFILE_CHUNKS, and chunks whose reply isn't valid JSON,
+    are left out of the profile; its "extraction_warnings" list says which.
+    """
+    chunks = chunk_document(text, chunk_chars)
+    if not chunks:
+        return {"error": "The document contains no text"}
+    
+    warnings = []
+    if len(chunks) > MAX_PROFILE_CHUNKS:
+        skipped = sum(len(chunk) for chunk in chunks[MAX_PROFILE_CHUNKS:])
+        warnings.append(
+            f"The document is too long to extract in full: the last {len(chunks) - MAX_PROFILE_CHUNKS} "
+            f"of {len(chunks)} parts (about {skipped:,} characters) were left out"
+        )
+        chunks = chunks[:MAX_PROFILE_CHUNKS]
+    
+    calls = []
+    for i, chunk in enumerate(chunks):
+        part = f" (part {i + 1} of {len(chunks)})" if len(chunks) > 1 else ""
+        calls.append({
+            "model": model,
+            "messages": [
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": f"{user_prompt.format(part=part)}\n\n{chunk}"}
+            ],
+            "response_format": PROFILE_FORMAT,
+            "task": "profile_extraction"
+        })
+    
+    try:
+        responses = run_concurrent_completions(client, calls, max_concurrency=MAX_CONCURRENT_CHUNKS)
+    except Exception as e:
+        return {"error": f"API error: {str(e)}"}
+    
+    partials = []
+    unparsed = []
+    for i, response in enumerate(responses):
         try:
-            response = client.chat_completion(
-                model=get_recommended_models()[st.session_state['model_analysis']],
-                messages=[
-                    {"role": "system", "content": "Extract professional information from the resume into JSON format."},
-                    {"role": "user", "content": f"Extract key professional details from this resume into a structured JSON with skills, education, experience, etc:\n\n{text[:7000]}"}  # Limit text size
-                ]
-            )
-            
-            content = response['choices'][0]['message']['content']
-            
-            # Extract JSON if it's wrapped in code blocks
-            if "```" in content:
-                match = re.search(r'```(?:json)?\s*(.*?)```', content, re.DOTALL)
-                if match:
-                    content = match.group(1)
-                    
-            try:
-                return json.loads(content)
-            except:
-                return {"error": "Failed to parse resume"}
-        except Exception as e:
-            return {"error": f"API error: {str(e)}"}
+            partials.append(extract_json(response['choices'][0]['message']['content'], expect=dict))
+        except JSONExtractionError:
+            unparsed.append(str(i + 1))
+    
+    if not partials:
+        return {"error": "Failed to parse resume"}
+    if unparsed:
+        warnings.append(
+            f"The AI reply for part {', '.join(unparsed)} of {len(chunks)} could not be read; "
+            "details from that part are missing"
+        )
+    profile = partials[0] if len(partials) == 1 else merge_profiles(partials)
+    if warnings:
+        profile["extraction_warnings"] = warnings
+    return profile
+
+# Extract professional info from resume text
+def extract_info_from_resume(client, text, model=None):
+    if model is None:
+        model = model_for("profile_extraction")
     
-    return {"error": "Unsupported file type"}
+    # Use OpenRouter to extract structured information
+    return extract_profile_in_chunks(
+        client, text, model,
+        "Extract professional information from the resume into JSON format.",
+        "Extract key professional details from this resume{part} into a structured JSON with a summary, skills, education, experience, projects, languages and links (portfolio, LinkedIn, website), etc:",
+        RESUME_CHUNK_CHARS
+    )
+
+# Extract professional info from free-form profile text
+def extract_info_from_text(client, text, model=None):
+    if model is None:
+        model = model_for("profile_extraction")
+    
+    profile = extract_profile_in_chunks(
+        client, text, model,
+        "Extract structured professional profile information from this text. Return as JSON.",
+        "Extract key professional details from this text{part} into a structured JSON with personal_info, a summary, skills, education, experience, projects, languages and links (portfolio, LinkedIn, website), etc.:",
+        TEXT_CHUNK_CHARS
+    )
+    if "error" in profile:
+        # Fallback to basic extraction
+        return extract_profile_from_text(text)
+    return profile
+
+# Turn an ingested document into a profile (memoized by the document's content hash)
+def build_profile_from_document(client, document):
+    """Structured profile for an IngestedDocument; JSON files are converted, other kinds extracted from text"""
+    if document.kind == "json":
+        return document_ingestor.profile(document, lambda doc: convert_professional_database_to_profile(doc.data), variant="json")
+    
+    if not client:
+        # Fallback to basic extraction
+        return document_ingestor.profile(document, lambda doc: extract_profile_from_text(doc.text), variant="basic")
+    
+    model = model_for("profile_extraction")
+    if document.kind == "txt":
+        return document_ingestor.profile(document, lambda doc: extract_info_from_text(client, doc.text, model), variant=f"text:{model}")
+    # PDF and DOCX are treated as resumes
+    return document_ingestor.profile(document, lambda doc: extract_info_from_resume(client, doc.text, model), variant=f"resume:{model}")
 
 # Interactive career profile builder
 def build_career_profile(client):
@@ -218,26 +477,22 @@ def build_career_profile(client):
             """
             
             response = client.chat_completion(
-                model=get_recommended_models()[st.session_state['model_analysis']],
+                model=model_for("profile_extraction"),
                 messages=[
                     {"role": "system", "content": "Create a structured professional profile in JSON format based on user input. Return ONLY JSON."},
                     {"role": "user", "content": prompt}
-                ]
+                ],
+                response_format=PROFILE_FORMAT,
+                task="profile_extraction"
             )
             
             content = response['choices'][0]['message']['content']
             
-            # Extract JSON if it's wrapped in code blocks
-            if "```" in content:
-                match = re.search(r'```(?:json)?\s*(.*?)```', content, re.DOTALL)
-                if match:
-                    content = match.group(1)
-            
             try:
-                profile_json = json.loads(content)
+                profile_json = extract_json(content, expect=dict)
                 st.json(profile_json)
                 return profile_json
-            except json.JSONDecodeError as e:
+            except JSONExtractionError as e:
                 st.error(f"Failed to generate profile. Invalid JSON: {str(e)}")
                 st.code(content)
                 return None
@@ -245,12 +500,96 @@ def build_career_profile(client):
             st.error(f"API error: {str(e)}")
             return None
 
+# Combined job metadata + requirements extraction
+def validate_job_extraction(parsed):
+    """Check a combined extraction response and normalise it, or return None if unusable"""
+    if not isinstance(parsed, dict):
+        return None
+    
+    requirements = parsed.get("requirements")
+    if not isinstance(requirements, list):
+        return None
+    requirements = [str(req).strip() for req in requirements if isinstance(req, (str, int, float)) and str(req).strip()]
+    if not requirements:
+        return None
+    
+    job_info = {"requirements": requirements}
+    defaults = {"title": "Unknown Position", "company": "Unknown Company", "location": "Unknown", "job_type": "Unknown"}
+    for field, default in defaults.items():
+        value = parsed.get(field)
+        job_info[field] = value.strip() if isinstance(value, str) and value.strip() else default
+    return job_info
+
+# Context window of a model, from the cached model catalog
+def get_context_window(client, model):
+    try:
+        return context_window_for(model, client.list_models())
+    except Exception:
+        return DEFAULT_CONTEXT_WINDOW
+
+def extract_job_details(client, raw_posting, model):
+    """Extract job metadata and requirements in a single call; returns None if the response is unusable"""
+    system_prompt = "Extract structured job information and required skills from a posting. Return ONLY JSON."
+    # Keep the posting's opening lines and requirement lines within the token budget
+    budget = PromptBudget("job_extraction", get_context_window(client, model), system_prompt)
+    prompt = f"""
+    Extract key information from this job posting. Return a JSON object with these fields:
+    - title: The job title
+    - company: The company name
+    - location: The job location
+    - job_type: Type of employment (full-time, part-time, etc.)
+    - requirements: An array of 10-15 key technical skills and qualifications required for the job
+    
+    Example format:
+    {{"title": "...", "company": "...", "location": "...", "job_type": "...", "requirements": ["Skill 1", "Skill 2"]}}
+    
+    Return ONLY JSON with no explanations.
+    
+    JOB POSTING:
+    {fit_text(raw_posting, budget.total)}
+    """
+    
+    response = client.chat_completion(
+        model=model,
+        messages=[
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": prompt}
+        ],
+        response_format=JOB_DETAILS_FORMAT,
+        task="job_extraction"
+    )
+    
+    try:
+        return validate_job_extraction(extract_json(response['choices'][0]['message']['content'], expect=dict))
+    except JSONExtractionError:
+        return None
+
 # Process raw job posting
-def process_job_posting(client, raw_posting):
-    """Extract structured information from a raw job posting"""
+def process_job_posting(client, raw_posting, model=None):
+    """Extract structured information from a raw job posting.
+    
+    Metadata and requirements are extracted together in one call; the
+    requirements are kept on the job data so analyze_job_fit can skip its own
+    extraction call. If the combined response is unusable, falls back to the
+    metadata-only prompt (and analyze_job_fit extracts requirements itself).
+    """
+    if model is None:
+        model = model_for("job_extraction")
+    
+    try:
+        job_info = extract_job_details(client, raw_posting, model)
+        if job_info is not None:
+            job_info["description"] = raw_posting
+            job_info["url"] = "manually-entered"
+            job_info["date_found"] = datetime.now().strftime("%Y-%m-%d")
+            return job_info
+    except Exception:
+        # Fall through to the metadata-only extraction
+        pass
     
     try:
         # Extract key information from the raw posting
+        budget = PromptBudget("job_extraction", get_context_window(client, model))
         prompt = f"""
         Extract key information from this job posting. Return a JSON with these fields:
         - title: The job title
@@ -261,27 +600,21 @@ def process_job_posting(client, raw_posting):
         Return ONLY JSON with no explanations.
         
         JOB POSTING:
-        {raw_posting[:4000]}  # Limit text to save tokens
+        {fit_text(raw_posting, budget.total)}
         """
         
         response = client.chat_completion(
-            model=get_recommended_models()[st.session_state['model_analysis']],
+            model=model,
             messages=[
                 {"role": "system", "content": "Extract structured job information from a posting. Return ONLY JSON."},
                 {"role": "user", "content": prompt}
-            ]
+            ],
+            response_format=JOB_METADATA_FORMAT,
+            task="job_extraction"
         )
         
-        content = response['choices'][0]['message']['content']
-        
-        # Extract JSON if it's wrapped in code blocks
-        if "```" in content:
-            match = re.search(r'```(?:json)?\s*(.*?)```', content, re.DOTALL)
-            if match:
-                content = match.group(1)
-                
         try:
-            job_info = json.loads(content)
+            job_info = extract_json(response['choices'][0]['message']['content'], expect=dict)
             
             # Add the description and other metadata
             job_info["description"] = raw_posting
@@ -290,7 +623,7 @@ def process_job_posting(client, raw_posting):
             
             return job_info
             
-        except json.JSONDecodeError:
+        except JSONExtractionError:
             # If parsing fails, create a basic structure
             return {
                 "title": "Unknown Position",
@@ -304,12 +637,56 @@ def process_job_posting(client, raw_posting):
     except Exception as e:
         return {"error": f"Error processing job posting: {str(e)}"}
 
+# Memoized profile index for matching
+def get_cached_profile_index(profile, use_session=True):
+    """Return the ProfileIndex for profile, memoized in session state and the shared cache.
+    
+    The index is keyed on the profile's content hash, so any change to the
+    profile produces a fresh index. use_session=False skips session state,
+    which isn't available from worker threads.
+    """
+    if isinstance(profile, dict) and "professional_metadata" in profile:
+        profile = convert_professional_database_to_profile(profile)
+    
+    content_hash = profile_content_hash(profile)
+    if use_session:
+        cached = st.session_state.get('profile_index')
+        if cached is not None and cached.content_hash == content_hash:
+            return cached
+    
+    index = get_profile_index(profile, content_hash=content_hash)
+    if use_session:
+        st.session_state['profile_index'] = index
+    return index
+
+def invalidate_profile_index():
+    """Drop the session's memoized ProfileIndex after the profile is edited"""
+    st.session_state.pop('profile_index', None)
+
 # Replace the analyze_job_fit function with this debugged version
 
-def analyze_job_fit(client, job_data, profile):
-    """Analyze job fit with better profile data extraction and debugging"""
-    if 'openrouter_client' not in st.session_state:
+def analyze_job_fit(client, job_data, profile, model=None, quiet=False, profile_index=None, semantic_threshold=None):
+    """Analyze job fit with better profile data extraction and debugging.
+    
+    quiet=True suppresses all Streamlit output so the analysis can run in
+    worker threads (e.g. batch mode); pass the model and semantic_threshold
+    explicitly in that case. profile_index may carry a prebuilt ProfileIndex
+    for this profile. semantic_threshold=None uses the sidebar setting unless
+    quiet, where it disables semantic matching.
+    """
+    if client is None:
         return {"error": "Please enter your OpenRouter API key in the sidebar"}
+    
+    if model is None:
+        model = model_for("job_requirements")
+    
+    if semantic_threshold is None and not quiet:
+        semantic_threshold = st.session_state.get('semantic_threshold')
+    
+    def _silent(*args, **kwargs):
+        pass
+    debug = _silent if quiet else st.write
+    report_error = _silent if quiet else st.error
         
     try:
         # First check if we have a valid job description
@@ -317,11 +694,11 @@ def analyze_job_fit(client, job_data, profile):
             return {"error": "No valid job description provided"}
             
         # Debug profile data structure
-        st.write("Debug - Profile data structure:", type(profile))
+        debug("Debug - Profile data structure:", type(profile))
         
         # Standardize profile format if needed
         if isinstance(profile, dict) and "professional_metadata" in profile:
-            st.write("Converting from professional-database.json format...")
+            debug("Converting from professional-database.json format...")
             profile = convert_professional_database_to_profile(profile)
         
         # Check if profile exists and has content
@@ -335,161 +712,71 @@ def analyze_job_fit(client, job_data, profile):
                 "explanation": "Cannot perform analysis without profile data."
             }
             
-        # Extract all technical skills from profile with improved handling
-        all_skills = []
-        try:
-            if isinstance(profile, dict):
-                # Extract from standard format
-                if "skills" in profile:
-                    if isinstance(profile["skills"], dict):
-                        # Handle categorized skills
-                        for category, skills_list in profile["skills"].items():
-                            if isinstance(skills_list, list):
-                                all_skills.extend(skills_list)
-                    elif isinstance(profile["skills"], list):
-                        # Handle flat list of skills
-                        all_skills = profile["skills"]
-                
-                # Try alternative locations
-                if "professional_metadata" in profile and "key_skills" in profile["professional_metadata"]:
-                    all_skills.extend(profile["professional_metadata"]["key_skills"])
-                    
-                if "certifications" in profile:
-                    all_skills.extend(profile["certifications"])
-                
-                # Extract skills from entries if available
-                if "entries" in profile:
-                    for entry in profile["entries"]:
-                        if "components" in entry:
-                            all_skills.extend(entry["components"])
-                        if "technologies" in entry.get("content", {}):
-                            all_skills.extend(entry["content"]["technologies"])
-                
-                # Make sure skills are unique
-                all_skills = list(set(all_skills))
-            
-            # Debug skills extraction
-            st.write(f"Debug - Extracted skills: {all_skills}")
-        except Exception as e:
-            st.error(f"Error extracting skills: {str(e)}")
-            
-        # Extract experience with better error handling
-        experience_highlights = []
-        try:
-            if isinstance(profile, dict):
-                # Standard format
-                if "experience" in profile and isinstance(profile["experience"], list):
-                    for exp in profile["experience"]:
-                        if isinstance(exp, dict):
-                            # Add position and company if available
-                            position = exp.get("position", "")
-                            company = exp.get("company", "")
-                            if position and company:
-                                experience_highlights.append(f"{position} at {company}")
-                            elif position:
-                                experience_highlights.append(position)
-                            
-                            # Add key responsibilities
-                            if "responsibilities" in exp and isinstance(exp["responsibilities"], list):
-                                for resp in exp["responsibilities"][:3]:  # Limit to top 3
-                                    experience_highlights.append(resp)
-                            
-                            # Add key achievements
-                            if "achievements" in exp and isinstance(exp["achievements"], list):
-                                for achievement in exp["achievements"][:2]:  # Limit to top 2
-                                    experience_highlights.append(achievement)
-                
-                # Professional database format
-                if "entries" in profile:
-                    for entry in profile["entries"]:
-                        if entry.get("type") == "employment":
-                            # Extract job title
-                            title = entry.get("title", "")
-                            if " - " in title:
-                                company, position = title.split(" - ", 1)
-                                experience_highlights.append(f"{position} at {company}")
-                            
-                            # Extract responsibilities and achievements
-                            if "content" in entry:
-                                content = entry["content"]
-                                if "responsibilities" in content and isinstance(content["responsibilities"], list):
-                                    for resp in content["responsibilities"][:3]:
-                                        experience_highlights.append(resp)
-                                        
-                                if "achievements" in content and isinstance(content["achievements"], list):
-                                    for achv in content["achievements"][:2]:
-                                        experience_highlights.append(achv)
-            
-            # Debug experience extraction
-            st.write(f"Debug - Extracted experience highlights: {len(experience_highlights)} items")
-        except Exception as e:
-            st.error(f"Error extracting experience: {str(e)}")
-        
-        # Extract job requirements specifically for the Industrial Designer position
-        try:
-            # Get a cleaner summary of job requirements
-            extraction_prompt = f"""
-            Extract 10-15 key technical skills and qualifications required for this job.
-            Return as a simple JSON array of strings.
-            
-            Example format: ["Skill 1", "Skill 2", "Skill 3"]
-            
-            JOB POSTING:
-            {job_data["description"][:5000]}
-            """
-            
-            req_response = client.chat_completion(
-                model=get_recommended_models()[st.session_state.get('model_analysis', 'balanced')],
-                messages=[
-                    {"role": "system", "content": "Extract specific job skills and qualifications as a JSON array. Return ONLY a JSON array."},
-                    {"role": "user", "content": extraction_prompt}
-                ]
-            )
+        # Skills and experience come from a ProfileIndex, built once per
+        # profile content and reused across every job this profile is matched against
+        if profile_index is None:
+            profile_index = get_cached_profile_index(profile, use_session=not quiet)
+        all_skills = profile_index.skills
+        experience_highlights = profile_index.experience_highlights
+        
+        # Debug skills and experience extraction
+        debug(f"Debug - Extracted skills: {all_skills}")
+        debug(f"Debug - Extracted experience highlights: {len(experience_highlights)} items")
+        
+        # Reuse requirements from the combined extraction in process_job_posting
+        precomputed_requirements = job_data.get("requirements")
+        if isinstance(precomputed_requirements, list) and precomputed_requirements:
+            job_requirements = precomputed_requirements
+            debug(f"Debug - Using extracted job requirements: {job_requirements}")
+        else:
+            # Extract job requirements specifically for the Industrial Designer position
+            try:
+                # Get a cleaner summary of job requirements
+                budget = PromptBudget("job_requirements", get_context_window(client, model))
+                extraction_prompt = f"""
+                Extract 10-15 key technical skills and qualifications required for this job.
+                Return a JSON object with a "requirements" array of strings.
+            
+                Example format: {{"requirements": ["Skill 1", "Skill 2", "Skill 3"]}}
+            
+                JOB POSTING:
+                {fit_text(job_data["description"], budget.total)}
+                """
+            
+                req_response = client.chat_completion(
+                    model=model,
+                    messages=[
+                        {"role": "system", "content": "Extract specific job skills and qualifications as JSON. Return ONLY JSON."},
+                        {"role": "user", "content": extraction_prompt}
+                    ],
+                    response_format=JOB_REQUIREMENTS_FORMAT,
+                    task="job_requirements"
+                )
             
-            content = req_response['choices'][0]['message']['content']
+                # Parse JSON - handle different formats
+                parsed_content = extract_json(req_response['choices'][0]['message']['content'])
             
-            # Extract JSON array
-            if "```" in content:
-                match = re.search(r'```(?:json)?\s*(.*?)```', content, re.DOTALL)
-                if match:
-                    content = match.group(1)
-                    
-            # Parse JSON - handle different formats
-            parsed_content = json.loads(content)
-            
-            # Handle case where it returns an object with a key
-            if isinstance(parsed_content, dict):
-                for key in parsed_content:
-                    if isinstance(parsed_content[key], list):
-                        job_requirements = parsed_content[key]
-                        break
+                # Handle case where it returns an object with a key
+                if isinstance(parsed_content, dict):
+                    for key in parsed_content:
+                        if isinstance(parsed_content[key], list):
+                            job_requirements = parsed_content[key]
+                            break
+                    else:
+                        job_requirements = list(parsed_content.values())[0] if parsed_content else []
+                # Handle case where it returns a list directly
                 else:
-                    job_requirements = list(parsed_content.values())[0] if parsed_content else []
-            # Handle case where it returns a list directly
-            elif isinstance(parsed_content, list):
-                job_requirements = parsed_content
-            else:
-                st.error(f"Unexpected requirements format: {type(parsed_content)}")
-                job_requirements = ["Unable to properly extract requirements"]
+                    job_requirements = parsed_content
             
-            # Debug job requirements
-            st.write(f"Debug - Extracted job requirements: {job_requirements}")
+                # Debug job requirements
+                debug(f"Debug - Extracted job requirements: {job_requirements}")
             
-        except Exception as e:
-            st.error(f"Error extracting job requirements: {str(e)}")
-            # Create a basic set of job requirements based on common skills
-            job_requirements = [
-                "3D design skills",
-                "CAD proficiency",
-                "Technical documentation",
-                "Design experience",
-                "Manufacturing knowledge",
-                "Problem-solving abilities",
-                "Communication skills"
-            ]
+            except Exception as e:
+                # A made-up requirements list would produce a misleading score
+                return {"error": f"Error extracting job requirements: {str(e)}"}
         
         # If no skills or experience found, return early with helpful message
-        if not all_skills and not experience_highlights:
+        if profile_index.is_empty:
             missing_skills = job_requirements[:10] if isinstance(job_requirements, list) else []
             return {
                 "overall_match": 0,
@@ -499,40 +786,13 @@ def analyze_job_fit(client, job_data, profile):
                 "explanation": "The profile doesn't contain any skills or experience information. Please update your profile with relevant skills and experience to get a proper match analysis."
             }
         
-        # Manually calculate a basic match score instead of using AI
-        matching_skills = []
-        missing_skills = []
-        
-        # Convert everything to lowercase for better matching
-        all_skills_lower = [s.lower() for s in all_skills]
-        experience_text = " ".join(experience_highlights).lower()
-        
-        # Check each job requirement
-        for req in job_requirements:
-            req_lower = req.lower()
-            # Check if requirement is matched by a skill
-            matched = False
-            
-            # Look for exact skill matches
-            for skill in all_skills_lower:
-                if skill.lower() in req_lower or req_lower in skill.lower():
-                    matching_skills.append(req)
-                    matched = True
-                    break
-                    
-            # If not matched by skills, check experience text
-            if not matched:
-                # Extract key terms from requirement
-                key_terms = [term.strip() for term in req_lower.split() if len(term.strip()) > 3]
-                for term in key_terms:
-                    if term in experience_text:
-                        matching_skills.append(req)
-                        matched = True
-                        break
-                        
-            # If still not matched, it's missing
-            if not matched:
-                missing_skills.append(req)
+        # Manually calculate a basic match score instead of using AI: a skill
+        # covers a requirement if either contains the other or (optionally) if
+        # they are similar enough as n-gram vectors; otherwise the requirement's
+        # key terms are looked up in the experience text
+        matching_skills, missing_skills = match_requirements(
+            job_requirements, profile_index, semantic_threshold=semantic_threshold
+        )
         
         # Calculate match scores
         total_reqs = len(job_requirements)
@@ -570,8 +830,8 @@ def analyze_job_fit(client, job_data, profile):
             
     except Exception as e:
         import traceback
-        st.error(f"Error analyzing job: {str(e)}")
-        st.error(traceback.format_exc())
+        report_error(f"Error analyzing job: {str(e)}")
+        report_error(traceback.format_exc())
         return {
             "error": f"Error analyzing job: {str(e)}",
             "overall_match": 0,
@@ -582,104 +842,222 @@ def analyze_job_fit(client, job_data, profile):
         }
 
 # Generate tailored application documents
-def generate_application_docs(client, job_analysis, profile):
-    """Generate tailored application documents with ONLY facts from the profile"""
+COVER_LETTER_SYSTEM_PROMPT = "You are a strictly factual resume writer who uses ONLY the exact information provided. You NEVER fabricate experience, companies, or achievements. You do not elaborate beyond the given facts."
+RESUME_SYSTEM_PROMPT = "You create powerful resume content using ONLY the exact information provided. You NEVER fabricate experience, roles, or achievements. Return ONLY JSON."
+
+def build_generation_calls(client, job_analysis, profile, model, resume_model=None):
+    """chat_completion arguments for the cover letter and the resume bullets.
+    
+    The resume bullets go to resume_model if given, else to model. The job
+    text, skills and experience are fitted into each task's token budget
+    (capped by the model's context window): skills and experience bullets
+    that mention the job's requirements are kept first, and the job text
+    keeps its opening and requirement lines.
+    """
+    job_data = job_analysis['job_data']
+    job_title = job_data['title']
+    company = job_data['company']
+    
+    # Extract personal info for personalization
+    personal_info = {}
+    if "personal_info" in profile:
+        personal_info = profile["personal_info"]
+    
+    # Get actual values or empty strings (not placeholders)
+    name = personal_info.get("name", "").strip()
+    email = personal_info.get("email", "").strip()
+    phone = personal_info.get("phone", "").strip()
+    location = personal_info.get("location", "").strip()
+    
+    # Extract REAL experience information to prevent fabrication
+    experience_details = []
+    if "experience" in profile and isinstance(profile["experience"], list):
+        for exp in profile["experience"]:
+            if isinstance(exp, dict):
+                exp_dict = {
+                    "company": exp.get("company", ""),
+                    "position": exp.get("position", ""),
+                    "duration": exp.get("duration", ""),
+                    "responsibilities": [],
+                    "achievements": []
+                }
+                
+                # Only include real responsibilities
+                if "responsibilities" in exp and isinstance(exp["responsibilities"], list):
+                    exp_dict["responsibilities"] = exp["responsibilities"]
+                    
+                # Only include real achievements
+                if "achievements" in exp and isinstance(exp["achievements"], list):
+                    exp_dict["achievements"] = exp["achievements"]
+                    
+                experience_details.append(exp_dict)
+    
+    # Extract REAL skills to prevent fabrication
+    all_skills = []
+    if "skills" in profile:
+        if isinstance(profile["skills"], dict):
+            # If skills are categorized
+            for category, skills_list in profile["skills"].items():
+                if isinstance(skills_list, list):
+                    all_skills.extend(skills_list)
+        elif isinstance(profile["skills"], list):
+            all_skills = profile["skills"]
+    
+    # Relevance is judged against the job's requirements and description
+    resume_model = resume_model or model
+    match = job_analysis.get('match_analysis') or {}
+    terms = key_terms(
+        job_data.get('requirements') or [], match.get('matching_skills') or [],
+        match.get('missing_skills') or [], job_data['description']
+    )
+    description_tokens = min(estimate_tokens(job_data['description']), JOB_TEXT_MAX_TOKENS)
+    experience_tokens = estimate_tokens(json.dumps(experience_details))
+    
+    cover_budget = PromptBudget("cover_letter", get_context_window(client, model), COVER_LETTER_SYSTEM_PROMPT).allocate({
+        "job": (1, description_tokens),
+        "skills": (1, estimate_tokens(json.dumps(all_skills))),
+        "experience": (2, experience_tokens),
+    })
+    resume_budget = PromptBudget("resume_bullets", get_context_window(client, resume_model), RESUME_SYSTEM_PROMPT).allocate({
+        "job": (1, description_tokens),
+        "experience": (3, experience_tokens),
+    })
+    
+    # Generate cover letter with strict fact-checking instructions
+    cover_letter_prompt = f"""
+    Create a brief, enthusiastic cover letter for a {job_title} position at {company}.
+
+    THE FOLLOWING INFORMATION IS THE ONLY FACTUAL INFORMATION YOU CAN USE:
+    
+    CANDIDATE DETAILS:
+    Name: {name}
+    Email: {email}
+    Phone: {phone}
+    Location: {location}
+    
+    VERIFIED SKILLS (use ONLY these exact skills, do not fabricate or expand):
+    {json.dumps(fit_list(all_skills, cover_budget["skills"], terms))}
+    
+    VERIFIED WORK EXPERIENCE (use ONLY these exact companies and details, do not fabricate or expand):
+    {json.dumps(fit_experience(experience_details, cover_budget["experience"], terms))}
+    
+    JOB REQUIREMENTS:
+    {fit_text(job_data['description'], cover_budget["job"])}
+    
+    IMPORTANT INSTRUCTIONS:
+    1. Keep it SHORT (150-200 words maximum, about 3-4 short paragraphs)
+    2. Be enthusiastic and friendly, but professional
+    3. NEVER include ANY placeholders like "[Your Name]"
+    4. NEVER fabricate work experience or skills - use ONLY what's provided above
+    5. If a real company name isn't provided above, DO NOT make one up - refer to roles generically
+    6. Only include details explicitly listed in the VERIFIED sections
+    7. Do not expand on bullet points with specifics not provided above
+    8. Keep it direct and engaging for busy hiring managers
+    9. End with "Sincerely," followed by the name only if provided
+    
+    Use ONLY the facts provided above - no fabrication whatsoever.
+    """
+    
+    # Generate resume bullets with strict facts
+    resume_prompt = f"""
+    Create tailored resume bullet points for a {job_title} position at {company}.
+    
+    USE ONLY THESE EXACT WORK EXPERIENCES (do not fabricate or expand):
+    {json.dumps(fit_experience(experience_details, resume_budget["experience"], terms))}
+    
+    JOB REQUIREMENTS:
+    {fit_text(job_data['description'], resume_budget["job"])}
+    
+    INSTRUCTIONS:
+    1. For each position, create 3 powerful bullet points
+    2. Each bullet should be ONE LINE only (15 words maximum)
+    3. Start with strong ACTION VERBS
+    4. ONLY use responsibilities and achievements explicitly listed above
+    5. DO NOT fabricate or add details not provided in the work experience
+    6. If no achievements are provided for a role, focus on responsibilities only
+    
+    Return a JSON object with a "positions" array holding each position title and its bullet points.
+    Return ONLY valid JSON with no explanations or markdown formatting.
+    Example format: {{"positions": [{{"position": "Position Title", "bullets": ["Bullet 1", "Bullet 2", "Bullet 3"]}}]}}
+    """
+    
+    return [
+        {
+            "model": model,
+            "messages": [
+                {"role": "system", "content": COVER_LETTER_SYSTEM_PROMPT},
+                {"role": "user", "content": cover_letter_prompt}
+            ],
+            "task": "cover_letter"
+        },
+        {
+            "model": resume_model,
+            "messages": [
+                {"role": "system", "content": RESUME_SYSTEM_PROMPT},
+                {"role": "user", "content": resume_prompt}
+            ],
+            "response_format": RESUME_BULLETS_FORMAT,
+            "task": "resume_bullets"
+        }
+    ]
+
+def resume_bullets_from(value):
+    """Bullets by position from a (possibly partial) resume bullets response, keeping positions with text bullets.
+    
+    Accepts the {"positions": [{"position": ..., "bullets": [...]}]} shape of
+    RESUME_BULLETS_SCHEMA as well as a plain {position: [bullets]} map.
+    """
+    if not isinstance(value, dict):
+        return {}
+    if isinstance(value.get("positions"), list):
+        value = {
+            entry.get("position") or "Position": entry.get("bullets")
+            for entry in value["positions"] if isinstance(entry, dict)
+        }
+    bullets = {}
+    for position, items in value.items():
+        if isinstance(items, str):
+            items = [items]
+        if isinstance(items, list):
+            items = [str(item).strip() for item in items if isinstance(item, (str, int, float)) and str(item).strip()]
+            if items:
+                bullets[str(position)] = items
+    return bullets
+
+def resume_bullets_markdown(resume_bullets):
+    return "\n\n".join(
+        f"**{position}**\n\n" + "\n".join(f"- {bullet}" for bullet in bullets)
+        for position, bullets in resume_bullets.items()
+    )
+
+def parse_resume_bullets(content):
+    """Resume bullets by position from the model's response; raises JSONExtractionError if there are none"""
+    bullets = resume_bullets_from(extract_json(content, expect=dict))
+    if not bullets:
+        raise JSONExtractionError("The response has no resume bullets")
+    return bullets
+
+def generate_application_docs(client, job_analysis, profile, on_cover_letter_token=None):
+    """Generate tailored application documents with ONLY facts from the profile.
+    
+    If on_cover_letter_token is given, the cover letter is streamed and the
+    callback receives each text delta as it arrives.
+    """
     if 'openrouter_client' not in st.session_state:
         return {"error": "Please enter your OpenRouter API key in the sidebar"}
         
     try:
-        # Extract job details
-        job_title = job_analysis['job_data']['title']
-        company = job_analysis['job_data']['company']
-        
-        # Extract personal info for personalization
-        personal_info = {}
-        if "personal_info" in profile:
-            personal_info = profile["personal_info"]
-        
-        # Get actual values or empty strings (not placeholders)
-        name = personal_info.get("name", "").strip()
-        email = personal_info.get("email", "").strip()
-        phone = personal_info.get("phone", "").strip()
-        location = personal_info.get("location", "").strip()
-        
-        # Extract REAL experience information to prevent fabrication
-        experience_details = []
-        if "experience" in profile and isinstance(profile["experience"], list):
-            for exp in profile["experience"]:
-                if isinstance(exp, dict):
-                    exp_dict = {
-                        "company": exp.get("company", ""),
-                        "position": exp.get("position", ""),
-                        "duration": exp.get("duration", ""),
-                        "responsibilities": [],
-                        "achievements": []
-                    }
-                    
-                    # Only include real responsibilities
-                    if "responsibilities" in exp and isinstance(exp["responsibilities"], list):
-                        exp_dict["responsibilities"] = exp["responsibilities"]
-                        
-                    # Only include real achievements
-                    if "achievements" in exp and isinstance(exp["achievements"], list):
-                        exp_dict["achievements"] = exp["achievements"]
-                        
-                    experience_details.append(exp_dict)
-        
-        # Extract REAL skills to prevent fabrication
-        all_skills = []
-        if "skills" in profile:
-            if isinstance(profile["skills"], dict):
-                # If skills are categorized
-                for category, skills_list in profile["skills"].items():
-                    if isinstance(skills_list, list):
-                        all_skills.extend(skills_list)
-            elif isinstance(profile["skills"], list):
-                all_skills = profile["skills"]
-        
-        # Generate cover letter with strict fact-checking instructions
-        cover_letter_prompt = f"""
-        Create a brief, enthusiastic cover letter for a {job_title} position at {company}.
-
-        THE FOLLOWING INFORMATION IS THE ONLY FACTUAL INFORMATION YOU CAN USE:
-        
-        CANDIDATE DETAILS:
-        Name: {name}
-        Email: {email}
-        Phone: {phone}
-        Location: {location}
-        
-        VERIFIED SKILLS (use ONLY these exact skills, do not fabricate or expand):
-        {json.dumps(all_skills)}
-        
-        VERIFIED WORK EXPERIENCE (use ONLY these exact companies and details, do not fabricate or expand):
-        {json.dumps(experience_details)}
-        
-        JOB REQUIREMENTS:
-        {job_analysis['job_data']['description'][:800]}
-        
-        IMPORTANT INSTRUCTIONS:
-        1. Keep it SHORT (150-200 words maximum, about 3-4 short paragraphs)
-        2. Be enthusiastic and friendly, but professional
-        3. NEVER include ANY placeholders like "[Your Name]"
-        4. NEVER fabricate work experience or skills - use ONLY what's provided above
-        5. If a real company name isn't provided above, DO NOT make one up - refer to roles generically
-        6. Only include details explicitly listed in the VERIFIED sections
-        7. Do not expand on bullet points with specifics not provided above
-        8. Keep it direct and engaging for busy hiring managers
-        9. End with "Sincerely," followed by the name only if provided
-        
-        Use ONLY the facts provided above - no fabrication whatsoever.
-        """
+        cover_letter_call, resume_call = build_generation_calls(
+            client, job_analysis, profile, model_for("cover_letter"), model_for("resume_bullets")
+        )
         
-        # Use the selected model for document generation
-        cover_letter_content = client.chat_completion(
-            model=get_recommended_models()[st.session_state['model_generation']],
-            messages=[
-                {"role": "system", "content": "You are a strictly factual resume writer who uses ONLY the exact information provided. You NEVER fabricate experience, companies, or achievements. You do not elaborate beyond the given facts."},
-                {"role": "user", "content": cover_letter_prompt}
-            ]
-        )['choices'][0]['message']['content']
+        # The cover letter and resume bullets are independent, so request them
+        # concurrently: wall time is the slower of the two rather than their sum
+        cover_letter_call["stream"] = on_cover_letter_token is not None
+        cover_letter_call["on_token"] = on_cover_letter_token
+        cover_letter_response, resume_response = run_concurrent_completions(client, [cover_letter_call, resume_call])
+        cover_letter_content = cover_letter_response['choices'][0]['message']['content']
+        resume_content = resume_response['choices'][0]['message']['content']
         
         # Additional check to remove any remaining placeholders
         placeholder_patterns = [
@@ -696,78 +1074,20 @@ def generate_application_docs(client, job_analysis, profile):
         for pattern in placeholder_patterns:
             cover_letter_content = re.sub(pattern, '', cover_letter_content)
         
-        # Generate resume bullets with strict facts
-        resume_prompt = f"""
-        Create tailored resume bullet points for a {job_title} position at {company}.
-        
-        USE ONLY THESE EXACT WORK EXPERIENCES (do not fabricate or expand):
-        {json.dumps(experience_details)}
-        
-        JOB REQUIREMENTS:
-        {job_analysis['job_data']['description'][:800]}
-        
-        INSTRUCTIONS:
-        1. For each position, create 3 powerful bullet points
-        2. Each bullet should be ONE LINE only (15 words maximum)
-        3. Start with strong ACTION VERBS
-        4. ONLY use responsibilities and achievements explicitly listed above
-        5. DO NOT fabricate or add details not provided in the work experience
-        6. If no achievements are provided for a role, focus on responsibilities only
-        
-        Return as JSON with position titles as keys and arrays of bullet points as values.
-        Return ONLY valid JSON with no explanations or markdown formatting.
-        """
-        
-        resume_content = client.chat_completion(
-            model=get_recommended_models()[st.session_state['model_generation']],
-            messages=[
-                {"role": "system", "content": "You create powerful resume content using ONLY the exact information provided. You NEVER fabricate experience, roles, or achievements. Return ONLY JSON."},
-                {"role": "user", "content": resume_prompt}
-            ]
-        )['choices'][0]['message']['content']
-        
-        # Extract JSON if it's wrapped in code blocks
-        if "```" in resume_content:
-            match = re.search(r'```(?:json)?\s*(.*?)```', resume_content, re.DOTALL)
-            if match:
-                resume_content = match.group(1).strip()
-                
         try:
-            resume_bullets = json.loads(resume_content)
-            
-            return {
-                "cover_letter": cover_letter_content,
-                "resume_bullets": resume_bullets
-            }
-        except json.JSONDecodeError:
-            # Try to extract format manually with regex
-            positions = re.findall(r'"([^"]+)":\s*\[(.*?)\]', resume_content, re.DOTALL)
-            manual_bullets = {}
-            
-            if positions:
-                for pos, bullets_text in positions:
-                    bullets = re.findall(r'"([^"]+)"', bullets_text)
-                    if bullets:
-                        manual_bullets[pos] = bullets
-            
-            if manual_bullets:
-                return {
-                    "cover_letter": cover_letter_content,
-                    "resume_bullets": manual_bullets
-                }
-            else:
-                # Fallback to basic structure
-                return {
-                    "cover_letter": cover_letter_content,
-                    "resume_bullets": {"Position": ["Managed key responsibilities in professional environment.",
-                                                   "Contributed to team projects and initiatives.",
-                                                   "Applied technical skills to solve challenges."]}
-                }
+            resume_bullets = parse_resume_bullets(resume_content)
+        except JSONExtractionError as e:
+            return {"error": f"Could not read the resume bullets: {str(e)}", "cover_letter": cover_letter_content}
+        
+        return {
+            "cover_letter": cover_letter_content,
+            "resume_bullets": resume_bullets
+        }
     except Exception as e:
         return {"error": f"Error generating documents: {str(e)}"}
 
 # Save application to tracking system
-def save_application(job_analysis, docs, status="Ready to Apply"):
+def save_application(job_analysis, docs, status="Ready to Apply", tracker=None):
     # Create a record for tracking
     application = {
         "date": datetime.now().strftime("%Y-%m-%d"),
@@ -780,18 +1100,10 @@ def save_application(job_analysis, docs, status="Ready to Apply"):
         "resume_bullets": json.dumps(docs.get('resume_bullets', {}))
     }
     
-    # Load existing applications
-    try:
-        applications_df = pd.read_csv("job_applications.csv")
-    except:
-        applications_df = pd.DataFrame(columns=[
-            "date", "company", "position", "url", "match_score", 
-            "status", "cover_letter", "resume_bullets"
-        ])
-    
-    # Add new application
-    applications_df = pd.concat([applications_df, pd.DataFrame([application])], ignore_index=True)
-    applications_df.to_csv("job_applications.csv", index=False)
+    # Single transactional insert; earlier applications are not re-read or rewritten
+    if tracker is None:
+        tracker = get_application_tracker()
+    tracker.add(application)
     
     return "Application saved successfully"
 
@@ -1141,6 +1453,7 @@ def suggest_missing_skills(job_analysis, profile):
             
             # Update session state
             st.session_state['profile'] = profile
+            invalidate_profile_index()
             
             # Success message with better feedback
             st.success(f"✅ Added {new_skills_added} new skills to your profile!")
@@ -1170,7 +1483,8 @@ def suggest_missing_skills(job_analysis, profile):
                     updated_match_analysis = analyze_job_fit(
                         st.session_state['openrouter_client'], 
                         st.session_state['job_analysis']['job_data'], 
-                        profile
+                        profile,
+                        model=model_id
                     )
                     
                     if "error" not in updated_match_analysis:
@@ -1218,6 +1532,558 @@ def export_profile(profile):
     except Exception as e:
         st.error(f"Error exporting profile: {str(e)}")
 
+# Near-duplicate postings
+def get_posting_index():
+    """Postings analyzed in this session; analyses are only reused within the session that made them"""
+    if 'posting_index' not in st.session_state:
+        st.session_state['posting_index'] = PostingIndex()
+    return st.session_state['posting_index']
+
+def find_duplicate_posting(text, reuse_duplicates=None, index=None):
+    """Earlier analyzed posting that text nearly duplicates, or None.
+    
+    reuse_duplicates and index default to the sidebar setting and the
+    session's index; pass them explicitly from worker threads, which can't
+    read session state.
+    """
+    if reuse_duplicates is None:
+        reuse_duplicates = st.session_state.get('reuse_duplicates', True)
+    if not reuse_duplicates or not text:
+        return None
+    return (index if index is not None else get_posting_index()).find(text)
+
+def reusable_analysis(duplicate, profile_hash):
+    """Copy of the fit analysis made for duplicate's posting with this profile, or None"""
+    if duplicate is None:
+        return None
+    analysis = duplicate.record.analyses.get(profile_hash)
+    return copy.deepcopy(analysis) if analysis is not None else None
+
+def documents_for_job(job_data):
+    """Generated documents (this session) for a job with the same title and company"""
+    key = (job_data.get('title'), job_data.get('company'))
+    return [doc for doc in st.session_state.get('generated_documents', []) if (doc.get('job_title'), doc.get('company')) == key]
+
+# Batch job analysis
+def split_job_postings(text):
+    """Split a multi-posting paste on separator lines (---, ===, ***)"""
+    postings = re.split(r'^\s*(?:-{3,}|={3,}|\*{3,})\s*$', text, flags=re.MULTILINE)
+    return [p.strip() for p in postings if len(p.strip()) >= 50]
+
+def _batch_item_from_record(record, source):
+    """Turn one JSONL/CSV record into a batch item, or None if it has no usable content"""
+    if isinstance(record, str):
+        record = {"description": record}
+    if not isinstance(record, dict):
+        return None
+    
+    for key in ["description", "posting", "text", "content", "job_description"]:
+        value = record.get(key)
+        if isinstance(value, str) and len(value.strip()) >= 50:
+            item = {"source": source, "posting": value.strip()}
+            if record.get("url"):
+                item["url"] = record["url"]
+            return item
+    
+    if isinstance(record.get("url"), str) and record["url"].startswith("http"):
+        return {"source": record["url"], "url": record["url"]}
+    return None
+
+def collect_batch_items(pasted_text="", uploaded_file=None, urls_text=""):
+    """Gather batch items from a multi-posting paste, a TXT/JSONL/CSV upload and a list of URLs"""
+    items = []
+    
+    for i, posting in enumerate(split_job_postings(pasted_text or "")):
+        items.append({"source": f"Pasted posting {i + 1}", "posting": posting})
+    
+    if uploaded_file is not None:
+        name = uploaded_file.name
+        extension = name.rsplit(".", 1)[-1].lower() if "." in name else ""
+        content = uploaded_file.getvalue().decode("utf-8", errors="replace")
+        
+        if extension == "jsonl":
+            for line_no, line in enumerate(content.splitlines(), start=1):
+                if not line.strip():
+                    continue
+                try:
+                    item = _batch_item_from_record(json.loads(line), f"{name}:{line_no}")
+                except json.JSONDecodeError:
+                    item = None
+                if item:
+                    items.append(item)
+        elif extension == "csv":
+            for row_no, row in enumerate(csv.DictReader(io.StringIO(content)), start=2):
+                record = {k.strip().lower(): v for k, v in row.items() if k}
+                item = _batch_item_from_record(record, f"{name}:{row_no}")
+                if item:
+                    items.append(item)
+        else:
+            for i, posting in enumerate(split_job_postings(content)):
+                items.append({"source": f"{name} #{i + 1}", "posting": posting})
+    
+    for url in parse_url_list(urls_text):
+        items.append({"source": url, "url": url})
+    
+    return items
+
+def analyze_batch_item(client, item, profile, model, profile_index=None, semantic_threshold=None,
+                       reuse_duplicates=True, posting_index=None):
+    """Run the single-posting pipeline for one batch item; safe to call from worker threads.
+    
+    posting_index is the session's PostingIndex (see get_posting_index), which
+    the analyzed posting is added to. With reuse_duplicates, a near-duplicate
+    of a posting in it reuses its job data and, for the same profile, its fit
+    analysis. Without an index nothing is reused or recorded.
+    """
+    reuse_duplicates = reuse_duplicates and posting_index is not None
+    start = time.perf_counter()
+    result = {"source": item["source"]}
+    profile_hash = profile_index.content_hash if profile_index is not None else profile_content_hash(profile)
+    
+    if "posting" in item:
+        posting_text = item["posting"]
+        duplicate = find_duplicate_posting(posting_text, reuse_duplicates, posting_index)
+        if duplicate is not None:
+            job_data = copy.deepcopy(duplicate.record.job_data)
+        else:
+            job_data = process_job_posting(client, posting_text, model=model)
+        if item.get("url"):
+            job_data["url"] = item["url"]
+    else:
+        # The shared ingestor keeps every worker within the per-domain limits
+        try:
+            job_data = url_ingestor.ingest(item["url"])
+        except Exception as e:
+            job_data = {"error": f"Error fetching {item['url']}: {str(e)}"}
+        posting_text = job_data.get("description", "")
+        duplicate = find_duplicate_posting(posting_text, reuse_duplicates, posting_index) if "error" not in job_data else None
+    
+    if "error" in job_data:
+        result["error"] = job_data["error"]
+    else:
+        result["job_data"] = job_data
+        if duplicate is not None:
+            result["duplicate_of"] = duplicate.record.label()
+            result["similarity"] = duplicate.similarity
+        match_analysis = reusable_analysis(duplicate, profile_hash)
+        if match_analysis is None:
+            match_analysis = analyze_job_fit(
+                client, job_data, profile, model=model, quiet=True,
+                profile_index=profile_index, semantic_threshold=semantic_threshold
+            )
+        if "error" in match_analysis:
+            result["error"] = match_analysis["error"]
+        elif posting_index is not None:
+            posting_index.add(posting_text, item["source"], job_data, profile_hash, match_analysis)
+        result["match_analysis"] = match_analysis
+    
+    result["seconds"] = time.perf_counter() - start
+    return result
+
+def batch_results_table(results):
+    """Flatten batch results into a DataFrame ranked by match score"""
+    rows = []
+    for idx, result in enumerate(results):
+        job_data = result.get("job_data", {})
+        match = result.get("match_analysis", {})
+        rows.append({
+            "#": idx,
+            "Match": match.get("overall_match", 0) if "error" not in result else None,
+            "Skills Match": match.get("skills_match", ""),
+            "Title": job_data.get("title", ""),
+            "Company": job_data.get("company", ""),
+            "Location": job_data.get("location", ""),
+            "Source": result["source"],
+            "Duplicate Of": result.get("duplicate_of", ""),
+            "Seconds": round(result.get("seconds", 0), 1),
+            "Error": result.get("error", ""),
+        })
+    df = pd.DataFrame(rows)
+    if not df.empty:
+        df = df.sort_values("Match", ascending=False, na_position="last")
+    return df
+
+def render_batch_analysis(client):
+    """Batch mode for the Job Analysis tab: analyze many postings on a worker pool"""
+    st.write("Analyze many postings at once. Separate pasted postings with a line containing only `---`.")
+    
+    pasted_text = st.text_area("Job Postings", height=250, key="batch_postings")
+    uploaded_file = st.file_uploader(
+        "Or upload postings (TXT separated by ---, JSONL with a description or url field, or CSV with a description or url column)",
+        type=["txt", "jsonl", "csv"],
+        key="batch_upload"
+    )
+    urls_text = st.text_area("Or list job URLs (one per line)", height=100, key="batch_urls")
+    max_workers = st.slider("Parallel workers", min_value=1, max_value=10, value=4)
+    
+    if st.button("Analyze All"):
+        items = collect_batch_items(pasted_text, uploaded_file, urls_text)
+        if not items:
+            st.error("No job postings found. Paste postings, upload a file or list some URLs.")
+            return
+        run_batch_analysis(client, items, max_workers)
+    
+    render_batch_results()
+
+def run_batch_analysis(client, items, max_workers=4):
+    """Analyze batch items on a worker pool, showing partial results; stores them in session state"""
+    # Resolve session-dependent settings up front; workers can't read session state
+    model = st.session_state['get_model_id']('analysis')
+    profile = st.session_state['profile']
+    profile_index = get_cached_profile_index(profile)
+    semantic_threshold = st.session_state.get('semantic_threshold')
+    reuse_duplicates = st.session_state.get('reuse_duplicates', True)
+    posting_index = get_posting_index()
+    results = []
+    
+    # Pasted postings that nearly duplicate one earlier in the batch wait for it,
+    # so they reuse its analysis instead of racing it to the model
+    waves = [items]
+    if reuse_duplicates:
+        seen = PostingIndex()
+        first, repeats = [], []
+        for item in items:
+            if "posting" in item and seen.find(item["posting"]) is not None:
+                repeats.append(item)
+            else:
+                first.append(item)
+                if "posting" in item:
+                    seen.add(item["posting"], item["source"], {})
+        waves = [first, repeats]
+    
+    progress = st.progress(0.0, text=f"Analyzing {len(items)} postings with {model}...")
+    table_placeholder = st.empty()
+    
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for wave in waves:
+            futures = {
+                executor.submit(
+                    analyze_batch_item, client, item, profile, model, profile_index, semantic_threshold,
+                    reuse_duplicates, posting_index
+                ): item
+                for item in wave
+            }
+            for future in as_completed(futures):
+                try:
+                    results.append(future.result())
+                except Exception as e:
+                    results.append({"source": futures[future]["source"], "error": str(e)})
+                progress.progress(len(results) / len(items), text=f"Analyzed {len(results)} of {len(items)} postings")
+                # Partial results stay visible while the rest are still running
+                table_placeholder.dataframe(batch_results_table(results), hide_index=True, use_container_width=True)
+    
+    st.session_state['batch_results'] = results
+
+def render_batch_results():
+    """Summary of the last batch run and a picker to continue with one of its jobs"""
+    results = st.session_state.get('batch_results')
+    if results:
+        errors = sum(1 for r in results if "error" in r)
+        st.success(f"Analyzed {len(results) - errors} postings" + (f" ({errors} failed)" if errors else ""))
+        
+        # Let the user pick one result to continue with in the Generate Documents tab
+        ranked = [r for r in sorted(results, key=lambda r: r.get("match_analysis", {}).get("overall_match", 0), reverse=True) if "error" not in r]
+        if ranked:
+            choice = st.selectbox(
+                "Open an analysis for document generation:",
+                options=range(len(ranked)),
+                format_func=lambda i: f"{ranked[i]['match_analysis'].get('overall_match', 0)}/10 - {ranked[i]['job_data'].get('title', '')} at {ranked[i]['job_data'].get('company', '')}"
+            )
+            if st.button("Use This Job"):
+                st.session_state['job_data'] = ranked[choice]['job_data']
+                st.session_state['job_analysis'] = {
+                    "job_data": ranked[choice]['job_data'],
+                    "match_analysis": ranked[choice]['match_analysis']
+                }
+                st.success("Job selected. Continue in the 'Generate Documents' tab.")
+
+# Generated Documents tab
+def document_match_score(doc):
+    """Overall match score of a generated document as a number (0 if unknown)"""
+    try:
+        return float(doc.get('match_analysis', {}).get('overall_match', 0) or 0)
+    except (TypeError, ValueError):
+        return 0.0
+
+def filter_generated_documents(documents, company="", date_from=None, date_to=None, min_score=0.0):
+    """Return (index, document) pairs matching the filters, newest first.
+    
+    Only cheap metadata is inspected, so filtering stays fast however much
+    content the documents hold. Indexes refer to the unfiltered list.
+    """
+    company = company.strip().lower()
+    date_from = date_from.isoformat() if date_from else None
+    date_to = date_to.isoformat() if date_to else None
+    matches = []
+    for idx, doc in enumerate(documents):
+        if company and company not in str(doc.get('company', '')).lower():
+            continue
+        day = str(doc.get('date', ''))[:10]
+        if (date_from and day < date_from) or (date_to and day > date_to):
+            continue
+        if document_match_score(doc) < min_score:
+            continue
+        matches.append((idx, doc))
+    matches.reverse()
+    return matches
+
+def format_resume_text(resume_bullets):
+    resume_text = ""
+    for exp, bullets in resume_bullets.items():
+        resume_text += f"{exp}\n"
+        for bullet in bullets:
+            resume_text += f"• {bullet}\n"
+        resume_text += "\n"
+    return resume_text
+
+def format_complete_application(doc, resume_text):
+    match = doc.get('match_analysis', {})
+    return f"""Cover Letter
+{'-' * 50}
+{doc['cover_letter']}
+
+Resume
+{'-' * 50}
+{resume_text}
+
+Job Match Analysis
+{'-' * 50}
+Overall Match Score: {match.get('overall_match', 'N/A')}/10
+Skills Match: {match.get('skills_match', 'N/A')}
+
+Matching Skills:
+{chr(10).join(f"✓ {skill}" for skill in match.get('matching_skills', []))}
+
+Missing Skills:
+{chr(10).join(f"✗ {skill}" for skill in match.get('missing_skills', []))}
+
+Analysis:
+{match.get('explanation', 'N/A')}
+"""
+
+def render_document_detail(idx, doc):
+    """Full view of one generated document, including its download buttons"""
+    st.subheader(f"{doc['job_title']} at {doc['company']}")
+    st.write(f"**Generated on:** {doc['date']}")
+    
+    # Display match analysis
+    st.subheader("Job Match Analysis")
+    if 'match_analysis' in doc:
+        match = doc['match_analysis']
+        st.write(f"**Overall Match Score:** {match.get('overall_match', 'N/A')}/10")
+        st.write(f"**Skills Match:** {match.get('skills_match', 'N/A')}")
+        
+        # Create columns for matching and missing skills
+        match_col, miss_col = st.columns(2)
+        
+        with match_col:
+            st.write("🟢 Matching Skills:")
+            for skill in match.get('matching_skills', []):
+                st.write(f"✓ {skill}")
+        
+        with miss_col:
+            st.write("🔴 Missing Skills:")
+            for skill in match.get('missing_skills', []):
+                st.write(f"✗ {skill}")
+        
+        if "explanation" in match:
+            st.write("**Analysis:**")
+            st.write(match["explanation"])
+    
+    # Display cover letter
+    st.subheader("Cover Letter")
+    st.text_area("Cover Letter", doc['cover_letter'], height=200, key=f"cover_letter_{idx}")
+    
+    # Display resume bullets
+    st.subheader("Resume Bullets")
+    for exp, bullets in doc['resume_bullets'].items():
+        st.write(f"**{exp}**")
+        for bullet in bullets:
+            st.write(f"• {bullet}")
+    
+    # Download payloads are only built for the open document
+    resume_text = format_resume_text(doc['resume_bullets'])
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.download_button(
+            label="Download Cover Letter",
+            data=doc['cover_letter'],
+            file_name=f"cover_letter_{doc['job_title']}_{doc['company']}.txt",
+            mime="text/plain",
+            key=f"download_cover_{idx}"
+        )
+    with col2:
+        st.download_button(
+            label="Download Resume",
+            data=resume_text,
+            file_name=f"resume_{doc['job_title']}_{doc['company']}.txt",
+            mime="text/plain",
+            key=f"download_resume_{idx}"
+        )
+    with col3:
+        st.download_button(
+            label="Download Complete Application",
+            data=format_complete_application(doc, resume_text),
+            file_name=f"complete_application_{doc['job_title']}_{doc['company']}.txt",
+            mime="text/plain",
+            key=f"download_complete_{idx}"
+        )
+    
+    track_col, delete_col = st.columns(2)
+    with track_col:
+        if st.button("Track Application", key=f"track_{idx}"):
+            st.success(save_application(
+                {"job_data": doc.get('job_data', {"title": doc['job_title'], "company": doc['company'], "url": ""}),
+                 "match_analysis": doc.get('match_analysis', {})},
+                doc
+            ))
+    with delete_col:
+        if st.button("Delete Document", key=f"delete_{idx}"):
+            st.session_state['generated_documents'].pop(idx)
+            st.session_state['open_document'] = None
+            st.rerun()
+
+def render_generated_documents():
+    """Filtered, paginated list of generated documents with one document open at a time.
+    
+    Each rerun renders one compact row per document on the current page plus
+    the full view of the open document, so its cost doesn't grow with history.
+    """
+    st.header("Generated Documents")
+    documents = st.session_state['generated_documents']
+    
+    if not documents:
+        st.info("No documents have been generated yet. Generate some documents in the 'Generate Documents' tab to see them here.")
+        return
+    
+    # Filters
+    filter_col1, filter_col2, filter_col3, filter_col4 = st.columns(4)
+    with filter_col1:
+        company_filter = st.text_input("Company", key="documents_company_filter")
+    with filter_col2:
+        date_from = st.date_input("From", value=None, key="documents_date_from")
+    with filter_col3:
+        date_to = st.date_input("To", value=None, key="documents_date_to")
+    with filter_col4:
+        min_score = st.slider("Minimum match score", 0, 10, 0, key="documents_min_score")
+    
+    matches = filter_generated_documents(documents, company_filter, date_from, date_to, min_score)
+    if not matches:
+        st.info(f"No documents match these filters ({len(documents)} in total).")
+        return
+    
+    # Pagination
+    page_col1, page_col2 = st.columns([1, 3])
+    with page_col1:
+        page_size = st.selectbox("Per page", [10, 25, 50], key="documents_page_size")
+    page_count = (len(matches) + page_size - 1) // page_size
+    with page_col2:
+        page = st.number_input(
+            f"Page (of {page_count})", min_value=1, max_value=page_count,
+            value=min(st.session_state.get('documents_page', 1), page_count)
+        )
+    st.session_state['documents_page'] = page
+    page_matches = matches[(page - 1) * page_size:page * page_size]
+    st.caption(f"Showing {len(page_matches)} of {len(matches)} matching documents ({len(documents)} in total)")
+    
+    open_idx = st.session_state.get('open_document')
+    for idx, doc in page_matches:
+        row_col, button_col = st.columns([5, 1])
+        with row_col:
+            st.write(
+                f"**{doc['job_title']}** at {doc['company']} · {doc['date']} · "
+                f"match {doc.get('match_analysis', {}).get('overall_match', 'N/A')}/10"
+            )
+        with button_col:
+            if idx == open_idx:
+                if st.button("Close", key=f"close_document_{idx}"):
+                    st.session_state['open_document'] = None
+                    st.rerun()
+            elif st.button("Open", key=f"open_document_{idx}"):
+                st.session_state['open_document'] = idx
+                st.rerun()
+    
+    if open_idx is not None and 0 <= open_idx < len(documents):
+        st.divider()
+        render_document_detail(open_idx, documents[open_idx])
+
+def render_application_tracker(tracker=None):
+    """Filtered, paginated list of tracked applications with in-place status changes.
+    
+    Filtering and paging run in the tracker's indexed queries, and only the
+    listing columns of the current page are loaded, not cover letters.
+    """
+    st.header("Tracked Applications")
+    if tracker is None:
+        tracker = get_application_tracker()
+    total = tracker.count()
+    
+    if not total:
+        st.info("No applications are tracked yet. Open a document in the 'Generated Documents' tab and click 'Track Application'.")
+        return
+    
+    # Filters
+    filter_col1, filter_col2, filter_col3, filter_col4, filter_col5 = st.columns(5)
+    with filter_col1:
+        status_filter = st.selectbox("Status", ["All"] + tracker.statuses(), key="applications_status_filter")
+    with filter_col2:
+        company_filter = st.text_input("Company starts with", key="applications_company_filter")
+    with filter_col3:
+        date_from = st.date_input("From", value=None, key="applications_date_from")
+    with filter_col4:
+        date_to = st.date_input("To", value=None, key="applications_date_to")
+    with filter_col5:
+        min_score = st.slider("Minimum match score", 0, 10, 0, key="applications_min_score")
+    
+    filters = {
+        "status": None if status_filter == "All" else status_filter,
+        "company": company_filter.strip() or None,
+        "date_from": date_from.isoformat() if date_from else None,
+        "date_to": date_to.isoformat() if date_to else None,
+        "min_score": min_score or None,
+    }
+    matching = tracker.count(**filters)
+    if not matching:
+        st.info(f"No applications match these filters ({total} in total).")
+        return
+    
+    # Pagination
+    page_col1, page_col2 = st.columns([1, 3])
+    with page_col1:
+        page_size = st.selectbox("Per page", [10, 25, 50], key="applications_page_size")
+    page_count = (matching + page_size - 1) // page_size
+    with page_col2:
+        page = st.number_input(
+            f"Page (of {page_count})", min_value=1, max_value=page_count,
+            value=min(st.session_state.get('applications_page', 1), page_count),
+            key="applications_page_input"
+        )
+    st.session_state['applications_page'] = page
+    applications = tracker.query(
+        **filters, limit=page_size, offset=(page - 1) * page_size,
+        columns=["date", "company", "position", "url", "match_score", "status"]
+    )
+    st.caption(f"Showing {len(applications)} of {matching} matching applications ({total} in total)")
+    
+    for application in applications:
+        row_col, status_col = st.columns([4, 2])
+        with row_col:
+            url = application['url']
+            link = f" · [posting]({url})" if url.startswith(("http://", "https://")) else ""
+            st.write(
+                f"**{application['position'] or 'Untitled position'}** at {application['company'] or 'Unknown company'} · "
+                f"{application['date']} · match {application['match_score']:g}/10{link}"
+            )
+        with status_col:
+            options = APPLICATION_STATUSES + [application['status']] * (application['status'] not in APPLICATION_STATUSES)
+            status = st.selectbox(
+                "Status", options, index=options.index(application['status']),
+                key=f"application_status_{application['id']}", label_visibility="collapsed"
+            )
+            if status != application['status']:
+                tracker.update_status(application['id'], status)
+                st.rerun()
+
 # Main app
 def main():
     st.title("Smart Job Application Assistant")
@@ -1236,6 +2102,9 @@ def main():
     if 'generated_documents' not in st.session_state:
         st.session_state['generated_documents'] = []
     
+    # Job links are fetched with conditional GETs against the page cache
+    url_ingestor.page_cache = get_page_cache()
+    
     # Setup API client in sidebar
     client = setup_api()
     
@@ -1253,7 +2122,7 @@ def main():
         st.session_state['application_docs'] = None
     
     # Tabs for different functions
-    tab1, tab2, tab3, tab4 = st.tabs(["Profile", "Job Analysis", "Generate Documents", "Generated Documents"])
+    tab1, tab2, tab3, tab4, tab5 = st.tabs(["Profile", "Job Analysis", "Generate Documents", "Generated Documents", "Applications"])
     
     # Tab 1: Profile Management
     with tab1:
@@ -1272,93 +2141,53 @@ def main():
                                             type=["pdf", "docx", "json", "txt"])
             
             if uploaded_file:
-                file_type = uploaded_file.type
-                
-                # Get file extension from name if type is not specific enough
-                file_extension = uploaded_file.name.split(".")[-1].lower() if "." in uploaded_file.name else ""
-                
                 if st.button("Process Document"):
                     with st.spinner("Processing your document..."):
-                        # Handle different file types
-                        if file_type == "application/pdf" or file_extension == "pdf":
-                            # Process PDF
-                            pdf_reader = PyPDF2.PdfReader(io.BytesIO(uploaded_file.getvalue()))
-                            extracted_text = ""
-                            for page in pdf_reader.pages:
-                                extracted_text += page.extract_text()
-                                
-                            # Display raw text for debugging
-                            with st.expander("Debug - Extracted Text"):
-                                st.text(extracted_text)
+                        profile_data = None
+                        try:
+                            # Parsed once per file content; re-processing the same file is a cache hit.
+                            # Long PDFs stop at the pages that fill the prompt budget
+                            document = document_ingestor.ingest(
+                                uploaded_file.getvalue(), uploaded_file.name, uploaded_file.type,
+                                max_chars=DOCUMENT_TEXT_BUDGET
+                            )
                             
-                            if client:
-                                # Use AI to extract info
-                                profile_data = extract_info_from_resume(client, uploaded_file)
-                            else:
-                                # Fallback to basic extraction
-                                profile_data = extract_profile_from_text(extracted_text)
-                        
-                        elif file_type == "application/json" or file_extension == "json":
-                            # Process JSON file
-                            try:
-                                json_content = uploaded_file.getvalue().decode('utf-8')
-                                # Display raw JSON for debugging
+                            # Display raw content for debugging
+                            if document.kind == "json":
                                 with st.expander("Debug - Raw JSON content"):
-                                    st.code(json_content, language="json")
-                                
-                                # Parse the JSON
-                                raw_data = json.loads(json_content)
-                                
-                                # Convert to standard profile format
-                                profile_data = convert_professional_database_to_profile(raw_data)
-                                
-                                if "error" in profile_data:
-                                    st.error(f"Error processing JSON: {profile_data['error']}")
-                                    profile_data = None
-                                
-                            except json.JSONDecodeError as e:
-                                st.error(f"Failed to parse JSON file: {str(e)}")
-                                profile_data = None
-                            except Exception as e:
-                                st.error(f"Error processing file: {str(e)}")
-                                profile_data = None
-                        
-                        elif file_type == "text/plain" or file_extension == "txt":
-                            # Process plain text
-                            extracted_text = uploaded_file.getvalue().decode('utf-8')
+                                    st.code(document.text, language="json")
+                            else:
+                                with st.expander("Debug - Extracted Text"):
+                                    if document.page_timings:
+                                        slowest = max(document.page_timings, key=lambda timing: timing[1])
+                                        st.caption(
+                                            f"Read {document.pages_read} of {document.page_count} pages in "
+                                            f"{sum(seconds for _, seconds in document.page_timings):.2f}s "
+                                            f"(slowest: page {slowest[0]}, {slowest[1]:.2f}s)"
+                                        )
+                                    st.text(document.text)
                             
-                            # Display raw text for debugging
-                            with st.expander("Debug - Extracted Text"):
-                                st.text(extracted_text)
-                                
-                            if client:
-                                # Use AI to extract structure
-                                profile_data = client.chat_completion(
-                                    model=get_recommended_models()[st.session_state.get('model_analysis', 'balanced')],
-                                    messages=[
-                                        {"role": "system", "content": "Extract structured professional profile information from this text. Return as JSON."},
-                                        {"role": "user", "content": f"Extract key professional details from this text into a structured JSON with personal_info, skills, education, experience, etc.:\n\n{extracted_text[:10000]}"}
-                                    ]
+                            if not document.complete:
+                                st.warning(
+                                    f"Only the first {document.pages_read} of {document.page_count} pages were read; "
+                                    "the rest is beyond what profile extraction can use"
                                 )
-                                
-                                try:
-                                    content = profile_data['choices'][0]['message']['content']
-                                    # Extract JSON if it's wrapped in code blocks
-                                    if "```" in content:
-                                        match = re.search(r'```(?:json)?\s*(.*?)```', content, re.DOTALL)
-                                        if match:
-                                            content = match.group(1)
-                                    profile_data = json.loads(content)
-                                except:
-                                    # Fallback to basic extraction
-                                    profile_data = extract_profile_from_text(extracted_text)
-                            else:
-                                # Fallback to basic extraction
-                                profile_data = extract_profile_from_text(extracted_text)
-                        
-                        else:
-                            st.error(f"Unsupported file type: {file_type}")
-                            profile_data = None
+                            
+                            profile_data = build_profile_from_document(client, document)
+                            if isinstance(profile_data, dict) and "error" in profile_data:
+                                st.error(f"Error processing document: {profile_data['error']}")
+                                profile_data = None
+                            elif isinstance(profile_data, dict) and "extraction_warnings" in profile_data:
+                                # Copy, so the memoized profile keeps its warnings for the next upload
+                                profile_data = dict(profile_data)
+                                for warning in profile_data.pop("extraction_warnings"):
+                                    st.warning(warning)
+                        except UnsupportedDocumentError as e:
+                            st.error(str(e))
+                        except json.JSONDecodeError as e:
+                            st.error(f"Failed to parse JSON file: {str(e)}")
+                        except Exception as e:
+                            st.error(f"Error processing file: {str(e)}")
                         
                         # If profile was successfully extracted
                         if profile_data:
@@ -1543,6 +2372,7 @@ def main():
                 if st.session_state['building_profile']['personal_info']['name']:
                     # Save to main profile in session state
                     st.session_state['profile'] = st.session_state['building_profile']
+                    invalidate_profile_index()
                     st.success("Profile created successfully!")
                     
                     # Display final profile
@@ -2115,75 +2945,135 @@ def main():
             col1, col2 = st.columns([2, 1])
             
             with col1:
-                # Single text field for entire job posting
-                st.write("Paste the full job posting below (title, company, description, etc.)")
-                job_posting = st.text_area("Job Posting", height=300)
+                analysis_mode = st.radio("Mode", ["Single posting", "Batch"], horizontal=True)
                 
-                if job_posting and st.button("Analyze Job"):
-                    if len(job_posting.strip()) < 50:
-                        st.error("Please paste a more complete job posting")
+                if analysis_mode == "Batch":
+                    render_batch_analysis(client)
+                else:
+                    # Postings come in pasted as text or as links to fetch
+                    input_mode = st.radio("Input", ["Paste posting", "Job links"], horizontal=True, key="job_input_mode")
+                    job_data = None
+                    posting_text = None
+                    duplicate = None
+                    
+                    if input_mode == "Job links":
+                        st.write("Paste one or more job links, one per line. Several links are fetched concurrently and ranked together.")
+                        links_text = st.text_area("Job Links", height=150)
+                        urls = parse_url_list(links_text)
+                        
+                        if links_text and st.button("Fetch and Analyze"):
+                            if not urls:
+                                st.error("No http(s) links found. Put one link on each line.")
+                            elif len(urls) == 1:
+                                with st.spinner(f"Fetching {urls[0]}..."):
+                                    try:
+                                        job_data = url_ingestor.ingest(urls[0])
+                                        posting_text = job_data.get("description", "")
+                                        duplicate = find_duplicate_posting(posting_text)
+                                    except Exception as e:
+                                        job_data = {"error": f"Error fetching {urls[0]}: {str(e)}"}
+                            else:
+                                run_batch_analysis(client, [{"source": url, "url": url} for url in urls])
+                        
+                        if len(urls) > 1:
+                            render_batch_results()
+                        
+                        page_stats = url_ingestor.page_cache.stats() if url_ingestor.page_cache else None
+                        if page_stats and page_stats['entries']:
+                            st.caption(
+                                f"Page cache: {page_stats['not_modified']} unchanged pages reused, "
+                                f"{page_stats['stored']} downloaded, {page_stats['entries']} stored"
+                            )
                     else:
-                        # Process the job posting
-                        with st.spinner("Processing job posting..."):
-                            job_data = process_job_posting(client, job_posting)
-                            
+                        # Single text field for entire job posting
+                        st.write("Paste the full job posting below (title, company, description, etc.)")
+                        job_posting = st.text_area("Job Posting", height=300)
+                        
+                        if job_posting and st.button("Analyze Job"):
+                            if len(job_posting.strip()) < 50:
+                                st.error("Please paste a more complete job posting")
+                            else:
+                                posting_text = job_posting
+                                duplicate = find_duplicate_posting(job_posting)
+                                if duplicate is not None:
+                                    job_data = copy.deepcopy(duplicate.record.job_data)
+                                else:
+                                    # Process the job posting
+                                    with st.spinner("Processing job posting..."):
+                                        job_data = process_job_posting(client, job_posting)
+                    
+                    if job_data is not None:
                         if "error" in job_data:
                             st.error(f"Error processing job: {job_data['error']}")
                         else:
                             st.success("Job posting processed successfully!")
                             
+                            if duplicate is not None:
+                                st.info(
+                                    f"This posting is a near-duplicate ({duplicate.similarity:.0%} similar) of one analyzed earlier: "
+                                    f"{duplicate.record.label()}. Its analysis is reused; untick 'Reuse analyses of near-duplicate "
+                                    "postings' in the sidebar to analyze it afresh."
+                                )
+                                if documents_for_job(duplicate.record.job_data):
+                                    st.info("Documents were already generated for that posting; see the 'Generated Documents' tab.")
+                    
                             # Display basic job info
                             st.subheader(job_data["title"])
                             st.write(f"Company: {job_data['company']}")
-                            
+                    
                             if "location" in job_data and job_data['location'] != "Unknown":
                                 st.write(f"Location: {job_data['location']}")
-                                
+                        
                             if "job_type" in job_data and job_data['job_type'] != "Unknown":
                                 st.write(f"Job Type: {job_data['job_type']}")
-                            
+                    
                             # Store in session state
                             st.session_state['job_data'] = job_data
-                            
+                    
                             # Get the model ID to use for analysis
                             model_id = st.session_state['get_model_id']('analysis')
-                            
-                            # Analyze match
-                            with st.spinner(f"Analyzing job fit using {model_id}..."):
-                                match_analysis = analyze_job_fit(client, job_data, st.session_state['profile'])
-                                
+                    
+                            # Analyze match, unless this profile already has an analysis of the duplicate
+                            profile_hash = profile_content_hash(st.session_state['profile'])
+                            match_analysis = reusable_analysis(duplicate, profile_hash)
+                            if match_analysis is None:
+                                with st.spinner(f"Analyzing job fit using {model_id}..."):
+                                    match_analysis = analyze_job_fit(client, job_data, st.session_state['profile'], model=model_id)
+                        
                             if "error" in match_analysis:
                                 st.error(f"Error analyzing job: {match_analysis['error']}")
                             else:
+                                get_posting_index().add(posting_text, job_data.get("url") or "pasted posting", job_data, profile_hash, match_analysis)
+                                
                                 # Display match analysis
                                 st.subheader("Match Analysis")
                                 st.write(f"Overall Match Score: {match_analysis.get('overall_match', 'N/A')}/10")
                                 st.write(f"Skills Match: {match_analysis.get('skills_match', 'N/A')}")
-                                
+                        
                                 # Create columns for matching and missing skills
                                 match_col, miss_col = st.columns(2)
-                                
+                        
                                 with match_col:
                                     st.write("🟢 Matching Skills:")
                                     for skill in match_analysis.get('matching_skills', []):
                                         st.write(f"✓ {skill}")
-                                
+                        
                                 with miss_col:
                                     st.write("🔴 Missing Skills:")
                                     for skill in match_analysis.get('missing_skills', []):
                                         st.write(f"✗ {skill}")
-                                    
+                            
                                 # Show explanation
                                 if "explanation" in match_analysis:
                                     st.write("Analysis:")
                                     st.write(match_analysis["explanation"])
-                                    
+                            
                                 # Save complete analysis
                                 st.session_state['job_analysis'] = {
                                     "job_data": job_data,
                                     "match_analysis": match_analysis
                                 }
-            
+
             with col2:
                 # Show skill suggestions and profile export if job has been analyzed
                 if 'job_analysis' in st.session_state and st.session_state['job_analysis']:
@@ -2211,104 +3101,56 @@ def main():
         elif not client:
             st.warning("Please enter your OpenRouter API key in the sidebar")
         else:
-            # Get model ID for document generation
-            model_id = st.session_state['get_model_id']('generation')
+            # Get model IDs for document generation (they differ only under automatic routing)
+            model_id = st.session_state['get_model_id']('generation', 'cover_letter')
+            resume_model_id = st.session_state['get_model_id']('generation', 'resume_bullets')
             
             if st.button("Generate Application Documents"):
-                with st.spinner(f"Generating tailored documents using {model_id}..."):
+                models_used = model_id if resume_model_id == model_id else f"{model_id} and {resume_model_id}"
+                with st.spinner(f"Generating tailored documents using {models_used}..."):
                     try:
-                        # Generate application documents with the selected model
-                        # First, generate cover letter with explicit model ID
-                        cover_letter_prompt = f"""
-                        Create a brief, enthusiastic cover letter for a {st.session_state['job_analysis']['job_data']['title']} position at {st.session_state['job_analysis']['job_data']['company']}.
-
-                        THE FOLLOWING INFORMATION IS THE ONLY FACTUAL INFORMATION YOU CAN USE:
-                        
-                        CANDIDATE DETAILS:
-                        Name: {st.session_state['profile'].get('personal_info', {}).get('name', '')}
-                        Email: {st.session_state['profile'].get('personal_info', {}).get('email', '')}
-                        Phone: {st.session_state['profile'].get('personal_info', {}).get('phone', '')}
-                        Location: {st.session_state['profile'].get('personal_info', {}).get('location', '')}
-                        
-                        VERIFIED SKILLS (use ONLY these exact skills, do not fabricate or expand):
-                        {json.dumps(st.session_state['profile'].get('skills', {}).get('technical', []))}
-                        
-                        VERIFIED WORK EXPERIENCE (use ONLY these exact companies and details, do not fabricate or expand):
-                        {json.dumps(st.session_state['profile'].get('experience', []))}
-                        
-                        JOB REQUIREMENTS:
-                        {st.session_state['job_analysis']['job_data']['description'][:800]}
-                        
-                        IMPORTANT INSTRUCTIONS:
-                        1. Keep it SHORT (150-200 words maximum, about 3-4 short paragraphs)
-                        2. Be enthusiastic and friendly, but professional
-                        3. NEVER include ANY placeholders like "[Your Name]"
-                        4. NEVER fabricate work experience or skills - use ONLY what's provided above
-                        5. If a real company name isn't provided above, DO NOT make one up - refer to roles generically
-                        6. Only include details explicitly listed in the VERIFIED sections
-                        7. Do not expand on bullet points with specifics not provided above
-                        8. Keep it direct and engaging for busy hiring managers
-                        9. End with "Sincerely," followed by the name only if provided
-                        
-                        Use ONLY the facts provided above - no fabrication whatsoever.
-                        """
-                        
-                        cover_letter_response = client.chat_completion(
-                            model=model_id,
-                            messages=[
-                                {"role": "system", "content": "You are a strictly factual resume writer who uses ONLY the exact information provided. You NEVER fabricate experience, companies, or achievements. You do not elaborate beyond the given facts."},
-                                {"role": "user", "content": cover_letter_prompt}
-                            ]
+                        # Prompts fitted to the selected models' token budgets
+                        cover_letter_call, resume_call = build_generation_calls(
+                            client, st.session_state['job_analysis'], st.session_state['profile'],
+                            model_id, resume_model_id
                         )
                         
-                        cover_letter_content = cover_letter_response['choices'][0]['message']['content']
+                        # Stream the cover letter so it renders from the first token
+                        st.subheader("Cover Letter")
+                        cover_letter_placeholder = st.empty()
+                        streamed_parts = []
                         
-                        # Generate resume bullets - fixed the JSON example format
-                        resume_prompt = """
-                        Create tailored resume bullet points for a {} position at {}.
+                        def render_cover_letter_token(token):
+                            streamed_parts.append(token)
+                            cover_letter_placeholder.markdown("".join(streamed_parts))
                         
-                        USE ONLY THESE EXACT WORK EXPERIENCES (do not fabricate or expand):
-                        {}
+                        # Resume bullets are shown one by one as the JSON streams in
+                        st.subheader("Tailored Resume Bullets")
+                        resume_placeholder = st.empty()
+                        resume_parser = StreamingJSONParser(expect=dict)
                         
-                        JOB REQUIREMENTS:
-                        {}
+                        def render_resume_token(token):
+                            resume_parser.feed(token)
+                            bullets = resume_bullets_from(resume_parser.partial())
+                            if bullets:
+                                resume_placeholder.markdown(resume_bullets_markdown(bullets))
                         
-                        INSTRUCTIONS:
-                        1. For each position, create 3 powerful bullet points
-                        2. Each bullet should be ONE LINE only (15 words maximum)
-                        3. Start with strong ACTION VERBS
-                        4. ONLY use responsibilities and achievements explicitly listed above
-                        5. DO NOT fabricate or add details not provided in the work experience
-                        6. If no achievements are provided for a role, focus on responsibilities only
+                        # The resume bullets don't depend on the cover letter, so they
+                        # are requested concurrently while the cover letter streams in
+                        cover_letter_call["stream"] = True
+                        cover_letter_call["on_token"] = render_cover_letter_token
+                        resume_call["stream"] = True
+                        resume_call["on_token"] = render_resume_token
+                        cover_letter_response, resume_response = run_concurrent_completions(client, [cover_letter_call, resume_call])
                         
-                        Return as JSON with position titles as keys and arrays of bullet points as values.
-                        Return ONLY valid JSON with no explanations or markdown formatting.
-                        Example format: {{"Position Title": ["Bullet 1", "Bullet 2", "Bullet 3"]}}
-                        """.format(
-                            st.session_state['job_analysis']['job_data']['title'],
-                            st.session_state['job_analysis']['job_data']['company'],
-                            json.dumps(st.session_state['profile'].get('experience', [])),
-                            st.session_state['job_analysis']['job_data']['description'][:800]
-                        )
-                        
-                        resume_response = client.chat_completion(
-                            model=model_id,
-                            messages=[
-                                {"role": "system", "content": "You create powerful resume content using ONLY the exact information provided. You NEVER fabricate experience, roles, or achievements. Return ONLY JSON."},
-                                {"role": "user", "content": resume_prompt}
-                            ]
-                        )
+                        cover_letter_content = cover_letter_response['choices'][0]['message']['content']
                         
+                        # Swap the streamed preview for an editable copy
+                        cover_letter_placeholder.text_area("Copy or edit as needed:", cover_letter_content, height=300)
                         resume_content = resume_response['choices'][0]['message']['content']
                         
-                        # Extract JSON if it's wrapped in code blocks
-                        if "```" in resume_content:
-                            match = re.search(r'```(?:json)?\s*(.*?)```', resume_content, re.DOTALL)
-                            if match:
-                                resume_content = match.group(1).strip()
-                                
                         try:
-                            resume_bullets = json.loads(resume_content)
+                            resume_bullets = parse_resume_bullets(resume_content)
                             
                             docs = {
                                 "cover_letter": cover_letter_content,
@@ -2329,19 +3171,11 @@ def main():
                                 'job_data': st.session_state['job_analysis']['job_data']
                             })
                             
-                            # Display documents
-                            st.subheader("Cover Letter")
-                            st.text_area("Copy or edit as needed:", docs["cover_letter"], height=300)
+                            resume_placeholder.markdown(resume_bullets_markdown(resume_bullets))
                             
-                            # Show resume bullets
-                            st.subheader("Tailored Resume Bullets")
-                            for exp, bullets in docs["resume_bullets"].items():
-                                st.write(f"**{exp}**")
-                                for bullet in bullets:
-                                    st.write(f"• {bullet}")
-                                    
                             st.success("Documents generated successfully! You can find them in the 'Generated Documents' tab.")
-                        except json.JSONDecodeError as e:
+                        except JSONExtractionError as e:
+                            resume_placeholder.empty()
                             st.error(f"Error parsing resume bullets: {str(e)}")
                             st.code(resume_content, language="json")
                     except Exception as e:
@@ -2350,122 +3184,10 @@ def main():
     
     # Tab 4: Generated Documents
     with tab4:
-        st.header("Generated Documents")
-        
-        if not st.session_state['generated_documents']:
-            st.info("No documents have been generated yet. Generate some documents in the 'Generate Documents' tab to see them here.")
-        else:
-            # Display all generated documents
-            for idx, doc in enumerate(st.session_state['generated_documents']):
-                with st.expander(f"Document {idx + 1}: {doc['job_title']} at {doc['company']} ({doc['date']})"):
-                    # Display job details
-                    st.write(f"**Job Title:** {doc['job_title']}")
-                    st.write(f"**Company:** {doc['company']}")
-                    st.write(f"**Generated on:** {doc['date']}")
-                    
-                    # Display match analysis
-                    st.subheader("Job Match Analysis")
-                    if 'match_analysis' in doc:
-                        match = doc['match_analysis']
-                        st.write(f"**Overall Match Score:** {match.get('overall_match', 'N/A')}/10")
-                        st.write(f"**Skills Match:** {match.get('skills_match', 'N/A')}")
-                        
-                        # Create columns for matching and missing skills
-                        match_col, miss_col = st.columns(2)
-                        
-                        with match_col:
-                            st.write("🟢 Matching Skills:")
-                            for skill in match.get('matching_skills', []):
-                                st.write(f"✓ {skill}")
-                        
-                        with miss_col:
-                            st.write("🔴 Missing Skills:")
-                            for skill in match.get('missing_skills', []):
-                                st.write(f"✗ {skill}")
-                        
-                        if "explanation" in match:
-                            st.write("**Analysis:**")
-                            st.write(match["explanation"])
-                    
-                    # Display cover letter
-                    st.subheader("Cover Letter")
-                    st.text_area("Cover Letter", doc['cover_letter'], height=200, key=f"cover_letter_{idx}")
-                    
-                    # Display resume bullets
-                    st.subheader("Resume Bullets")
-                    for exp, bullets in doc['resume_bullets'].items():
-                        st.write(f"**{exp}**")
-                        for bullet in bullets:
-                            st.write(f"• {bullet}")
-                    
-                    # Download buttons
-                    col1, col2, col3 = st.columns(3)
-                    with col1:
-                        # Download cover letter as TXT
-                        st.download_button(
-                            label="Download Cover Letter",
-                            data=doc['cover_letter'],
-                            file_name=f"cover_letter_{doc['job_title']}_{doc['company']}.txt",
-                            mime="text/plain",
-                            key=f"download_cover_{idx}"
-                        )
-                    
-                    with col2:
-                        # Format resume bullets as text
-                        resume_text = ""
-                        for exp, bullets in doc['resume_bullets'].items():
-                            resume_text += f"{exp}\n"
-                            for bullet in bullets:
-                                resume_text += f"• {bullet}\n"
-                            resume_text += "\n"
-                        
-                        # Download resume bullets as TXT
-                        st.download_button(
-                            label="Download Resume",
-                            data=resume_text,
-                            file_name=f"resume_{doc['job_title']}_{doc['company']}.txt",
-                            mime="text/plain",
-                            key=f"download_resume_{idx}"
-                        )
-                    
-                    with col3:
-                        # Create combined document
-                        combined_text = f"""Cover Letter
-{'-' * 50}
-{doc['cover_letter']}
-
-Resume
-{'-' * 50}
-{resume_text}
-
-Job Match Analysis
-{'-' * 50}
-Overall Match Score: {doc['match_analysis'].get('overall_match', 'N/A')}/10
-Skills Match: {doc['match_analysis'].get('skills_match', 'N/A')}
-
-Matching Skills:
-{chr(10).join(f"✓ {skill}" for skill in doc['match_analysis'].get('matching_skills', []))}
-
-Missing Skills:
-{chr(10).join(f"✗ {skill}" for skill in doc['match_analysis'].get('missing_skills', []))}
-
-Analysis:
-{doc['match_analysis'].get('explanation', 'N/A')}
-"""
-                        
-                        # Download complete application as TXT
-                        st.download_button(
-                            label="Download Complete Application",
-                            data=combined_text,
-                            file_name=f"complete_application_{doc['job_title']}_{doc['company']}.txt",
-                            mime="text/plain",
-                            key=f"download_complete_{idx}"
-                        )
-                    
-                    # Delete button
-                    if st.button("Delete Document", key=f"delete_{idx}"):
-                        st.session_state['generated_documents'].pop(idx)
-                        st.rerun()
+        render_generated_documents()
+    
+    with tab5:
+        render_application_tracker()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,242 @@
+"""
+SQLite storage for tracked job applications.
+
+Replaces the job_applications.csv file that save_application used to read and
+rewrite in full for every saved application. Each save is now a single
+transactional INSERT, status changes are in-place UPDATEs, and the UI pages
+through applications with indexed, filtered queries instead of loading the
+whole history into a DataFrame. Several sessions can share one database file.
+"""
+
+import csv
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+# Columns of the legacy CSV, in the order save_application wrote them
+CSV_COLUMNS = ["date", "company", "position", "url", "match_score", "status", "cover_letter", "resume_bullets"]
+
+# Statuses offered in the UI, in the order an application moves through them
+APPLICATION_STATUSES = ["Ready to Apply", "Applied", "Interview", "Offer", "Rejected", "Withdrawn"]
+
+
+class ApplicationTracker:
+    """Indexed, transactional store of tracked applications.
+
+    Rows are plain dicts with the legacy CSV columns plus ``id``,
+    ``created_at`` and ``updated_at``; ``resume_bullets`` is kept as a JSON
+    string, as it was in the CSV.
+    """
+
+    def __init__(self, path: str = "job_applications.sqlite3"):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        if path != ":memory:":
+            # WAL lets sessions read while another one is saving
+            self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA busy_timeout=5000")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS applications (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                date TEXT NOT NULL,
+                company TEXT NOT NULL DEFAULT '' COLLATE NOCASE,
+                position TEXT NOT NULL DEFAULT '',
+                url TEXT NOT NULL DEFAULT '',
+                match_score REAL NOT NULL DEFAULT 0,
+                status TEXT NOT NULL,
+                cover_letter TEXT NOT NULL DEFAULT '',
+                resume_bullets TEXT NOT NULL DEFAULT '{}',
+                created_at REAL NOT NULL,
+                updated_at REAL NOT NULL
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_applications_status ON applications (status)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_applications_company ON applications (company)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_applications_date ON applications (date, id)")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS migrations (
+                source TEXT PRIMARY KEY,
+                imported INTEGER NOT NULL,
+                migrated_at REAL NOT NULL
+            )
+        """)
+
+    def add(self, application: Dict[str, Any]) -> int:
+        """Insert one application and return its id"""
+        return self.add_many([application])[0]
+
+    def add_many(self, applications: List[Dict[str, Any]]) -> List[int]:
+        """Insert applications in one transaction and return their ids"""
+        now = time.time()
+        ids = []
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                for application in applications:
+                    row = _normalise(application)
+                    cursor = self._conn.execute(
+                        f"INSERT INTO applications ({', '.join(CSV_COLUMNS)}, created_at, updated_at) "
+                        f"VALUES ({', '.join('?' * len(CSV_COLUMNS))}, ?, ?)",
+                        [row[column] for column in CSV_COLUMNS] + [now, now]
+                    )
+                    ids.append(cursor.lastrowid)
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        return ids
+
+    def update_status(self, application_id: int, status: str) -> bool:
+        """Change an application's status in place; False if it doesn't exist"""
+        with self._lock:
+            cursor = self._conn.execute(
+                "UPDATE applications SET status = ?, updated_at = ? WHERE id = ?",
+                (status, time.time(), application_id)
+            )
+        return cursor.rowcount > 0
+
+    def delete(self, application_id: int) -> bool:
+        with self._lock:
+            cursor = self._conn.execute("DELETE FROM applications WHERE id = ?", (application_id,))
+        return cursor.rowcount > 0
+
+    def get(self, application_id: int) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM applications WHERE id = ?", (application_id,)).fetchone()
+        return dict(row) if row is not None else None
+
+    def query(
+        self,
+        status: Optional[str] = None,
+        company: Optional[str] = None,
+        date_from: Optional[str] = None,
+        date_to: Optional[str] = None,
+        min_score: Optional[float] = None,
+        limit: int = 50,
+        offset: int = 0,
+        columns: Optional[List[str]] = None
+    ) -> List[Dict[str, Any]]:
+        """One page of applications, newest first.
+
+        company matches as a case-insensitive prefix; dates are inclusive
+        YYYY-MM-DD strings. Pass columns to skip loading large fields such as
+        the cover letter when only a listing is needed.
+        """
+        where, params = _filters(status, company, date_from, date_to, min_score)
+        selected = ", ".join(["id"] + [c for c in columns if c != "id"]) if columns else "*"
+        sql = f"SELECT {selected} FROM applications{where} ORDER BY date DESC, id DESC LIMIT ? OFFSET ?"
+        with self._lock:
+            rows = self._conn.execute(sql, params + [limit, offset]).fetchall()
+        return [dict(row) for row in rows]
+
+    def count(
+        self,
+        status: Optional[str] = None,
+        company: Optional[str] = None,
+        date_from: Optional[str] = None,
+        date_to: Optional[str] = None,
+        min_score: Optional[float] = None
+    ) -> int:
+        """Number of applications matching the same filters as query()"""
+        where, params = _filters(status, company, date_from, date_to, min_score)
+        with self._lock:
+            return self._conn.execute(f"SELECT COUNT(*) FROM applications{where}", params).fetchone()[0]
+
+    def statuses(self) -> List[str]:
+        """Distinct statuses in use, for filter widgets"""
+        with self._lock:
+            rows = self._conn.execute("SELECT DISTINCT status FROM applications ORDER BY status").fetchall()
+        return [row[0] for row in rows]
+
+    def migrate_csv(self, csv_path: str = "job_applications.csv") -> int:
+        """Import a legacy job_applications.csv once; returns the number of rows imported.
+
+        The CSV is left in place. Each file is recorded after import, so
+        calling this on every start is cheap and never duplicates rows.
+        """
+        if not os.path.exists(csv_path):
+            return 0
+        source = os.path.abspath(csv_path)
+        with self._lock:
+            if self._conn.execute("SELECT 1 FROM migrations WHERE source = ?", (source,)).fetchone():
+                return 0
+
+        with open(csv_path, newline="", encoding="utf-8") as f:
+            rows = [row for row in csv.DictReader(f) if any(row.values())]
+
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                # Re-check inside the write transaction in case another session won the race
+                if self._conn.execute("SELECT 1 FROM migrations WHERE source = ?", (source,)).fetchone():
+                    self._conn.execute("ROLLBACK")
+                    return 0
+                for row in rows:
+                    row = _normalise(row)
+                    self._conn.execute(
+                        f"INSERT INTO applications ({', '.join(CSV_COLUMNS)}, created_at, updated_at) "
+                        f"VALUES ({', '.join('?' * len(CSV_COLUMNS))}, ?, ?)",
+                        [row[column] for column in CSV_COLUMNS] + [now, now]
+                    )
+                self._conn.execute(
+                    "INSERT INTO migrations (source, imported, migrated_at) VALUES (?, ?, ?)",
+                    (source, len(rows), now)
+                )
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        return len(rows)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+def _normalise(application: Dict[str, Any]) -> Dict[str, Any]:
+    """Coerce an application dict (or CSV row) to column values"""
+    row = {column: application.get(column) for column in CSV_COLUMNS}
+    for column in ("date", "company", "position", "url", "cover_letter"):
+        row[column] = "" if row[column] is None else str(row[column])
+    row["status"] = str(row["status"] or "Ready to Apply")
+    try:
+        row["match_score"] = float(row["match_score"] or 0)
+    except (TypeError, ValueError):
+        row["match_score"] = 0.0
+    bullets = row["resume_bullets"]
+    row["resume_bullets"] = bullets if isinstance(bullets, str) and bullets else json.dumps(bullets or {})
+    return row
+
+
+def _filters(
+    status: Optional[str],
+    company: Optional[str],
+    date_from: Optional[str],
+    date_to: Optional[str],
+    min_score: Optional[float]
+) -> Tuple[str, List[Any]]:
+    clauses, params = [], []
+    if status:
+        clauses.append("status = ?")
+        params.append(status)
+    if company:
+        # Case-insensitive prefix match as a range over the NOCASE column, so
+        # it can use idx_applications_company (LIKE with ESCAPE cannot)
+        clauses.append("company >= ? AND company < ?")
+        params.extend([company, company + "\U0010ffff"])
+    if date_from:
+        clauses.append("date >= ?")
+        params.append(date_from)
+    if date_to:
+        clauses.append("date <= ?")
+        params.append(date_to)
+    if min_score is not None:
+        clauses.append("match_score >= ?")
+        params.append(min_score)
+    return (" WHERE " + " AND ".join(clauses) if clauses else ""), params
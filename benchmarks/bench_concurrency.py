@@ -0,0 +1,58 @@
+"""
+Benchmark: sequential vs. concurrent document generation.
+
+Issues the cover-letter and resume-bullet completions of one generation
+against a local fake server, first one after the other and then through
+run_concurrent_completions(), which fans them out over AsyncOpenRouterClient.
+
+    python -m benchmarks.bench_concurrency --latency 0.4 --tps 200
+"""
+
+import argparse
+import statistics
+import time
+
+from benchmarks.fake_openrouter import FakeOpenRouterServer
+from openrouter_client import OpenRouterClient, run_concurrent_completions
+
+COVER_LETTER = "Dear Hiring Manager, I am excited to apply for this role. " * 15
+RESUME_BULLETS = '{"Industrial Designer": ["Designed products", "Built prototypes", "Led reviews"]}'
+
+
+def reply(payload):
+    return RESUME_BULLETS if "JSON" in payload["messages"][0]["content"] else COVER_LETTER
+
+
+CALLS = [
+    {"model": "test/model", "messages": [{"role": "system", "content": "Write a cover letter."}, {"role": "user", "content": "..."}]},
+    {"model": "test/model", "messages": [{"role": "system", "content": "Return ONLY JSON."}, {"role": "user", "content": "..."}]},
+]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--latency", type=float, default=0.4, help="seconds to first token")
+    parser.add_argument("--tps", type=float, default=200, help="completion tokens per second")
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+
+    with FakeOpenRouterServer(latency=args.latency, tokens_per_second=args.tps, reply=reply) as server:
+        with OpenRouterClient("test", base_url=server.base_url) as client:
+            sequential, concurrent = [], []
+            for _ in range(args.repeats):
+                start = time.perf_counter()
+                for call in CALLS:
+                    client.chat_completion(**call)
+                sequential.append(time.perf_counter() - start)
+
+                start = time.perf_counter()
+                run_concurrent_completions(client, CALLS)
+                concurrent.append(time.perf_counter() - start)
+
+    seq, conc = statistics.median(sequential), statistics.median(concurrent)
+    print(f"sequential: {seq * 1000:8.1f}ms")
+    print(f"concurrent: {conc * 1000:8.1f}ms  ({seq / conc:.2f}x faster)")
+
+
+if __name__ == "__main__":
+    main()
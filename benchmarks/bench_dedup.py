@@ -0,0 +1,155 @@
+"""
+Benchmark: near-duplicate posting detection.
+
+1. Index: fills a PostingIndex with 1k and 10k synthetic postings, then
+   queries it with cross-posted copies (another board's header and footer,
+   a few words reworded, bullets reordered) and with unseen postings,
+   including different roles from the same companies that share their
+   boilerplate. Reports query p50/p99 time, how many copies were found and
+   how many unseen postings were wrongly matched.
+
+2. Batch triage: runs analyze_batch_item over a batch in which every job is
+   posted three times, against the fake OpenRouter server, with and without
+   reusing near-duplicate analyses, and counts the model calls.
+
+    python -m benchmarks.bench_dedup
+"""
+
+import argparse
+import random
+import statistics
+import time
+import warnings
+
+from benchmarks.bench_pipeline import MODEL, reply, synthetic_profile
+from benchmarks.fake_openrouter import FakeOpenRouterServer
+from posting_dedup import PostingIndex
+
+TITLES = ["Industrial Designer", "Product Designer", "Mechanical Engineer", "UX Researcher", "CAD Technician",
+          "Design Engineer", "Packaging Designer", "Furniture Designer", "Design Manager", "Prototype Engineer"]
+COMPANIES = [f"{name} {kind}" for name in ["Acme", "Northwind", "Globex", "Initech", "Umbrella", "Stark", "Wayne",
+                                           "Tyrell", "Cyberdyne", "Soylent"] for kind in ["Products", "Studio", "Labs"]]
+VERBS = ["Lead", "Own", "Drive", "Support", "Deliver", "Plan", "Shape", "Coordinate", "Improve", "Define",
+         "Review", "Document"]
+OBJECTS = ["concept development", "3D CAD models in SolidWorks", "user research and usability testing",
+           "photorealistic Keyshot renders", "injection moulded parts", "engineering drawings with GD&T",
+           "rapid prototypes", "design reviews", "colour, material and finish specifications", "design timelines",
+           "packaging concepts", "compliance testing", "supplier onboarding", "product requirements",
+           "the design language", "marketing visuals", "cost-down programs", "sustainability assessments",
+           "tooling trials", "accessibility audits"]
+CONTEXTS = ["for our next product launch", "across three product families", "with engineering in Shenzhen",
+            "from first sketch to mass production", "for retail and e-commerce channels", "with external agencies",
+            "under tight launch deadlines", "for medical and lab customers", "in close partnership with marketing",
+            "for the outdoor range", "with the quality team", "for global markets"]
+BENEFITS = ["Hybrid work", "Four weeks of leave", "Learning budget", "Employee share plan", "Parental leave",
+            "Wellbeing allowance", "Flexible hours", "Annual bonus"]
+
+
+def synthetic_posting(rng: random.Random, company: str) -> str:
+    title = rng.choice(TITLES)
+    # Boilerplate depends only on the company, as on real careers pages
+    company_rng = random.Random(company)
+    about = (f"About {company}: we design and manufacture products used by millions of people. "
+             f"{company} has studios in {company_rng.choice(['Berlin', 'Melbourne', 'Austin', 'Osaka'])} "
+             f"and values craft, curiosity and sustainability.")
+    benefits = ", ".join(company_rng.sample(BENEFITS, 4))
+    summary = " ".join(
+        f"You will {rng.choice(VERBS).lower()} {rng.choice(OBJECTS)} {rng.choice(CONTEXTS)}." for _ in range(3)
+    )
+    duties = "\n".join(f"- {rng.choice(VERBS)} {rng.choice(OBJECTS)} {rng.choice(CONTEXTS)}" for _ in range(8))
+    years = rng.randint(2, 10)
+    return (f"{title} - {company}\n\n{about}\n\nThe role\n{summary}\nDay to day you will:\n{duties}\n\n"
+            f"About you\n- {years}+ years of experience as a {title.lower()}\n- A portfolio of shipped products\n\n"
+            f"Benefits: {benefits}.")
+
+
+def cross_post(rng: random.Random, posting: str) -> str:
+    """The same job as another board shows it: new header and footer, some rewording, reordered bullets"""
+    lines = posting.split("\n")
+    bullets = [i for i, line in enumerate(lines) if line.startswith("- ")]
+    shuffled = [lines[i] for i in bullets]
+    rng.shuffle(shuffled)
+    for i, line in zip(bullets, shuffled):
+        lines[i] = line
+    text = "\n".join(lines)
+    for old, new in [("Day to day you will", "Day to day you'll"), ("experience as", "experience working as"),
+                     ("A portfolio", "Portfolio")]:
+        text = text.replace(old, new)
+    board = rng.choice(["Seek", "Indeed", "LinkedIn"])
+    return f"Posted on {board} 3 days ago. Apply now\n{text}\nReport this job. More jobs like this on {board}."
+
+
+def bench_index(sizes, queries, seed):
+    print(f"{'indexed':>8}  {'p50':>8}  {'p99':>8}  {'copies found':>12}  {'false matches':>13}")
+    for size in sizes:
+        rng = random.Random(seed)
+        index = PostingIndex(max_entries=size)
+        postings = [synthetic_posting(rng, rng.choice(COMPANIES)) for _ in range(size)]
+        for i, posting in enumerate(postings):
+            index.add(posting, f"posting {i}", {"title": f"posting {i}"})
+
+        copies = [(i, cross_post(rng, postings[i])) for i in rng.sample(range(size), queries)]
+        unseen = [synthetic_posting(rng, rng.choice(COMPANIES)) for _ in range(queries)]
+        unseen = [posting for posting in unseen if posting not in postings]
+
+        timings, found, false_matches = [], 0, 0
+        for i, text in copies:
+            start = time.perf_counter()
+            match = index.find(text)
+            timings.append(time.perf_counter() - start)
+            found += match is not None and match.record.source == f"posting {i}"
+        for text in unseen:
+            start = time.perf_counter()
+            match = index.find(text)
+            timings.append(time.perf_counter() - start)
+            false_matches += match is not None
+        timings.sort()
+        print(f"{size:>8}  {statistics.median(timings) * 1e3:>6.2f}ms  {timings[int(len(timings) * 0.99)] * 1e3:>6.2f}ms"
+              f"  {found:>5}/{len(copies):<6}  {false_matches:>6}/{len(unseen):<6}")
+
+
+def bench_batch(jobs, seed):
+    # app calls Streamlit at import; outside `streamlit run` that only warns
+    warnings.filterwarnings("ignore")
+    import streamlit.logger
+    streamlit.logger.set_log_level("error")
+    import app
+    from openrouter_client import OpenRouterClient
+
+    rng = random.Random(seed)
+    originals = [synthetic_posting(rng, rng.choice(COMPANIES)) for _ in range(jobs)]
+    items = [{"source": f"job {i} copy {copy}", "posting": posting if copy == 0 else cross_post(rng, posting)}
+             for copy in range(3) for i, posting in enumerate(originals)]
+    profile = synthetic_profile(50)
+
+    print(f"\nbatch of {len(items)} postings ({jobs} jobs, each posted 3 times)")
+    with FakeOpenRouterServer(reply=reply) as server:
+        with OpenRouterClient("test", base_url=server.base_url) as client:
+            client.list_models()
+            for reuse in (False, True):
+                posting_index = PostingIndex()
+                requests_before = server.requests
+                start = time.perf_counter()
+                results = [app.analyze_batch_item(client, item, profile, MODEL, reuse_duplicates=reuse, posting_index=posting_index)
+                           for item in items]
+                elapsed = time.perf_counter() - start
+                errors = [result["error"] for result in results if "error" in result]
+                assert not errors, errors[0]
+                reused = sum(1 for result in results if "duplicate_of" in result)
+                print(f"{'reusing duplicates' if reuse else 'analyzing every copy':<22}  {server.requests - requests_before:>4} model calls"
+                      f"  {elapsed:6.2f}s  ({reused} postings reused an earlier analysis)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--jobs", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    bench_index([1_000, 10_000], args.queries, args.seed)
+    bench_batch(args.jobs, args.seed)
+
+
+if __name__ == "__main__":
+    main()
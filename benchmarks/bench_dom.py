@@ -0,0 +1,241 @@
+"""
+Benchmark: BeautifulSoup find() scans vs. the single-pass field extractor.
+
+Times the former site parsers (a full html.parser soup, then one find() scan
+per selector) against the current parsers in parsers.py (one streaming pass
+through dom_extractor) on each page, and checks both extract the same fields;
+the run exits non-zero if any field differs.
+
+By default the pages are synthetic copies of SEEK, Indeed, LinkedIn and
+generic job pages padded like real ones: inline state scripts, styles, a
+large navigation menu and a list of related jobs. Pass --pages DIR to run on
+saved pages instead; files are matched to a parser by name (seek, indeed,
+linkedin, anything else is generic).
+
+    python -m benchmarks.bench_dom --repeats 5
+    python -m benchmarks.bench_dom --pages ~/saved_job_pages
+"""
+
+import argparse
+import json
+import os
+import time
+from urllib.parse import urlparse
+
+from bs4 import BeautifulSoup
+
+from parsers import parse_generic_job, parse_indeed_job, parse_linkedin_job, parse_seek_job
+
+DESCRIPTION = """
+<p>We are looking for an Industrial Designer to join our product team in Melbourne.</p>
+<ul><li>5+ years of experience with SolidWorks and Rhino</li><li>Keyshot rendering &amp; visualisation</li>
+<li>Prototyping and design for manufacture</li><li>Degree in industrial design</li></ul>
+<p>Competitive salary, flexible hours and a hybrid work arrangement.</p>
+"""
+
+
+def page_shell(job_markup: str, related: int = 200) -> str:
+    state = json.dumps({"jobs": [{"id": i, "title": f"Designer {i}", "body": "x" * 400} for i in range(800)]})
+    styles = "\n".join(f".c{i} {{ margin: {i % 9}px; color: #{i % 4096:03x}; }}" for i in range(3000))
+    nav = "".join(f'<li><a class="nav-link" href="/c/{i}">Category {i}</a></li>' for i in range(400))
+    cards = "".join(
+        f'<article class="card"><h3>Related role {i}</h3><span class="card-meta">Sydney NSW</span>'
+        f'<p>Short teaser for related role {i}.</p></article>'
+        for i in range(related)
+    )
+    return (
+        f"<!DOCTYPE html><html><head><title>Job</title><style>{styles}</style>"
+        f"<script>window.__STATE__ = {state};</script></head><body>"
+        f"<header><nav><ul>{nav}</ul></nav></header>"
+        f"<main><div class=\"layout\"><div class=\"column\">{job_markup}</div></div>"
+        f"<aside><h2>Similar jobs</h2>{cards}</aside></main>"
+        f"<footer><p>Footer links</p></footer><script>track({state[:20000]!r});</script></body></html>"
+    )
+
+
+def synthetic_pages():
+    return {
+        "seek.html": ("https://www.seek.com.au/job/1", page_shell(
+            '<h1 class="yvsb870 _14uh9944i">Industrial Designer</h1><span class="_y1frqlc">Acme Studio</span>'
+            '<div data-automation="job-location">Melbourne VIC</div><div data-automation="job-work-type">Full time</div>'
+            f'<div data-automation="jobAdDetails">{DESCRIPTION}</div>'
+        )),
+        # SEEK sometimes renders the details container empty and the text in the fallback one
+        "seek-empty-details.html": ("https://www.seek.com.au/job/2", page_shell(
+            '<h1 class="yvsb870 _14uh9944i">Industrial Designer</h1><span class="_y1frqlc">Acme Studio</span>'
+            '<div data-automation="jobAdDetails"></div>'
+            f'<div class="yvsb870 _14uh9947m">{DESCRIPTION}</div>'
+        )),
+        "indeed.html": ("https://au.indeed.com/viewjob?jk=1", page_shell(
+            '<h1 class="jobsearch-JobInfoHeader-title">Industrial Designer</h1>'
+            '<div class="jobsearch-InlineCompanyRating"><a href="/cmp/acme">Acme Studio</a></div>'
+            '<div class="jobsearch-JobInfoHeader-subtitle"><div>Acme Studio</div><div>Melbourne VIC</div></div>'
+            '<div class="jobsearch-JobDescriptionSection-sectionItem"><div>Full-time</div></div>'
+            f'<div id="jobDescriptionText">{DESCRIPTION}</div>'
+        )),
+        "linkedin.html": ("https://www.linkedin.com/jobs/view/1", page_shell(
+            '<h1 class="top-card-layout__title">Industrial Designer</h1>'
+            '<a class="topcard__org-name-link" href="/company/acme">Acme Studio</a>'
+            '<span class="topcard__flavor topcard__flavor--bullet">Melbourne VIC</span>'
+            f'<div class="show-more-less-html__markup">{DESCRIPTION}</div>'
+        )),
+        "generic.html": ("https://careers.acme.com/jobs/1", page_shell(
+            '<h1>Industrial Designer</h1><div class="company-name">Acme Studio</div>'
+            '<span class="job-location">Melbourne VIC</span><span class="employment-type">Full time</span>'
+            f'<section class="job-description">{DESCRIPTION}</section>'
+        )),
+    }
+
+
+# The parsers as they were before the single-pass extractor
+def _text(element):
+    return element.text.strip() if element else ""
+
+
+def _domain_company(url):
+    return urlparse(url).netloc.replace('www.', '').split('.')[0].capitalize()
+
+
+def _first(*finders, default):
+    for find in finders:
+        try:
+            return find()
+        except AttributeError:
+            continue
+    return default
+
+
+def former_seek(url, content):
+    soup = BeautifulSoup(content, 'html.parser')
+    description = _text(soup.find('div', attrs={'data-automation': 'jobAdDetails'}))
+    if not description:
+        description = _text(soup.find('div', class_='yvsb870 _14uh9947m'))
+    return {
+        "title": _first(lambda: soup.find('h1', class_='yvsb870 _14uh9944i').text.strip(),
+                        lambda: soup.find('h1').text.strip(), default="Unknown Position"),
+        "company": _first(lambda: soup.find('span', class_='_y1frqlc').text.strip(),
+                          lambda: soup.find('span', class_='_1tkhm9a8').text.strip(), default=_domain_company(url)),
+        "description": description,
+        "location": _first(lambda: soup.find('div', attrs={'data-automation': 'job-location'}).text.strip(),
+                           default="Unknown Location"),
+        "job_type": _first(lambda: soup.find('div', attrs={'data-automation': 'job-work-type'}).text.strip(),
+                           default="Not specified"),
+        "url": url,
+    }
+
+
+def former_indeed(url, content):
+    soup = BeautifulSoup(content, 'html.parser')
+    return {
+        "title": _first(lambda: soup.find('h1', class_='jobsearch-JobInfoHeader-title').text.strip(),
+                        lambda: soup.find('h1').text.strip(), default="Unknown Position"),
+        "company": _first(lambda: soup.find('div', class_='jobsearch-InlineCompanyRating').find('a').text.strip(),
+                          lambda: soup.find('div', class_='icl-u-lg-mr--sm').text.strip(), default=_domain_company(url)),
+        "description": _text(soup.find('div', id='jobDescriptionText')),
+        "location": _first(
+            lambda: soup.find('div', class_='jobsearch-JobInfoHeader-subtitle').find_all('div')[1].text.strip(),
+            default="Unknown Location"),
+        "job_type": _first(
+            lambda: soup.find('div', class_='jobsearch-JobDescriptionSection-sectionItem').find('div').text.strip(),
+            default="Not specified"),
+        "url": url,
+    }
+
+
+def former_linkedin(url, content):
+    soup = BeautifulSoup(content, 'html.parser')
+    return {
+        "title": _first(lambda: soup.find('h1', class_='top-card-layout__title').text.strip(),
+                        lambda: soup.find('h1').text.strip(), default="Unknown Position"),
+        "company": _first(lambda: soup.find('a', class_='topcard__org-name-link').text.strip(),
+                          lambda: soup.find('span', class_='topcard__flavor').text.strip(), default=_domain_company(url)),
+        "description": _text(soup.find('div', class_='show-more-less-html__markup')),
+        "location": _first(lambda: soup.find('span', class_='topcard__flavor--bullet').text.strip(),
+                           default="Unknown Location"),
+        "job_type": "Not specified",
+        "url": url,
+    }
+
+
+def former_generic(url, content):
+    soup = BeautifulSoup(content, 'html.parser')
+
+    def by_class(tags, words, default):
+        for word in words:
+            element = soup.find(tags, class_=lambda x: x and word in x.lower())
+            if element:
+                return element.text.strip()
+        return default
+
+    title = "Unknown Position"
+    for tag in ['h1', 'h2']:
+        if soup.find(tag):
+            title = soup.find(tag).text.strip()
+            break
+    description = by_class(['div', 'section'], ['description', 'job-description', 'details', 'content',
+                                                 'job_description', 'jobdescription'], "")
+    if not description:
+        main_content = soup.find('main') or soup.find('article') or soup.body
+        description = main_content.text.strip() if main_content else ""
+    return {
+        "title": title,
+        "company": by_class(['span', 'div', 'a'], ['company', 'organization', 'employer', 'company-name'], "")
+        or _domain_company(url),
+        "description": description,
+        "location": by_class(['span', 'div'], ['location', 'job-location', 'city', 'address'], "Unknown Location"),
+        "job_type": by_class(['span', 'div'], ['job-type', 'employment-type', 'work-type'], "Not specified"),
+        "url": url,
+    }
+
+
+PARSERS = {
+    "seek": (former_seek, parse_seek_job, "https://www.seek.com.au/job/0"),
+    "indeed": (former_indeed, parse_indeed_job, "https://au.indeed.com/viewjob"),
+    "linkedin": (former_linkedin, parse_linkedin_job, "https://www.linkedin.com/jobs/view/0"),
+    "generic": (former_generic, parse_generic_job, "https://careers.example.com/jobs/0"),
+}
+
+
+def saved_pages(directory):
+    pages = {}
+    for name in sorted(os.listdir(directory)):
+        if name.endswith((".html", ".htm")):
+            with open(os.path.join(directory, name), "rb") as f:
+                pages[name] = (None, f.read())
+    return pages
+
+
+def best_of(fn, repeats):
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return result, best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", help="directory of saved job pages (.html)")
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+
+    pages = saved_pages(os.path.expanduser(args.pages)) if args.pages else synthetic_pages()
+    print(f"{'page':<24}  {'size':>8}  {'soup + find':>11}  {'single pass':>11}  {'speedup':>7}")
+    differing = 0
+    for name, (url, content) in pages.items():
+        kind = next((kind for kind in ("seek", "indeed", "linkedin") if kind in name.lower()), "generic")
+        former, current, default_url = PARSERS[kind]
+        url = url or default_url
+        former_result, former_time = best_of(lambda: former(url, content), args.repeats)
+        result, current_time = best_of(lambda: current(url, content), args.repeats)
+        mismatched = [field for field in former_result if former_result[field] != result[field]]
+        differing += bool(mismatched)
+        print(f"{name:<24}  {len(content) / 1024:>6.0f}KB  {former_time * 1e3:>9.1f}ms  {current_time * 1e3:>9.1f}ms"
+              f"  {former_time / current_time:>6.1f}x" + (f"  differs: {', '.join(mismatched)}" if mismatched else ""))
+    if differing:
+        raise SystemExit(f"{differing} page(s) parsed differently from the former parsers")
+
+
+if __name__ == "__main__":
+    main()
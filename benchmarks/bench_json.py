@@ -0,0 +1,137 @@
+"""
+Benchmark: regex + json.loads vs. the tolerant JSON extractor on model output.
+
+Builds responses the way models actually return them: clean JSON, wrapped in
+a ```json fence or in prose, with trailing commas, single quotes or Python
+literals, and cut off at max_tokens. For each kind it reports how many
+responses the former code path (```-block regex, then json.loads) parsed,
+how many extract_json recovered, and the mean time per response.
+
+It then streams a resume bullets response in small deltas through
+StreamingJSONParser and reports how far into the stream the first complete
+bullet could be shown, and the parser's total time for the stream.
+
+    python -m benchmarks.bench_json --responses 200
+"""
+
+import argparse
+import json
+import random
+import re
+import time
+
+from json_extraction import JSONExtractionError, StreamingJSONParser, extract_json
+
+SKILLS = ["SolidWorks", "Keyshot rendering", "Rapid prototyping", "Design for manufacture", "GD&T",
+          "User research", "Rhino 3D", "Adobe Creative Suite", "Injection moulding", "Sketching"]
+
+
+def job_details(rng):
+    return {
+        "title": rng.choice(["Industrial Designer", "Product Designer", "Design Engineer"]),
+        "company": rng.choice(["Acme Products", "Northwind Studio", "Globex Labs"]),
+        "location": rng.choice(["Berlin", "Melbourne", "Austin, TX"]),
+        "job_type": "Full-time",
+        "requirements": rng.sample(SKILLS, rng.randint(5, 10)),
+        "remote": rng.choice([True, False]),
+    }
+
+
+def resume_bullets(rng, positions=3, bullets=4):
+    return {
+        f"{rng.choice(['Industrial', 'Product', 'Junior'])} Designer at Studio {i}": [
+            f"Led the {rng.choice(['redesign', 'launch', 'prototyping'])} of product line {i}.{j}, "
+            f"cutting tooling cost by {rng.randint(5, 40)}%"
+            for j in range(bullets)
+        ]
+        for i in range(positions)
+    }
+
+
+def trailing_commas(text):
+    return re.sub(r'(["\]\d])(\s*[\]}])', r"\1,\2", text)
+
+
+def single_quotes(value):
+    # How a model imitating Python prints a dict
+    return repr(value)
+
+
+DEFECTS = {
+    "clean": lambda rng, value: json.dumps(value),
+    "fenced": lambda rng, value: f"```json\n{json.dumps(value, indent=2)}\n```",
+    "prose around": lambda rng, value: f"Here is the extracted information:\n\n{json.dumps(value)}\n\nLet me know if you need anything else!",
+    "trailing commas": lambda rng, value: f"```json\n{trailing_commas(json.dumps(value, indent=2))}\n```",
+    "single quotes": lambda rng, value: single_quotes(value),
+    "truncated": lambda rng, value: (lambda text: text[:int(len(text) * rng.uniform(0.6, 0.95))])(json.dumps(value, indent=2)),
+}
+
+
+def former_parse(content):
+    """The former call-site logic: take the ``` block if any, then json.loads"""
+    if "```" in content:
+        match = re.search(r'```(?:json)?\s*(.*?)```', content, re.DOTALL)
+        if match:
+            content = match.group(1)
+    try:
+        return json.loads(content)
+    except json.JSONDecodeError:
+        return None
+
+
+def bench_defects(responses, seed):
+    rng = random.Random(seed)
+    print(f"{'response kind':<16}  {'regex + loads':>13}  {'extract_json':>12}  {'time':>9}")
+    for kind, make in DEFECTS.items():
+        cases = [make(rng, job_details(rng)) for _ in range(responses)]
+        former = sum(isinstance(former_parse(text), dict) for text in cases)
+        recovered, elapsed = 0, 0.0
+        for text in cases:
+            start = time.perf_counter()
+            try:
+                value = extract_json(text, expect=dict)
+            except JSONExtractionError:
+                value = None
+            elapsed += time.perf_counter() - start
+            recovered += isinstance(value, dict) and bool(value.get("title"))
+        print(f"{kind:<16}  {former:>6}/{len(cases):<6}  {recovered:>5}/{len(cases):<6}  {elapsed / len(cases) * 1e6:>7.0f}us")
+
+
+def bench_stream(seed, delta_chars=4):
+    rng = random.Random(seed)
+    text = "```json\n" + json.dumps(resume_bullets(rng, positions=4, bullets=5), indent=2) + "\n```"
+    deltas = [text[i:i + delta_chars] for i in range(0, len(text), delta_chars)]
+
+    parser = StreamingJSONParser(expect=dict)
+    first_bullet = None
+    start = time.perf_counter()
+    for i, delta in enumerate(deltas):
+        parser.feed(delta)
+        if first_bullet is None:
+            # Complete bullets only: the partial string being read doesn't count
+            partial = parser.partial() or {}
+            lists = [items for items in partial.values() if isinstance(items, list)]
+            if lists and (len(lists[0]) > 1 or len(lists) > 1):
+                first_bullet = i + 1
+    value = parser.close()
+    elapsed = time.perf_counter() - start
+    assert value == json.loads(text.strip("`json\n")), "streamed parse differs"
+
+    print(f"\nstreamed resume bullets: {len(text)} chars in {len(deltas)} deltas of {delta_chars} chars")
+    print(f"former: bullets shown after delta {len(deltas)} (the whole response)")
+    print(f"StreamingJSONParser: first bullet shown after delta {first_bullet} ({first_bullet / len(deltas):.0%} of the stream),"
+          f" {elapsed * 1e3:.1f}ms parsing in total including a partial() per delta")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--responses", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    bench_defects(args.responses, args.seed)
+    bench_stream(args.seed)
+
+
+if __name__ == "__main__":
+    main()
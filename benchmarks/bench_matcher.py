@@ -0,0 +1,157 @@
+"""
+Benchmark: nested-loop requirement matching vs. SkillMatcher.
+
+Matches 15 job requirements against synthetic profiles with 10, 1k and 10k
+skills, using the original `skill in req or req in skill` double loop and the
+automaton-based match_requirements(), and checks both give the same split.
+Also times the optional NumPy semantic pass (model build and matching), and
+scores labelled requirement/skill pairs to check the default semantic
+threshold: every pair naming the same skill must match at it, and no pair
+naming different skills may.
+
+    python -m benchmarks.bench_matcher
+"""
+
+import argparse
+import random
+import string
+import time
+
+from profile_index import ProfileIndex
+from semantic_matcher import DEFAULT_SEMANTIC_THRESHOLD, SemanticSkillMatcher
+from skill_matcher import match_requirements
+
+REQUIREMENTS = [
+    "SolidWorks", "3D CAD modelling", "Rapid prototyping", "Design for manufacturing",
+    "Adobe Creative Suite", "Python", "Injection moulding", "User research",
+    "Technical documentation", "Stakeholder communication", "Keyshot rendering",
+    "Sketching and ideation", "Project management", "GD&T", "Sustainable materials",
+]
+
+# (requirement, skill) pairs naming the same skill, and pairs that only share words
+SAME_SKILL = [
+    ("JS experience", "JavaScript"), ("CAD proficiency", "SolidWorks"), ("Experience with Rhino 3D", "Rhino"),
+    ("Machine learning", "ML"), ("Kubernetes", "k8s"), ("3D rendering", "Keyshot"), ("Adobe Photoshop", "Photoshop"),
+    ("User experience design", "UX"), ("Amazon Web Services", "AWS"), ("Rapid prototyping", "Prototyping"),
+    ("Injection molding", "Injection moulding"), ("PostgreSQL", "Postgres"),
+]
+DIFFERENT_SKILLS = [
+    ("Project management", "Product management"), ("Java", "JavaScript"), ("Product design", "Production planning"),
+    ("Graphic design", "Graphics programming"), ("Sales management", "Sales"), ("Data analysis", "Data entry"),
+    ("Interior design", "Industrial design"), ("Mechanical engineering", "Electrical engineering"),
+    ("User research", "Market research"), ("Web design", "Web development"),
+]
+
+VOCABULARY = [
+    "design", "cad", "modelling", "rendering", "python", "research", "prototyping",
+    "manufacturing", "materials", "sketching", "analysis", "testing", "documentation",
+    "leadership", "adobe", "fusion", "catia", "rhino", "sheet", "metal", "plastics",
+]
+
+
+def synthetic_skills(count: int, seed: int = 7):
+    rng = random.Random(seed)
+    skills = ["SolidWorks", "Python", "Keyshot"]
+    while len(skills) < count:
+        words = rng.sample(VOCABULARY, rng.randint(1, 3))
+        suffix = "".join(rng.choice(string.ascii_lowercase) for _ in range(4))
+        skills.append(" ".join(words) + f" {suffix}")
+    return skills[:count]
+
+
+def naive_match(requirements, all_skills, experience_text):
+    """The analyze_job_fit loop before the automaton matcher"""
+    all_skills_lower = [s.lower() for s in all_skills]
+    matching, missing = [], []
+    for req in requirements:
+        req_lower = req.lower()
+        matched = False
+        for skill in all_skills_lower:
+            if skill.lower() in req_lower or req_lower in skill.lower():
+                matching.append(req)
+                matched = True
+                break
+        if not matched:
+            key_terms = [term.strip() for term in req_lower.split() if len(term.strip()) > 3]
+            for term in key_terms:
+                if term in experience_text:
+                    matching.append(req)
+                    matched = True
+                    break
+        if not matched:
+            missing.append(req)
+    return matching, missing
+
+
+def best_of(fn, repeats):
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeats", type=int, default=20)
+    args = parser.parse_args()
+
+    highlights = ["Industrial Designer at Acme", "Led user research for consumer products"]
+    print(f"{'skills':>7}  {'naive':>10}  {'matcher':>10}  {'speedup':>8}  {'index build':>11}"
+          f"  {'semantic':>10}  {'model build':>11}")
+    for count in (10, 1_000, 10_000):
+        skills = synthetic_skills(count)
+        start = time.perf_counter()
+        index = ProfileIndex("bench", skills, highlights)
+        index.matcher
+        build = time.perf_counter() - start
+
+        expected = naive_match(REQUIREMENTS, skills, index.experience_text)
+        assert match_requirements(REQUIREMENTS, index) == expected, "matcher disagrees with the nested loop"
+
+        naive = best_of(lambda: naive_match(REQUIREMENTS, skills, index.experience_text), args.repeats)
+        fast = best_of(lambda: match_requirements(REQUIREMENTS, index), args.repeats)
+
+        start = time.perf_counter()
+        index.semantic_matcher
+        model_build = time.perf_counter() - start
+        semantic = best_of(
+            lambda: match_requirements(REQUIREMENTS, index, semantic_threshold=DEFAULT_SEMANTIC_THRESHOLD),
+            args.repeats
+        )
+        print(f"{count:>7}  {naive * 1e3:>8.3f}ms  {fast * 1e3:>8.3f}ms  {naive / fast:>7.1f}x  {build * 1e3:>9.1f}ms"
+              f"  {semantic * 1e3:>8.3f}ms  {model_build * 1e3:>9.1f}ms")
+
+    calibrate(DEFAULT_SEMANTIC_THRESHOLD)
+
+
+def calibrate(threshold):
+    """Matches of labelled pairs at each threshold; fails unless the given one separates same and different skills.
+
+    IDF weights come from the profile's skill set, so each pair is scored twice:
+    with the skill alone, and with all the labelled skills as one profile.
+    """
+    profile = SemanticSkillMatcher([skill for _, skill in SAME_SKILL + DIFFERENT_SKILLS])
+
+    def scores(pairs):
+        alone = [float(SemanticSkillMatcher([skill]).similarity([requirement])[0, 0]) for requirement, skill in pairs]
+        similarity = profile.similarity([requirement for requirement, _ in pairs])
+        in_profile = [float(similarity[i, profile.skills.index(skill)]) for i, (_, skill) in enumerate(pairs)]
+        return [min(a, b) for a, b in zip(alone, in_profile)], [max(a, b) for a, b in zip(alone, in_profile)]
+
+    same, _ = scores(SAME_SKILL)
+    _, different = scores(DIFFERENT_SKILLS)
+    print(f"\n{'threshold':>9}  {'same skill matched':>18}  {'different skills matched':>24}")
+    for level in sorted({0.4, 0.6, 0.7, threshold, 0.8}):
+        print(f"{level:>9.2f}  {sum(s >= level for s in same):>9}/{len(same):<8}"
+              f"  {sum(s >= level for s in different):>12}/{len(different):<11}" + ("  (default)" if level == threshold else ""))
+    print(f"thresholds in ({max(different):.3f}, {min(same):.3f}] separate the labelled pairs")
+    missed = [pair for pair, s in zip(SAME_SKILL, same) if s < threshold]
+    false_matches = [pair for pair, s in zip(DIFFERENT_SKILLS, different) if s >= threshold]
+    assert not missed, f"same-skill pairs miss the default threshold: {missed}"
+    assert not false_matches, f"different skills match at the default threshold: {false_matches}"
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+Benchmark: re-checking saved job postings with and without the page cache.
+
+Serves N postings (100 by default, padded to ~200KB like real job pages,
+at 10 MB/s per connection) from the local job board in bench_urls, then
+fetches them all once and re-checks all of them the way
+a daily re-check would, with a tenth of the postings changed since the
+first pass:
+
+- without a cache, every page is downloaded and parsed again
+- with a PageCache, unchanged pages answer 304 Not Modified and return the
+  stored parse, so only the changed ones are downloaded
+
+Prints wall time, bytes downloaded and how many pages were re-parsed.
+
+    python -m benchmarks.bench_page_cache --postings 300
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+from benchmarks.bench_urls import JobBoard
+from page_cache import PageCache
+from url_ingestion import UrlIngestor
+
+
+def recheck(board, urls, page_cache):
+    ingestor = UrlIngestor(max_workers=8, min_interval=0.0, page_cache=page_cache)
+    requests_before, bytes_before = board.requests, board.bytes_sent
+    start = time.perf_counter()
+    results = dict(ingestor.ingest_many(urls))
+    elapsed = time.perf_counter() - start
+    ingestor.close()
+    errors = [result["error"] for result in results.values() if "error" in result]
+    assert not errors, errors[0]
+    return results, elapsed, board.requests - requests_before, board.bytes_sent - bytes_before
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--postings", type=int, default=100)
+    parser.add_argument("--latency", type=float, default=0.02)
+    parser.add_argument("--page-kb", type=int, default=200)
+    parser.add_argument("--bandwidth", type=float, default=10, help="MB/s per connection")
+    parser.add_argument("--changed", type=float, default=0.1, help="share of postings changed before the re-check")
+    args = parser.parse_args()
+
+    board = JobBoard(args.latency, padding=args.page_kb * 1024, bandwidth=args.bandwidth * 1e6)
+    urls = [f"http://127.0.0.1:{board.port}/jobs/{i}" for i in range(args.postings)]
+    changed = urls[:int(len(urls) * args.changed)]
+
+    with tempfile.TemporaryDirectory(prefix="bench_page_cache_") as workdir:
+        page_cache = PageCache(os.path.join(workdir, "pages.sqlite3"))
+        try:
+            first, first_time, _, first_bytes = recheck(board, urls, page_cache)
+            stored_before = page_cache.stats()["stored"]
+            for url in changed:
+                board.versions[url.split(str(board.port), 1)[1]] += 1
+
+            uncached, uncached_time, _, uncached_bytes = recheck(board, urls, None)
+            cached, cached_time, _, cached_bytes = recheck(board, urls, page_cache)
+            stats = page_cache.stats()
+        finally:
+            page_cache.close()
+            board.close()
+
+    assert {url: job["title"] for url, job in cached.items()} == {url: job["title"] for url, job in uncached.items()}
+    print(f"{args.postings} postings of ~{args.page_kb}KB, {len(changed)} changed, {args.latency * 1e3:.0f}ms latency")
+    print(f"first check (fills cache):   {first_time:6.2f}s  {first_bytes / 2**20:8.1f} MiB downloaded")
+    print(f"re-check without cache:      {uncached_time:6.2f}s  {uncached_bytes / 2**20:8.1f} MiB downloaded, {len(uncached)} parsed")
+    print(f"re-check with page cache:    {cached_time:6.2f}s  {cached_bytes / 2**20:8.1f} MiB downloaded, "
+          f"{stats['stored'] - stored_before} parsed "
+          f"({stats['not_modified']} answered 304)  {uncached_time / cached_time:.1f}x faster")
+    print(f"cache holds {stats['entries']} pages in {stats['bytes'] / 2**20:.1f} MiB (zlib)")
+
+
+if __name__ == "__main__":
+    main()
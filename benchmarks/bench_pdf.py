@@ -0,0 +1,140 @@
+"""
+Benchmark: PDF text extraction for long portfolio uploads.
+
+Builds a synthetic text PDF (80 pages by default) and compares:
+
+- the former extraction: `text += page.extract_text()` over every page, then
+  keeping the first 7000 characters
+- iter_pdf_pages() with the same 7000-character budget, which stops early
+- iter_pdf_pages() with the app's budget (DOCUMENT_TEXT_BUDGET) in process,
+  with --workers under the default pool gate, and on a pool regardless
+- iter_pdf_pages() over every page, in process and on a process pool
+
+and prints the slowest pages from the per-page timings. Use --lines to make
+sparse, portfolio-like pages, which need more pages to fill the budget.
+
+    python -m benchmarks.bench_pdf --pages 80 --workers 4
+    python -m benchmarks.bench_pdf --pages 300 --lines 4 --workers 4
+"""
+
+import argparse
+import io
+import os
+import time
+import warnings
+
+import PyPDF2
+
+from document_ingestion import iter_pdf_pages
+
+BUDGET = 7000
+
+LINES = [
+    "Industrial designer with eight years in consumer electronics and furniture.",
+    "Led concept development, CAD modelling in SolidWorks and Rhino, and Keyshot rendering.",
+    "Ran user research sessions and translated findings into product requirements.",
+    "Worked with suppliers on injection moulding, sheet metal and finishing processes.",
+    "Portfolio project: modular shelving system shipped to 40 retail stores.",
+]
+
+
+def synthetic_pdf(pages: int, lines_per_page: int = 40) -> bytes:
+    """A minimal text-only PDF written by hand (PyPDF2 cannot lay out text)"""
+    objects = [b"<< /Type /Catalog /Pages 2 0 R >>", None, b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    page_ids = []
+    for number in range(pages):
+        text_ops = ["BT", "/F1 10 Tf", "12 TL", "40 800 Td"]
+        for line in range(lines_per_page):
+            content = f"Page {number + 1} line {line + 1}: {LINES[(number + line) % len(LINES)]}"
+            text_ops.append(f"({content}) Tj T*")
+        text_ops.append("ET")
+        stream = "\n".join(text_ops).encode("latin-1")
+        objects.append(b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream")
+        content_id = len(objects)
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] "
+            b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % content_id
+        )
+        page_ids.append(len(objects))
+    kids = " ".join(f"{page_id} 0 R" for page_id in page_ids).encode("ascii")
+    objects[1] = b"<< /Type /Pages /Kids [" + kids + b"] /Count %d >>" % pages
+
+    out = io.BytesIO()
+    out.write(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(out.tell())
+        out.write(b"%d 0 obj\n" % number + body + b"\nendobj\n")
+    xref = out.tell()
+    out.write(b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1))
+    for offset in offsets:
+        out.write(b"%010d 00000 n \n" % offset)
+    out.write(b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref))
+    return out.getvalue()
+
+
+def former_extraction(data: bytes) -> str:
+    pdf_reader = PyPDF2.PdfReader(io.BytesIO(data))
+    text = ""
+    for page in pdf_reader.pages:
+        text += page.extract_text()
+    return text[:BUDGET]
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def app_budget() -> int:
+    # app calls Streamlit at import; outside `streamlit run` that only warns
+    warnings.filterwarnings("ignore")
+    import streamlit.logger
+    streamlit.logger.set_log_level("error")
+    from app import DOCUMENT_TEXT_BUDGET
+    return DOCUMENT_TEXT_BUDGET
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, default=80)
+    parser.add_argument("--lines", type=int, default=40, help="text lines per page")
+    parser.add_argument("--workers", type=int, default=4)
+    args = parser.parse_args()
+
+    data = synthetic_pdf(args.pages, args.lines)
+    budget = app_budget()
+    print(f"{args.pages} pages, {len(data) / 1024:.0f} KiB, {os.cpu_count()} CPUs")
+
+    former, former_time = timed(lambda: former_extraction(data))
+    budgeted, budget_time = timed(lambda: list(iter_pdf_pages(data, max_chars=BUDGET)))
+    budget_text = "".join(page.text for page in budgeted)[:BUDGET]
+    assert budget_text == former, "budgeted extraction disagrees with the full extraction"
+    app_pages, app_time = timed(lambda: list(iter_pdf_pages(data, max_chars=budget)))
+    gated, gated_time = timed(lambda: list(iter_pdf_pages(data, max_chars=budget, workers=args.workers)))
+    forced, forced_time = timed(lambda: list(iter_pdf_pages(
+        data, max_chars=budget, workers=args.workers, parallel_min_pages=0, parallel_min_seconds=0
+    )))
+    assert [p.text for p in gated] == [p.text for p in forced] == [p.text for p in app_pages], "pool extraction disagrees"
+    full, full_time = timed(lambda: list(iter_pdf_pages(data)))
+    parallel, parallel_time = timed(lambda: list(iter_pdf_pages(
+        data, workers=args.workers, parallel_min_pages=0, parallel_min_seconds=0
+    )))
+    assert [p.text for p in parallel] == [p.text for p in full], "parallel extraction disagrees with sequential"
+
+    print(f"former (all pages, then truncate):   {former_time * 1e3:8.1f}ms")
+    print(f"budgeted ({len(budgeted):>3} pages read):        {budget_time * 1e3:8.1f}ms  ({former_time / budget_time:.1f}x faster)")
+    print(f"app budget of {budget} chars ({len(app_pages):>3} pages read):")
+    print(f"  in process (the default):          {app_time * 1e3:8.1f}ms")
+    print(f"  {args.workers} workers, default pool gate:     {gated_time * 1e3:8.1f}ms  ({app_time / gated_time:.1f}x)")
+    print(f"  {args.workers} workers, pool always:           {forced_time * 1e3:8.1f}ms  ({app_time / forced_time:.1f}x)")
+    print(f"all pages, sequential:               {full_time * 1e3:8.1f}ms")
+    print(f"all pages, {args.workers} workers:                {parallel_time * 1e3:8.1f}ms  ({full_time / parallel_time:.1f}x)")
+
+    slowest = sorted(full, key=lambda page: page.seconds, reverse=True)[:3]
+    print("slowest pages: " + ", ".join(f"{page.number} ({page.seconds * 1e3:.1f}ms)" for page in slowest))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,242 @@
+"""
+Benchmark: the job application pipeline end to end.
+
+Runs process_job_posting, analyze_job_fit, generate_application_docs and
+save_application headlessly against the in-process fake OpenRouter server and
+reports, per stage, p50/p95 wall time, HTTP calls, bytes on the wire and CPU
+time. Results can be saved as a baseline and later runs compared against it:
+a stage that makes more HTTP calls than its baseline, or whose p50 wall or CPU
+time grows beyond the tolerance, is flagged and the run exits non-zero.
+
+    python -m benchmarks.bench_pipeline --save-baseline
+    python -m benchmarks.bench_pipeline --latency 0.2 --tps 300
+
+CPU time is process-wide, so it includes the fake server's handler threads;
+that share is constant per request, so growth still points at the client.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import tempfile
+import time
+import warnings
+from typing import Any, Callable, Dict, List
+
+from benchmarks.fake_openrouter import FakeOpenRouterServer
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), "baselines", "pipeline.json")
+MODEL = "test/model"
+
+JOB_POSTING = """
+Senior Industrial Designer - Acme Products (Berlin, full-time)
+
+We are looking for an industrial designer to lead consumer product development
+from sketch to mass production. You will work with engineering, marketing and
+suppliers across Europe and Asia.
+
+Requirements: SolidWorks, 3D CAD modelling, rapid prototyping, design for
+manufacturing, Adobe Creative Suite, Keyshot rendering, injection moulding,
+user research, GD&T, sustainable materials, stakeholder communication.
+""" * 3
+
+REQUIREMENTS = [
+    "SolidWorks", "3D CAD modelling", "Rapid prototyping", "Design for manufacturing",
+    "Adobe Creative Suite", "Keyshot rendering", "Injection moulding", "User research",
+    "GD&T", "Sustainable materials", "Stakeholder communication",
+]
+
+COVER_LETTER = "Dear Hiring Manager, I am excited to apply for the Senior Industrial Designer role. " * 8
+RESUME_BULLETS = {
+    "Industrial Designer": ["Designed consumer products", "Built rapid prototypes", "Led design reviews"],
+    "Junior Designer": ["Produced CAD models", "Rendered concepts in Keyshot", "Supported user research"],
+}
+
+
+def reply(payload: Dict[str, Any]) -> str:
+    """Answer each pipeline prompt the way a well-behaved model would"""
+    system = payload["messages"][0]["content"]
+    if "required skills" in system:
+        return "```json\n" + json.dumps({
+            "title": "Senior Industrial Designer", "company": "Acme Products",
+            "location": "Berlin", "job_type": "Full-time", "requirements": REQUIREMENTS,
+        }) + "\n```"
+    if "Extract structured job information" in system:
+        return json.dumps({"title": "Senior Industrial Designer", "company": "Acme Products",
+                           "location": "Berlin", "job_type": "Full-time"})
+    if "Return ONLY JSON" in system and "resume" in system:
+        return json.dumps(RESUME_BULLETS)
+    if "Return ONLY JSON" in system:
+        return json.dumps(REQUIREMENTS)
+    return COVER_LETTER
+
+
+def synthetic_profile(skill_count: int) -> Dict[str, Any]:
+    skills = ["SolidWorks", "Keyshot", "Adobe Creative Suite", "Rapid prototyping"]
+    skills += [f"Skill {i}" for i in range(max(0, skill_count - len(skills)))]
+    return {
+        "personal_info": {"name": "Alex Doe", "email": "alex@example.com", "phone": "", "location": "Berlin"},
+        "skills": {"technical": skills[:skill_count]},
+        "experience": [
+            {
+                "company": "Studio North", "position": "Industrial Designer", "duration": "2019-2024",
+                "responsibilities": ["Led user research for consumer products", "Designed for injection moulding"],
+                "achievements": ["Shipped 12 products"],
+            },
+            {
+                "company": "Makers Ltd", "position": "Junior Designer", "duration": "2016-2019",
+                "responsibilities": ["Produced CAD models", "Rendered concepts"],
+                "achievements": [],
+            },
+        ],
+    }
+
+
+def percentile(values: List[float], pct: float) -> float:
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    rank = (len(ordered) - 1) * pct / 100
+    low = int(rank)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+class StageRecorder:
+    """Collects wall time, CPU time, HTTP calls and bytes for each named stage"""
+
+    def __init__(self, server: FakeOpenRouterServer):
+        self.server = server
+        self.samples: Dict[str, List[Dict[str, float]]] = {}
+
+    def run(self, name: str, fn: Callable[[], Any]) -> Any:
+        server = self.server
+        requests_before = server.requests
+        bytes_before = server.bytes_received + server.bytes_sent
+        cpu_before = time.process_time()
+        start = time.perf_counter()
+        result = fn()
+        wall = time.perf_counter() - start
+        cpu = time.process_time() - cpu_before
+        self.samples.setdefault(name, []).append({
+            "wall": wall,
+            "cpu": cpu,
+            "http_calls": server.requests - requests_before,
+            "bytes": server.bytes_received + server.bytes_sent - bytes_before,
+        })
+        if isinstance(result, dict) and "error" in result:
+            raise RuntimeError(f"{name} failed: {result['error']}")
+        return result
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        stages = {}
+        for name, samples in self.samples.items():
+            walls = [s["wall"] for s in samples]
+            stages[name] = {
+                "p50_ms": percentile(walls, 50) * 1e3,
+                "p95_ms": percentile(walls, 95) * 1e3,
+                "cpu_ms": statistics.median(s["cpu"] for s in samples) * 1e3,
+                "http_calls": max(s["http_calls"] for s in samples),
+                "bytes": statistics.median(s["bytes"] for s in samples),
+            }
+        return stages
+
+
+def run_pipeline(args) -> Dict[str, Dict[str, float]]:
+    # app calls Streamlit at import; outside `streamlit run` that only warns
+    warnings.filterwarnings("ignore")
+    import streamlit as st
+    import streamlit.logger
+    streamlit.logger.set_log_level("error")
+    import app
+    from application_tracker import ApplicationTracker
+    from openrouter_client import OpenRouterClient
+
+    profile = synthetic_profile(args.skills)
+    with tempfile.TemporaryDirectory(prefix="bench_pipeline_") as workdir, FakeOpenRouterServer(latency=args.latency, tokens_per_second=args.tps, reply=reply) as server:
+        with OpenRouterClient("test", base_url=server.base_url) as client:
+            st.session_state["openrouter_client"] = client
+            st.session_state["model_generation"] = "balanced"
+            # The sidebar loads the model catalog before any stage runs
+            client.list_models()
+            recorder = StageRecorder(server)
+            tracker = ApplicationTracker(os.path.join(workdir, "job_applications.sqlite3"))
+            try:
+                for _ in range(args.repeats):
+                    job_data = recorder.run("process_job_posting",
+                                            lambda: app.process_job_posting(client, JOB_POSTING, model=MODEL))
+                    match = recorder.run("analyze_job_fit",
+                                         lambda: app.analyze_job_fit(client, job_data, profile, model=MODEL, quiet=True))
+                    job_analysis = {"job_data": job_data, "match_analysis": match}
+                    docs = recorder.run("generate_application_docs",
+                                        lambda: app.generate_application_docs(client, job_analysis, profile))
+                    recorder.run("save_application", lambda: app.save_application(job_analysis, docs, tracker=tracker))
+            finally:
+                tracker.close()
+    return recorder.summary()
+
+
+def compare(stages, baseline, tolerance: float, slack_ms: float) -> List[str]:
+    """Regressions of stages against baseline, as human-readable lines"""
+    regressions = []
+    for name, current in stages.items():
+        base = baseline.get(name)
+        if base is None:
+            continue
+        if current["http_calls"] > base["http_calls"]:
+            regressions.append(f"{name}: {current['http_calls']} HTTP calls (baseline {base['http_calls']})")
+        for metric in ("p50_ms", "cpu_ms"):
+            limit = base[metric] * tolerance + slack_ms
+            if current[metric] > limit:
+                regressions.append(f"{name}: {metric} {current[metric]:.1f} > {limit:.1f} (baseline {base[metric]:.1f})")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--latency", type=float, default=0.05, help="seconds to first token")
+    parser.add_argument("--tps", type=float, default=0, help="completion tokens per second (0 = unpaced)")
+    parser.add_argument("--repeats", type=int, default=10)
+    parser.add_argument("--skills", type=int, default=200, help="skills in the synthetic profile")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--save-baseline", action="store_true", help="store this run as the baseline")
+    parser.add_argument("--tolerance", type=float, default=1.5, help="allowed p50/CPU growth factor")
+    parser.add_argument("--slack-ms", type=float, default=5.0, help="absolute slack added to time limits")
+    args = parser.parse_args()
+
+    stages = run_pipeline(args)
+
+    print(f"{'stage':<26}  {'p50':>9}  {'p95':>9}  {'cpu':>9}  {'http':>4}  {'bytes':>8}")
+    for name, s in stages.items():
+        print(f"{name:<26}  {s['p50_ms']:>7.1f}ms  {s['p95_ms']:>7.1f}ms  {s['cpu_ms']:>7.1f}ms"
+              f"  {s['http_calls']:>4}  {s['bytes']:>8.0f}")
+
+    config = {"latency": args.latency, "tps": args.tps, "skills": args.skills}
+    if args.save_baseline:
+        os.makedirs(os.path.dirname(args.baseline), exist_ok=True)
+        with open(args.baseline, "w") as f:
+            json.dump({"config": config, "stages": stages}, f, indent=2)
+        print(f"\nBaseline saved to {args.baseline}")
+        return
+
+    if not os.path.exists(args.baseline):
+        print("\nNo baseline found; run with --save-baseline to create one")
+        return
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    if baseline.get("config") != config:
+        print(f"\nBaseline was recorded with {baseline.get('config')}; comparing HTTP calls only")
+        args.tolerance, args.slack_ms = float("inf"), 0.0
+
+    regressions = compare(stages, baseline["stages"], args.tolerance, args.slack_ms)
+    if regressions:
+        print("\nRegressions against baseline:")
+        for line in regressions:
+            print(f"  {line}")
+        raise SystemExit(1)
+    print("\nNo regressions against baseline")
+
+
+if __name__ == "__main__":
+    main()
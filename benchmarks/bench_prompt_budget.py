@@ -0,0 +1,63 @@
+"""
+Benchmark: fitting job postings to a prompt's token budget.
+
+Fits synthetic postings of growing length to the job_extraction budget, laid
+out one requirement per line and pasted as a single line (as from a PDF or
+minified page text). For each it reports the time taken, the tokens kept
+against the budget and how many of the posting's skills survived. It checks
+that the result fits the budget and is never empty for a non-empty posting.
+
+    python -m benchmarks.bench_prompt_budget
+"""
+
+import argparse
+import random
+import time
+
+from benchmarks.bench_dedup import COMPANIES, synthetic_posting
+from benchmarks.bench_pipeline import REQUIREMENTS
+from prompt_budget import TASK_BUDGETS, estimate_tokens, fit_text
+
+
+def long_posting(rng, paragraphs):
+    parts = [synthetic_posting(rng, rng.choice(COMPANIES)) for _ in range(paragraphs)]
+    requirements = "\n".join(f"- Proficiency in {skill} is required" for skill in REQUIREMENTS)
+    return parts[0] + "\n\nRequirements\n" + requirements + "\n\n" + "\n\n".join(parts[1:])
+
+
+def single_line(posting):
+    return " ".join(line.strip() for line in posting.splitlines() if line.strip())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--budget", type=int, default=TASK_BUDGETS["job_extraction"] - 1)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    print(f"budget {args.budget} tokens")
+    print(f"{'layout':<12}  {'tokens in':>9}  {'tokens kept':>11}  {'skills kept':>11}  {'time':>8}")
+    for paragraphs in (1, 5, 20, 80):
+        posting = long_posting(rng, paragraphs)
+        for layout, text in (("lines", posting), ("single line", single_line(posting))):
+            start = time.perf_counter()
+            fitted = fit_text(text, args.budget)
+            elapsed = time.perf_counter() - start
+            kept = estimate_tokens(fitted)
+            assert fitted.strip(), f"{layout} posting of {len(text)} characters fitted to an empty string"
+            assert kept <= args.budget, f"{layout} posting fitted to {kept} tokens, over the budget"
+            skills = sum(skill in fitted for skill in REQUIREMENTS)
+            print(f"{layout:<12}  {estimate_tokens(text):>9}  {kept:>11}  {skills:>5}/{len(REQUIREMENTS):<5}"
+                  f"  {elapsed * 1e3:>6.1f}ms")
+
+    # Degenerate inputs: one unbroken run of characters, and a budget too small for any word
+    for text, budget in (("x" * 20_000, 50), ("Industrial designer wanted. " * 50, 0)):
+        fitted = fit_text(text, budget)
+        assert fitted.strip(), "degenerate input fitted to an empty string"
+        assert estimate_tokens(fitted) <= max(1, budget)
+    print("\nno posting was fitted to an empty string")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+"""
+Benchmark: latency-aware model routing vs. the fixed sidebar choice.
+
+Serves the recommended models from the fake OpenRouter server, each with its
+own latency to first token (jittered per call) and output speed, and runs a
+mix of extraction and generation calls; generation replies are 10-20 times
+longer. The mix runs three ways: on the default model for everything, as the
+former sidebar allowed; through a ModelRouter fed by the client's ModelStats,
+with the fastest objective; and through the same router reading timings pooled
+across task types, as before they were split by task. Reports wall time (in
+total and for each half), p50 per call, and which models each setting used.
+
+Halfway through each run gpt-4o-mini, the fastest model that meets the
+default analysis floor, gets three times slower, to show the router moving
+away from it.
+
+    python -m benchmarks.bench_router --calls 500
+"""
+
+import argparse
+import random
+import statistics
+import threading
+import time
+
+from benchmarks.fake_openrouter import FakeOpenRouterServer
+from model_router import MODEL_QUALITY, TASK_SETTINGS, ModelRouter, ModelStats
+from openrouter_client import OpenRouterClient
+
+DEFAULT_MODEL = "anthropic/claude-3.5-sonnet"
+# Seconds to first token per model, in the ratios seen on OpenRouter
+LATENCY = {
+    "openai/gpt-3.5-turbo": 0.015,
+    "openai/gpt-4o-mini": 0.022,
+    "anthropic/claude-3.5-sonnet": 0.045,
+    "anthropic/claude-3.5-sonnet:thinking": 0.100,
+    "anthropic/claude-3-opus": 0.080,
+}
+# Output tokens per second per model
+TOKENS_PER_SECOND = {
+    "openai/gpt-3.5-turbo": 12000,
+    "openai/gpt-4o-mini": 10000,
+    "anthropic/claude-3.5-sonnet": 8000,
+    "anthropic/claude-3.5-sonnet:thinking": 5000,
+    "anthropic/claude-3-opus": 4000,
+}
+# Reply length per task; extraction replies are short
+REPLY_TOKENS = {"cover_letter": 600, "resume_bullets": 300}
+EXTRACTION_REPLY_TOKENS = 30
+TASKS = list(TASK_SETTINGS)
+SLOWED = "openai/gpt-4o-mini"
+
+
+class LatencyByModel:
+    """reply callback for the fake server that sleeps per model and reply length.
+
+    The task name is the message content, as sent by run().
+    """
+
+    def __init__(self, latency, seed):
+        self.latency = dict(latency)
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def __call__(self, payload):
+        model = payload["model"]
+        tokens = REPLY_TOKENS.get(payload["messages"][-1]["content"], EXTRACTION_REPLY_TOKENS)
+        with self._lock:
+            jitter = self._rng.uniform(0.8, 1.3)
+        time.sleep(self.latency[model] * jitter + tokens / TOKENS_PER_SECOND[model])
+        # The fake server counts about four characters per completion token
+        return "x" * (tokens * 4)
+
+
+class PooledStats:
+    """ModelStats view that ignores the task, as the router saw timings before they were split"""
+
+    def __init__(self, stats):
+        self.stats = stats
+
+    def summary(self, model, task=None):
+        return self.stats.summary(model)
+
+
+def run(client, reply, tasks, choose):
+    reply.latency = dict(LATENCY)
+    timings, picks = [], {setting: {} for setting in set(TASK_SETTINGS.values())}
+    for i, task in enumerate(tasks):
+        if i == len(tasks) // 2:
+            reply.latency[SLOWED] *= 3
+        model = choose(task)
+        picks[TASK_SETTINGS[task]][model] = picks[TASK_SETTINGS[task]].get(model, 0) + 1
+        start = time.perf_counter()
+        client.chat_completion(model, [{"role": "user", "content": task}], max_tokens=1000, use_cache=False, task=task)
+        timings.append(time.perf_counter() - start)
+    return timings, picks
+
+
+def report(label, timings, picks):
+    half = len(timings) // 2
+    print(f"{label:<22}  {sum(timings):6.2f}s total ({sum(timings[:half]):.2f}s + {sum(timings[half:]):.2f}s)"
+          f"  p50 {statistics.median(timings) * 1e3:6.1f}ms")
+    for setting, counts in sorted(picks.items()):
+        used = ", ".join(f"{model} x{count}" for model, count in sorted(counts.items(), key=lambda kv: -kv[1]))
+        print(f"{'':<24}{setting}: {used}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls", type=int, default=500)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    tasks = [rng.choice(TASKS) for _ in range(args.calls)]
+    models = [{"id": model, "name": model, "context_length": 200000} for model in MODEL_QUALITY]
+
+    reply = LatencyByModel(LATENCY, args.seed)
+    with FakeOpenRouterServer(models=models, reply=reply) as server:
+        with OpenRouterClient("test", base_url=server.base_url) as client:
+            client.list_models()
+            print(f"{len(tasks)} calls; {SLOWED} becomes 3x slower after {len(tasks) // 2}\n")
+            timings, picks = run(client, reply, tasks, lambda task: DEFAULT_MODEL)
+            report("fixed default model", timings, picks)
+
+            for label, view in (("routed (fastest)", lambda stats: stats),
+                                ("routed, pooled timings", PooledStats)):
+                stats = ModelStats(":memory:")
+                client.model_stats = stats
+                router = ModelRouter(view(stats))
+                timings, picks = run(client, reply, tasks, router.pick)
+                report(label, timings, picks)
+                stats.close()
+            client.model_stats = None
+
+
+if __name__ == "__main__":
+    main()
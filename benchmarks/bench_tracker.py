@@ -0,0 +1,85 @@
+"""
+Benchmark: saving one application with the CSV rewrite vs. ApplicationTracker.
+
+For histories of 100, 1k and 10k applications, times the former
+save_application (read the whole CSV with pandas, append a row, rewrite the
+file) against a single ApplicationTracker insert, plus loading one page of
+the newest 50 applications each way.
+
+    python -m benchmarks.bench_tracker
+"""
+
+import argparse
+import json
+import os
+import tempfile
+import time
+
+import pandas as pd
+
+from application_tracker import CSV_COLUMNS, ApplicationTracker
+
+
+def make_application(i: int):
+    return {
+        "date": f"2024-{i % 12 + 1:02d}-{i % 28 + 1:02d}",
+        "company": f"Company {i % 300}",
+        "position": "Industrial Designer",
+        "url": f"https://example.com/jobs/{i}",
+        "match_score": i % 10,
+        "status": "Ready to Apply",
+        "cover_letter": "Dear Hiring Manager, " * 60,
+        "resume_bullets": json.dumps({"Designer": ["Designed products", "Built prototypes", "Led reviews"]}),
+    }
+
+
+def csv_save(path: str, application) -> None:
+    """save_application before the tracker"""
+    try:
+        applications_df = pd.read_csv(path)
+    except Exception:
+        applications_df = pd.DataFrame(columns=CSV_COLUMNS)
+    applications_df = pd.concat([applications_df, pd.DataFrame([application])], ignore_index=True)
+    applications_df.to_csv(path, index=False)
+
+
+def csv_page(path: str):
+    df = pd.read_csv(path)
+    return df.sort_values("date", ascending=False).head(50)
+
+
+def best_of(fn, repeats):
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'history':>7}  {'csv save':>10}  {'db save':>10}  {'speedup':>8}  {'csv page':>10}  {'db page':>10}")
+    with tempfile.TemporaryDirectory(prefix="bench_tracker_") as workdir:
+        for count in (100, 1_000, 10_000):
+            history = [make_application(i) for i in range(count)]
+            csv_path = os.path.join(workdir, f"applications_{count}.csv")
+            pd.DataFrame(history, columns=CSV_COLUMNS).to_csv(csv_path, index=False)
+            tracker = ApplicationTracker(os.path.join(workdir, f"applications_{count}.sqlite3"))
+            tracker.add_many(history)
+
+            new = make_application(count)
+            csv_time = best_of(lambda: csv_save(csv_path, new), args.repeats)
+            db_time = best_of(lambda: tracker.add(new), args.repeats)
+            csv_page_time = best_of(lambda: csv_page(csv_path), args.repeats)
+            db_page_time = best_of(lambda: tracker.query(limit=50), args.repeats)
+            tracker.close()
+            print(f"{count:>7}  {csv_time * 1e3:>8.2f}ms  {db_time * 1e3:>8.2f}ms  {csv_time / db_time:>7.0f}x"
+                  f"  {csv_page_time * 1e3:>8.2f}ms  {db_page_time * 1e3:>8.2f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+Benchmark: pooled keep-alive transport vs. one connection per call.
+
+Runs the 2-4 sequential completions of one job analysis against a local fake
+server that charges `--handshake` seconds per new connection (a stand-in for
+TCP+TLS setup to openrouter.ai) and compares module-level requests.post, as
+the client used to do, with OpenRouterClient's pooled session.
+
+    python -m benchmarks.bench_transport --handshake 0.08 --latency 0.02
+"""
+
+import argparse
+import statistics
+import time
+
+import requests
+
+from benchmarks.fake_openrouter import FakeOpenRouterServer
+from openrouter_client import OpenRouterClient
+
+
+def run_unpooled(base_url: str, calls: int) -> None:
+    for _ in range(calls):
+        response = requests.post(
+            f"{base_url}/chat/completions",
+            headers={"Authorization": "Bearer test", "Content-Type": "application/json"},
+            json={"model": "test/model", "messages": [{"role": "user", "content": "hi"}]},
+        )
+        response.json()
+
+
+def run_pooled(client: OpenRouterClient, calls: int) -> None:
+    for _ in range(calls):
+        client.chat_completion(model="test/model", messages=[{"role": "user", "content": "hi"}])
+
+
+def measure(server: FakeOpenRouterServer, fn, repeats: int):
+    timings = []
+    server.reset_counters()
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings), server.connections / repeats
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--handshake", type=float, default=0.08, help="seconds charged per new connection")
+    parser.add_argument("--latency", type=float, default=0.02, help="seconds per request")
+    parser.add_argument("--repeats", type=int, default=10)
+    args = parser.parse_args()
+
+    with FakeOpenRouterServer(latency=args.latency, handshake_delay=args.handshake) as server:
+        print(f"{'calls':>5}  {'unpooled':>10}  {'pooled':>10}  {'saved':>8}  {'conns (old/new)':>16}")
+        for calls in (2, 3, 4):
+            old_time, old_conns = measure(server, lambda: run_unpooled(server.base_url, calls), args.repeats)
+            # A fresh client per analysis: the first call still pays the handshake
+            new_times = []
+            new_conns = 0
+            for _ in range(args.repeats):
+                server.reset_counters()
+                with OpenRouterClient("test", base_url=server.base_url) as client:
+                    start = time.perf_counter()
+                    run_pooled(client, calls)
+                    new_times.append(time.perf_counter() - start)
+                new_conns += server.connections
+            new_time = statistics.median(new_times)
+            print(f"{calls:>5}  {old_time * 1000:>8.1f}ms  {new_time * 1000:>8.1f}ms  "
+                  f"{(1 - new_time / old_time) * 100:>7.1f}%  {old_conns:>7.1f}/{new_conns / args.repeats:<7.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+"""
+Benchmark: fetching a list of job links one by one vs. with UrlIngestor.
+
+Serves synthetic job pages from a local server with a fixed per-request
+latency, reachable under two host names (127.0.0.1 and localhost) so they
+count as two domains, and compares:
+
+- the former flow: each parser does its own requests.get, one URL after another
+- UrlIngestor.ingest_many() over a pooled session, with per-domain limits
+
+and reports the most requests each domain saw in flight at once, which must
+stay within --per-domain.
+
+    python -m benchmarks.bench_urls --urls 24 --latency 0.2 --per-domain 3
+"""
+
+import argparse
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from parsers import get_appropriate_parser
+from url_ingestion import UrlIngestor
+
+PAGE = """<html><body><main>
+<h1>Industrial Designer {n}</h1>
+<div class="company-name">Acme Studio</div>
+<div class="job-location">Melbourne VIC</div>
+<div class="job-description">
+<p>We are looking for an industrial designer to join our product team.</p>
+<ul><li>5+ years of experience with SolidWorks and Rhino</li><li>Keyshot rendering</li>
+<li>Prototyping and design for manufacture</li></ul>
+</div></main></body></html>"""
+
+
+class JobBoard:
+    """Threaded local server that tracks requests in flight per Host header.
+
+    Pages carry an ETag and are padded to about padding bytes with related
+    job cards; a request whose If-None-Match matches gets 304 Not Modified.
+    Bumping versions[path] changes that page. bandwidth (bytes per second
+    per connection, 0 for unlimited) paces the bodies.
+    """
+
+    def __init__(self, latency: float, padding: int = 0, bandwidth: float = 0):
+        self.latency = latency
+        self.bandwidth = bandwidth
+        card = '<div class="card"><a href="/jobs/related">Related job</a><span class="card-meta">Sydney NSW</span></div>'
+        self.padding = card * (padding // len(card))
+        self.versions = Counter()
+        self.in_flight = Counter()
+        self.max_in_flight = Counter()
+        self.requests = 0
+        self.not_modified = 0
+        self.bytes_sent = 0
+        self._lock = threading.Lock()
+        board = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                host = self.headers.get("Host", "").split(":")[0]
+                with board._lock:
+                    board.in_flight[host] += 1
+                    board.max_in_flight[host] = max(board.max_in_flight[host], board.in_flight[host])
+                time.sleep(board.latency)
+                etag = f'"{self.path}-v{board.versions[self.path]}"'
+                if self.headers.get("If-None-Match") == etag:
+                    body = b""
+                    self.send_response(304)
+                else:
+                    body = PAGE.format(n=self.path.rsplit("/", 1)[-1]).replace("</main>", board.padding + "</main>")
+                    body = body.encode("utf-8")
+                    if board.bandwidth:
+                        time.sleep(len(body) / board.bandwidth)
+                    self.send_response(200)
+                    self.send_header("Content-Type", "text/html; charset=utf-8")
+                    self.send_header("Content-Length", str(len(body)))
+                self.send_header("ETag", etag)
+                self.end_headers()
+                self.wfile.write(body)
+                with board._lock:
+                    board.in_flight[host] -= 1
+                    board.requests += 1
+                    board.not_modified += not body
+                    board.bytes_sent += len(body)
+
+            def log_message(self, *args):
+                pass
+
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._httpd.daemon_threads = True
+        self.port = self._httpd.server_address[1]
+        threading.Thread(target=self._httpd.serve_forever, daemon=True).start()
+
+    def close(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--urls", type=int, default=24)
+    parser.add_argument("--latency", type=float, default=0.2)
+    parser.add_argument("--per-domain", type=int, default=3)
+    parser.add_argument("--interval", type=float, default=0.0, help="minimum seconds between request starts per domain")
+    args = parser.parse_args()
+
+    board = JobBoard(args.latency)
+    hosts = ["127.0.0.1", "localhost"]
+    urls = [f"http://{hosts[i % 2]}:{board.port}/jobs/{i}" for i in range(args.urls)]
+    try:
+        start = time.perf_counter()
+        former = [get_appropriate_parser(url)(url) for url in urls]
+        former_time = time.perf_counter() - start
+
+        board.max_in_flight.clear()
+        ingestor = UrlIngestor(max_workers=8, max_per_domain=args.per_domain, min_interval=args.interval)
+        start = time.perf_counter()
+        results = dict(ingestor.ingest_many(urls))
+        ingest_time = time.perf_counter() - start
+        ingestor.close()
+    finally:
+        board.close()
+
+    errors = [result["error"] for result in results.values() if "error" in result]
+    assert not errors, errors[0]
+    assert [results[url]["title"] for url in urls] == [job["title"] for job in former]
+
+    print(f"{args.urls} URLs over 2 domains, {args.latency * 1e3:.0f}ms per page")
+    print(f"one by one, new connection each:  {former_time:6.2f}s")
+    print(f"UrlIngestor ({args.per_domain} per domain):       {ingest_time:6.2f}s  ({former_time / ingest_time:.1f}x faster)")
+    print("most requests in flight: " + ", ".join(f"{host} {count}" for host, count in sorted(board.max_in_flight.items())))
+    assert max(board.max_in_flight.values()) <= args.per_domain, "per-domain limit exceeded"
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,216 @@
+"""
+In-process fake OpenRouter server for offline benchmarks.
+
+Serves the subset of the OpenRouter API the app uses (/models, /key and
+/chat/completions, streamed or not) over plain HTTP on localhost. Latency,
+token rate, per-connection handshake cost and injected failures are
+configurable so benchmarks can model a real upstream without network access.
+"""
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Optional
+
+
+class FakeOpenRouterServer:
+    """
+    Threaded fake OpenRouter backend.
+
+    handshake_delay is slept once per accepted TCP connection, modelling the
+    TCP+TLS setup cost a keep-alive pool avoids. latency is slept once per
+    request before the response is written (time to first token), and
+    tokens_per_second paces the completion body. fail_statuses is a list of status
+    codes returned, in order, before requests start succeeding.
+    """
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        handshake_delay: float = 0.0,
+        tokens_per_second: float = 0.0,
+        models: Optional[List[Dict[str, Any]]] = None,
+        reply: Optional[Callable[[Dict[str, Any]], str]] = None,
+        fail_statuses: Optional[List[int]] = None,
+        retry_after: Optional[str] = None,
+    ):
+        self.latency = latency
+        self.handshake_delay = handshake_delay
+        self.tokens_per_second = tokens_per_second
+        self.models = models if models is not None else [
+            {"id": f"vendor/model-{i}", "name": f"Model {i}", "context_length": 8192}
+            for i in range(300)
+        ]
+        self.reply = reply or (lambda payload: '{"ok": true}')
+        self.fail_statuses = list(fail_statuses or [])
+        self.retry_after = retry_after
+
+        self.connections = 0
+        self.requests = 0
+        self.bytes_received = 0
+        self.bytes_sent = 0
+        self.request_log: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+        self._httpd: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}/api/v1"
+
+    def start(self) -> "FakeOpenRouterServer":
+        server = self
+
+        class Handler(_FakeHandler):
+            fake = server
+
+        class Server(ThreadingHTTPServer):
+            daemon_threads = True
+
+            def finish_request(self, request, client_address):
+                with server._lock:
+                    server.connections += 1
+                if server.handshake_delay:
+                    time.sleep(server.handshake_delay)
+                super().finish_request(request, client_address)
+
+        self._httpd = Server(("127.0.0.1", 0), Handler)
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        if self._httpd is not None:
+            self._httpd.shutdown()
+            self._httpd.server_close()
+            self._httpd = None
+
+    def reset_counters(self) -> None:
+        with self._lock:
+            self.connections = 0
+            self.requests = 0
+            self.bytes_received = 0
+            self.bytes_sent = 0
+            self.request_log = []
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+
+class _FakeHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Avoid Nagle + delayed-ACK stalls skewing keep-alive timings
+    disable_nagle_algorithm = True
+    fake: FakeOpenRouterServer = None
+
+    def log_message(self, format, *args):
+        pass
+
+    def _read_body(self) -> bytes:
+        length = int(self.headers.get("Content-Length") or 0)
+        return self.rfile.read(length) if length else b""
+
+    def _send_json(self, status: int, data: Any, headers: Optional[Dict[str, str]] = None) -> None:
+        body = json.dumps(data).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(body)
+        with self.fake._lock:
+            self.fake.bytes_sent += len(body)
+
+    def _begin(self, body: bytes) -> bool:
+        """Record the request; return False if an injected failure was sent"""
+        fake = self.fake
+        with fake._lock:
+            fake.requests += 1
+            fake.bytes_received += len(body)
+            fail_status = fake.fail_statuses.pop(0) if fake.fail_statuses else None
+        if fake.latency:
+            time.sleep(fake.latency)
+        if fail_status is not None:
+            headers = {"Retry-After": fake.retry_after} if fake.retry_after else None
+            self._send_json(fail_status, {"error": {"code": fail_status, "message": "injected failure"}}, headers)
+            return False
+        return True
+
+    def do_GET(self):
+        if not self._begin(b""):
+            return
+        if self.path.endswith("/models"):
+            self._send_json(200, {"data": self.fake.models})
+        elif self.path.endswith("/key"):
+            self._send_json(200, {"data": {"label": "fake", "usage": 0, "limit": None}})
+        else:
+            self._send_json(404, {"error": {"message": "not found"}})
+
+    def do_POST(self):
+        body = self._read_body()
+        if not self._begin(body):
+            return
+        if not self.path.endswith("/chat/completions"):
+            self._send_json(404, {"error": {"message": "not found"}})
+            return
+
+        payload = json.loads(body or b"{}")
+        with self.fake._lock:
+            self.fake.request_log.append(payload)
+        content = self.fake.reply(payload)
+        prompt_tokens = sum(len(str(m.get("content", ""))) for m in payload.get("messages", [])) // 4
+        # Roughly four characters per token, like real tokenizers on English text
+        tokens = [content[i:i + 4] for i in range(0, len(content), 4)] or [""]
+        usage = {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": len(tokens),
+            "total_tokens": prompt_tokens + len(tokens),
+        }
+        token_delay = 1.0 / self.fake.tokens_per_second if self.fake.tokens_per_second else 0.0
+        generation_id = f"gen-{self.fake.requests}"
+
+        if payload.get("stream"):
+            self._send_stream(generation_id, payload.get("model"), tokens, usage, token_delay)
+            return
+
+        if token_delay:
+            time.sleep(token_delay * len(tokens))
+        self._send_json(200, {
+            "id": generation_id,
+            "model": payload.get("model"),
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}],
+            "usage": usage,
+        })
+
+    def _send_stream(self, generation_id: str, model: str, tokens: List[str], usage: Dict[str, int], token_delay: float) -> None:
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+
+        def write_chunk(body: bytes) -> None:
+            self.wfile.write(f"{len(body):x}\r\n".encode("ascii") + body + b"\r\n")
+            self.wfile.flush()
+            with self.fake._lock:
+                self.fake.bytes_sent += len(body)
+
+        def write_event(data: str) -> None:
+            write_chunk(f"data: {data}\n\n".encode("utf-8"))
+
+        # OpenRouter sends SSE comments as keep-alives while the model warms up
+        write_chunk(b": OPENROUTER PROCESSING\n\n")
+        for i, token in enumerate(tokens):
+            if token_delay:
+                time.sleep(token_delay)
+            delta = {"role": "assistant", "content": token} if i == 0 else {"content": token}
+            write_event(json.dumps({"id": generation_id, "model": model, "choices": [{"index": 0, "delta": delta, "finish_reason": None}]}))
+        write_event(json.dumps({"id": generation_id, "model": model, "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}], "usage": usage}))
+        write_event("[DONE]")
+        self.wfile.write(b"0\r\n\r\n")
+        self.wfile.flush()
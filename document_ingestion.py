@@ -0,0 +1,320 @@
+"""
+Single-pass ingestion of uploaded profile documents.
+
+Uploads used to be parsed once for display and again inside
+extract_info_from_resume, and again on every "Process Document" click.
+DocumentIngestor parses each upload once: extracted text (and parsed JSON) is
+cached under the SHA-256 of the file's bytes, and so is the structured
+profile built from it, so re-processing the same file costs a hash lookup.
+PDF, DOCX, JSON and TXT files go through the same ingest() call.
+
+PDF pages are extracted lazily by iter_pdf_pages(), which stops as soon as
+the caller's character budget is filled (only the first few thousand
+characters reach the model). It can spread long documents over a process
+pool, but only when more than one CPU is available and the pages still to
+read would take long enough to pay for starting the workers, each of which
+parses the whole PDF again. Each page's extraction time is kept for
+diagnostics.
+"""
+
+import copy
+import hashlib
+import io
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+import PyPDF2
+
+try:
+    import docx
+except ImportError:  # python-docx is optional
+    docx = None
+
+SUPPORTED_KINDS = ("pdf", "docx", "json", "txt")
+
+_MIME_KINDS = {
+    "application/pdf": "pdf",
+    "application/vnd.openxmlformats-officedocument.wordprocessingml.document": "docx",
+    "application/json": "json",
+    "text/plain": "txt",
+}
+
+
+class UnsupportedDocumentError(ValueError):
+    """Raised for file types the ingestor can't extract text from"""
+
+
+def content_hash(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def detect_kind(name: str = "", mime: Optional[str] = None) -> Optional[str]:
+    """Document kind from the MIME type, falling back to the file extension"""
+    if mime in _MIME_KINDS:
+        return _MIME_KINDS[mime]
+    extension = name.rsplit(".", 1)[-1].lower() if "." in name else ""
+    return extension if extension in SUPPORTED_KINDS else None
+
+
+def decode_text(data: bytes) -> str:
+    """Decode text files, tolerating a BOM and non-UTF-8 bytes"""
+    try:
+        return data.decode("utf-8-sig")
+    except UnicodeDecodeError:
+        return data.decode("latin-1")
+
+
+class PdfPage:
+    """Text of one PDF page (numbered from 1 of page_count) and how long it took to extract"""
+
+    def __init__(self, number: int, page_count: int, text: str, seconds: float):
+        self.number = number
+        self.page_count = page_count
+        self.text = text
+        self.seconds = seconds
+
+
+def _timed_page_text(reader: PyPDF2.PdfReader, index: int) -> Tuple[int, str, float]:
+    start = time.perf_counter()
+    text = reader.pages[index].extract_text() or ""
+    return index, text, time.perf_counter() - start
+
+
+# Set in each pool worker by _init_pdf_worker, so the PDF is parsed once per worker
+_worker_reader: Optional[PyPDF2.PdfReader] = None
+
+
+def _init_pdf_worker(data: bytes) -> None:
+    global _worker_reader
+    _worker_reader = PyPDF2.PdfReader(io.BytesIO(data))
+
+
+def _extract_page_in_worker(index: int) -> Tuple[int, str, float]:
+    return _timed_page_text(_worker_reader, index)
+
+
+# Starting a pool pays off only when the pages still to read take at least this long serially
+PARALLEL_MIN_SECONDS = 0.5
+
+
+def _projected_pages(page_count: int, first_page_chars: int, max_chars: Optional[int]) -> int:
+    """Pages likely to be read in total, judging the text per page by the first page"""
+    if max_chars is None:
+        return page_count
+    return min(page_count, -(-max_chars // max(1, first_page_chars)))
+
+
+def iter_pdf_pages(
+    data: bytes,
+    max_chars: Optional[int] = None,
+    workers: int = 1,
+    parallel_min_pages: int = 32,
+    parallel_min_seconds: float = PARALLEL_MIN_SECONDS
+) -> Iterator[PdfPage]:
+    """Yield PDF pages in order, extracting each only when it's needed.
+
+    Stops after the page that brings the extracted text to max_chars. The
+    first page is always read in process. With workers > 1, the rest go to a
+    process pool if, judging by the first page, at least parallel_min_pages
+    more pages will be read and they would take at least parallel_min_seconds
+    serially. Pool pages are extracted at most two per worker ahead of the
+    consumer, and pages not yet started are cancelled once the budget is filled.
+    """
+    reader = PyPDF2.PdfReader(io.BytesIO(data))
+    page_count = len(reader.pages)
+    if page_count == 0:
+        return
+
+    _, text, seconds = _timed_page_text(reader, 0)
+    yield PdfPage(1, page_count, text, seconds)
+    extracted = len(text)
+    if max_chars is not None and extracted >= max_chars:
+        return
+
+    remaining = _projected_pages(page_count, len(text), max_chars) - 1
+    if workers <= 1 or remaining < parallel_min_pages or remaining * seconds < parallel_min_seconds:
+        for index in range(1, page_count):
+            _, text, seconds = _timed_page_text(reader, index)
+            yield PdfPage(index + 1, page_count, text, seconds)
+            extracted += len(text)
+            if max_chars is not None and extracted >= max_chars:
+                return
+        return
+
+    executor = ProcessPoolExecutor(max_workers=workers, initializer=_init_pdf_worker, initargs=(data,))
+    try:
+        window = workers * 2
+        futures = {}
+        next_index = 1
+        for index in range(1, page_count):
+            while next_index < page_count and next_index < index + window:
+                futures[next_index] = executor.submit(_extract_page_in_worker, next_index)
+                next_index += 1
+            _, text, seconds = futures.pop(index).result()
+            yield PdfPage(index + 1, page_count, text, seconds)
+            extracted += len(text)
+            if max_chars is not None and extracted >= max_chars:
+                return
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def extract_pdf_text(data: bytes, max_chars: Optional[int] = None, workers: int = 1) -> str:
+    return "".join(page.text for page in iter_pdf_pages(data, max_chars, workers))
+
+
+def extract_docx_text(data: bytes) -> str:
+    if docx is None:
+        raise UnsupportedDocumentError("DOCX support requires python-docx (pip install python-docx)")
+    document = docx.Document(io.BytesIO(data))
+    lines = [paragraph.text for paragraph in document.paragraphs]
+    # Resumes often keep skills and dates in tables
+    for table in document.tables:
+        for row in table.rows:
+            cells = [cell.text.strip() for cell in row.cells if cell.text.strip()]
+            if cells:
+                lines.append(" | ".join(cells))
+    return "\n".join(lines)
+
+
+class IngestedDocument:
+    """Text (and, for JSON, parsed data) extracted from one uploaded file.
+
+    For PDFs, complete is False when extraction stopped at a character budget
+    before the last page; page_timings holds (page number, seconds) for each
+    page read, and page_count the total number of pages.
+    """
+
+    def __init__(
+        self,
+        content_hash: str,
+        kind: str,
+        name: str,
+        text: str,
+        data: Any = None,
+        complete: bool = True,
+        page_count: Optional[int] = None,
+        page_timings: Optional[List[Tuple[int, float]]] = None
+    ):
+        self.content_hash = content_hash
+        self.kind = kind
+        self.name = name
+        self.text = text
+        self.data = data
+        self.complete = complete
+        self.page_count = page_count
+        self.page_timings = page_timings or []
+
+    @property
+    def pages_read(self) -> int:
+        return len(self.page_timings)
+
+    def covers(self, max_chars: Optional[int]) -> bool:
+        """True if this extraction holds at least max_chars of text (or all of it)"""
+        return self.complete or (max_chars is not None and len(self.text) >= max_chars)
+
+
+class DocumentIngestor:
+    """Parses uploads once and memoizes text and derived profiles by content hash.
+
+    Thread-safe; one instance is shared by all sessions in the process.
+    """
+
+    def __init__(self, max_entries: int = 32, pdf_workers: int = 1):
+        self.max_entries = max_entries
+        # Opt-in: with the app's text budget a resume or portfolio rarely needs
+        # enough pages for a process pool to beat reading them in process
+        self.pdf_workers = pdf_workers
+        self._documents: "OrderedDict[str, IngestedDocument]" = OrderedDict()
+        self._profiles: "OrderedDict[Tuple[str, str], Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def ingest(
+        self,
+        data: bytes,
+        name: str = "",
+        mime: Optional[str] = None,
+        max_chars: Optional[int] = None
+    ) -> IngestedDocument:
+        """Extract text from a file's bytes, or return the cached extraction.
+
+        max_chars lets PDF extraction stop once that much text is available;
+        a cached extraction is reused only if it covers the requested budget.
+        """
+        kind = detect_kind(name, mime)
+        if kind is None:
+            raise UnsupportedDocumentError(f"Unsupported file type: {mime or name}")
+        key = content_hash(data)
+        with self._lock:
+            document = self._documents.get(key)
+            if document is not None and document.covers(max_chars):
+                self._documents.move_to_end(key)
+                return document
+
+        document = self._parse(key, kind, name, data, max_chars)
+        with self._lock:
+            self._documents[key] = document
+            while len(self._documents) > self.max_entries:
+                self._documents.popitem(last=False)
+        return document
+
+    def _parse(self, key: str, kind: str, name: str, data: bytes, max_chars: Optional[int]) -> IngestedDocument:
+        if kind == "pdf":
+            # Extra workers on a single CPU only add process start-up
+            workers = min(self.pdf_workers, os.cpu_count() or 1)
+            pages = list(iter_pdf_pages(data, max_chars, workers))
+            page_count = pages[-1].page_count if pages else 0
+            return IngestedDocument(
+                key, kind, name, "".join(page.text for page in pages),
+                complete=len(pages) == page_count,
+                page_count=page_count,
+                page_timings=[(page.number, page.seconds) for page in pages]
+            )
+        if kind == "docx":
+            return IngestedDocument(key, kind, name, extract_docx_text(data))
+        text = decode_text(data)
+        if kind == "json":
+            # Raises json.JSONDecodeError for malformed files
+            return IngestedDocument(key, kind, name, text, json.loads(text))
+        return IngestedDocument(key, kind, name, text)
+
+    def profile(
+        self,
+        document: IngestedDocument,
+        build: Callable[[IngestedDocument], Dict[str, Any]],
+        variant: str = ""
+    ) -> Dict[str, Any]:
+        """Structured profile for document, built with build() on first request.
+
+        variant distinguishes profiles built differently from the same file
+        (e.g. by different models). Results containing "error" aren't cached.
+        """
+        key = (document.content_hash, variant)
+        with self._lock:
+            profile = self._profiles.get(key)
+            if profile is not None:
+                self._profiles.move_to_end(key)
+                # Copies, so a session editing its profile doesn't alter the cache
+                return copy.deepcopy(profile)
+
+        profile = build(document)
+        if isinstance(profile, dict) and "error" not in profile:
+            with self._lock:
+                self._profiles[key] = copy.deepcopy(profile)
+                while len(self._profiles) > self.max_entries:
+                    self._profiles.popitem(last=False)
+        return profile
+
+    def clear(self) -> None:
+        with self._lock:
+            self._documents.clear()
+            self._profiles.clear()
+
+
+# Shared by all sessions in this process
+document_ingestor = DocumentIngestor(pdf_workers=int(os.environ.get("PDF_WORKERS", 1)))
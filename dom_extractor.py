@@ -0,0 +1,235 @@
+"""
+Single-pass field extraction from job posting HTML.
+
+The site parsers used to build a full BeautifulSoup tree and then run one
+soup.find() scan over it per selector: up to six for a generic page's
+description, four for its location, three for its job type, and two per
+heading. On multi-megabyte job board pages (mostly inline scripts and
+navigation) that is most of the parsing time.
+
+extract_fields() instead streams the document once through the standard
+library's HTMLParser without building a tree. Every field is described by
+Rules in priority order; during the walk each rule keeps the text of its
+first matching element, rules ranked below a rule that already matched with
+text stop being checked, and the subtrees of script, style, nav and similar
+elements are skipped entirely.
+"""
+
+import re
+from html.parser import HTMLParser
+from typing import Dict, FrozenSet, List, NamedTuple, Optional, Sequence, Tuple, Union
+
+# Elements whose content is never part of a field and is not searched
+PRUNED_TAGS = frozenset({"script", "style", "noscript", "template", "svg", "nav", "iframe"})
+
+# Elements that never have content or an end tag
+VOID_TAGS = frozenset({
+    "area", "base", "br", "col", "embed", "hr", "img", "input", "link", "meta", "param", "source", "track", "wbr",
+})
+
+_CHARSET_RE = re.compile(rb"""<meta[^>]+charset=["']?([\w-]+)""", re.IGNORECASE)
+
+
+class Rule(NamedTuple):
+    """Selector for one element, matched like BeautifulSoup's find().
+
+    tags limits the element names (None for any). attr and value test one
+    attribute: mode "class" matches value against the whole attribute or any
+    of its space-separated tokens (as find(class_=value) does), "contains" is
+    a case-insensitive substring test, and "equals" an exact comparison. With
+    inside set, only elements within the first element matching that rule
+    count, and nth picks the nth of them (0 for the first).
+    """
+    tags: Optional[FrozenSet[str]] = None
+    attr: Optional[str] = None
+    value: str = ""
+    mode: str = "class"
+    inside: Optional["Rule"] = None
+    nth: int = 0
+
+    def matches(self, tag: str, attrs: Dict[str, str]) -> bool:
+        if self.tags is not None and tag not in self.tags:
+            return False
+        if self.attr is None:
+            return True
+        actual = attrs.get(self.attr)
+        if actual is None:
+            return False
+        if self.mode == "contains":
+            return self.value in actual.lower()
+        if self.mode == "class":
+            return actual == self.value or self.value in actual.split()
+        return actual == self.value
+
+
+def tags(*names: str) -> FrozenSet[str]:
+    return frozenset(names)
+
+
+def decode_html(content: Union[str, bytes]) -> str:
+    """Page bytes as text: UTF-8, else the charset declared in a meta tag, else Windows-1252"""
+    if isinstance(content, str):
+        return content
+    try:
+        return content.decode("utf-8")
+    except UnicodeDecodeError:
+        pass
+    declared = _CHARSET_RE.search(content[:4096])
+    if declared:
+        try:
+            return content.decode(declared.group(1).decode("ascii"), errors="replace")
+        except LookupError:
+            pass
+    return content.decode("cp1252", errors="replace")
+
+
+class _Capture:
+    """Text collected for one rule's element while it is open"""
+
+    __slots__ = ("field", "index", "depth", "parts")
+
+    def __init__(self, field: str, index: int, depth: int):
+        self.field = field
+        self.index = index
+        self.depth = depth
+        self.parts: List[str] = []
+
+
+class _FieldExtractor(HTMLParser):
+    def __init__(self, spec: Dict[str, Sequence[Rule]]):
+        super().__init__(convert_charrefs=True)
+        self.spec = spec
+        self.found: Dict[str, List[Optional[str]]] = {field: [None] * len(rules) for field, rules in spec.items()}
+        # Rules still worth checking per field: those ranked above the best one found so far
+        self.live: Dict[str, int] = {field: len(rules) for field, rules in spec.items()}
+        self.stack: List[str] = []
+        self.pruned_depth: Optional[int] = None
+        self.captures: List[_Capture] = []
+        # Depth of the open first match of each "inside" rule, and how often each nested rule matched
+        self.scopes: Dict[Rule, Optional[int]] = {}
+        self.scope_done: set = set()
+        self.nth_seen: Dict[Rule, int] = {}
+        self._scope_rules = {rule.inside for rules in spec.values() for rule in rules if rule.inside is not None}
+        # Rules indexed by element name, so each start tag is only tested against rules that can match it
+        self._by_tag: Dict[str, List[Tuple[str, int, Rule]]] = {}
+        self._any_tag: List[Tuple[str, int, Rule]] = []
+        for field, rules in spec.items():
+            for index, rule in enumerate(rules):
+                if rule.tags is None:
+                    self._any_tag.append((field, index, rule))
+                else:
+                    for name in rule.tags:
+                        self._by_tag.setdefault(name, []).append((field, index, rule))
+
+    def handle_starttag(self, tag, attrs):
+        if self.pruned_depth is not None:
+            if tag not in VOID_TAGS:
+                self.stack.append(tag)
+            return
+        if tag in PRUNED_TAGS:
+            self.pruned_depth = len(self.stack)
+            self.stack.append(tag)
+            return
+
+        depth = len(self.stack)
+        candidates = self._any_tag + self._by_tag.get(tag, []) if self._any_tag else self._by_tag.get(tag, [])
+        if candidates or self._scope_rules:
+            self._match(tag, {name: value or "" for name, value in attrs}, depth, candidates)
+        if tag not in VOID_TAGS:
+            self.stack.append(tag)
+
+    def _match(self, tag: str, attrs: Dict[str, str], depth: int, candidates: List[Tuple[str, int, Rule]]) -> None:
+        for scope in self._scope_rules:
+            if scope not in self.scope_done and scope not in self.scopes and scope.matches(tag, attrs):
+                self.scopes[scope] = depth
+
+        for field, index, rule in candidates:
+            if index >= self.live[field] or self.found[field][index] is not None:
+                continue
+            if any(c.field == field and c.index == index for c in self.captures):
+                continue
+            if rule.inside is not None:
+                scope_depth = self.scopes.get(rule.inside)
+                if scope_depth is None or depth <= scope_depth:
+                    continue
+            if not rule.matches(tag, attrs):
+                continue
+            if rule.nth:
+                seen = self.nth_seen.get(rule, 0)
+                self.nth_seen[rule] = seen + 1
+                if seen != rule.nth:
+                    continue
+            if tag in VOID_TAGS:
+                self._finish(_Capture(field, index, depth))
+            else:
+                self.captures.append(_Capture(field, index, depth))
+
+    def handle_startendtag(self, tag, attrs):
+        self.handle_starttag(tag, attrs)
+        if tag not in VOID_TAGS and self.stack and self.stack[-1] == tag:
+            self._close_to(len(self.stack) - 1)
+
+    def handle_endtag(self, tag):
+        # Close the innermost open element with this name; stray end tags are ignored
+        for depth in range(len(self.stack) - 1, -1, -1):
+            if self.stack[depth] == tag:
+                self._close_to(depth)
+                return
+
+    def _close_to(self, depth: int) -> None:
+        del self.stack[depth:]
+        if self.pruned_depth is not None:
+            if depth > self.pruned_depth:
+                return
+            self.pruned_depth = None
+        if self.captures:
+            still_open = []
+            for capture in self.captures:
+                if capture.depth >= depth:
+                    self._finish(capture)
+                else:
+                    still_open.append(capture)
+            self.captures = still_open
+        for scope, scope_depth in list(self.scopes.items()):
+            if scope_depth is not None and scope_depth >= depth:
+                self.scopes[scope] = None
+                self.scope_done.add(scope)
+
+    def _finish(self, capture: _Capture) -> None:
+        text = "".join(capture.parts).strip()
+        self.found[capture.field][capture.index] = text
+        # An empty match (e.g. a placeholder container) keeps the fallback rules below it live
+        if text:
+            self.live[capture.field] = min(self.live[capture.field], capture.index + 1)
+
+    def handle_data(self, data):
+        if self.pruned_depth is None:
+            for capture in self.captures:
+                capture.parts.append(data)
+
+    def close(self):
+        super().close()
+        # Elements left open at the end of the document still count
+        self._close_to(0)
+
+
+def extract_fields(content: Union[str, bytes], spec: Dict[str, Sequence[Rule]]) -> Dict[str, List[Optional[str]]]:
+    """Text of the first element matching each rule, walking the document once.
+
+    Returns {field: [text or None for each rule, in priority order]}. Text is
+    the element's stripped text content, without pruned subtrees. Once a rule
+    has matched with non-empty text, lower-ranked rules of the same field may
+    be left as None.
+    """
+    extractor = _FieldExtractor(spec)
+    extractor.feed(decode_html(content))
+    extractor.close()
+    return extractor.found
+
+
+def first_text(candidates: Sequence[Optional[str]], default: str = "", skip_empty: bool = False) -> str:
+    """Text of the highest-priority rule that matched (and, with skip_empty, had text)"""
+    for text in candidates:
+        if text is not None and (text or not skip_empty):
+            return text
+    return default
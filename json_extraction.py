@@ -0,0 +1,349 @@
+"""
+Tolerant, incremental extraction of JSON from model output.
+
+Every call site used to look for a ``` block, regex it out, json.loads it and
+fall back to a hard-coded default when that failed. Models routinely wrap
+JSON in prose or code fences, leave trailing commas, use single quotes or
+Python literals, and get cut off at max_tokens, so those fallbacks fired
+often and analyses quietly degraded to placeholder data.
+
+StreamingJSONParser consumes text as it arrives (it can be passed as a
+chat_completion on_token callback), skips prose and code fences around the
+first JSON object or array, repairs common defects, and can return the
+partial value at any point so callers can render results before the
+response is complete. extract_json is the one-shot form.
+"""
+
+import copy
+import json
+import re
+from typing import Any, List, Optional, Tuple, Type, Union
+
+_WHITESPACE_RE = re.compile(r"\s*")
+_FENCE_RE = re.compile(r"```(?:json)?\s*(.*?)```", re.DOTALL)
+# A run of string content up to (not including) the closing quote or a lone trailing backslash
+_STRING_RE = {'"': re.compile(r'(?:[^"\\]|\\.)*', re.DOTALL), "'": re.compile(r"(?:[^'\\]|\\.)*", re.DOTALL)}
+# Numbers and literals end at whitespace or structural characters
+_BARE_RE = re.compile(r"[^\s,:\[\]{}\"']*")
+_INVALID_ESCAPE_RE = re.compile(r'\\(?!["\\/bfnrtu])|\\u(?![0-9a-fA-F]{4})')
+_PARTIAL_ESCAPE_RE = re.compile(r"\\(?:u[0-9a-fA-F]{0,3})?$")
+_PYTHON_LITERALS = {"True": True, "False": False, "None": None}
+
+
+class JSONExtractionError(ValueError):
+    """No usable JSON value could be recovered from the text"""
+
+
+class _Frame:
+    """An open object or array; state is what the parser expects next"""
+
+    __slots__ = ("container", "key", "state", "after_comma")
+
+    def __init__(self, container: Union[dict, list]):
+        self.container = container
+        self.key: Optional[str] = None
+        # Objects: key -> colon -> value -> comma; arrays: value -> comma
+        self.state = "key" if isinstance(container, dict) else "value"
+        self.after_comma = False
+
+
+def _decode_string(raw: str, quote: str) -> str:
+    if quote == "'":
+        # Single-quoted: \' is a plain quote and bare double quotes need escaping
+        raw = re.sub(r"\\.|\"", lambda m: '\\"' if m.group() == '"' else ("'" if m.group() == "\\'" else m.group()), raw)
+    try:
+        return json.loads(f'"{raw}"', strict=False)
+    except json.JSONDecodeError:
+        # Keep stray backslashes (e.g. "C:\Users") as literal text
+        raw = _INVALID_ESCAPE_RE.sub(r"\\\\", raw)
+        return json.loads(f'"{raw}"', strict=False)
+
+
+def _decode_bare(token: str) -> Tuple[bool, Any]:
+    if token in _PYTHON_LITERALS:
+        return True, _PYTHON_LITERALS[token]
+    try:
+        return True, json.loads(token)
+    except json.JSONDecodeError:
+        return False, None
+
+
+class StreamingJSONParser:
+    """Incremental parser for the first JSON object or array in model output.
+
+    Feed text in any pieces with feed(); partial() returns the value so far
+    with open objects, arrays and strings closed, and close() returns the
+    final value once the stream ends. Text before the value (prose, a
+    ```json fence) and anything after it is ignored.
+
+    Repaired on the way: trailing and doubled commas, missing commas between
+    items, single-quoted strings, Python True/False/None, raw newlines in
+    strings, mismatched closing brackets and truncated output. A start that
+    turns out not to be JSON (e.g. braces in prose) is abandoned and the
+    search resumes after it. Each kind of repair made is listed in ``repairs``.
+
+    expect=dict or list only starts at ``{`` or ``[`` respectively.
+    """
+
+    def __init__(self, expect: Optional[Type] = None):
+        if expect is dict:
+            self._openers = "{"
+        elif expect is list:
+            self._openers = "["
+        else:
+            self._openers = "{["
+        self._buffer = ""
+        self._pos = 0
+        self._reset(None)
+
+    def _reset(self, start: Optional[int]) -> None:
+        self._start = start
+        self._stack: List[_Frame] = []
+        self._root: Any = None
+        self._string_quote: Optional[str] = None
+        self._string_start = 0
+        self._string_is_key = False
+        self._bare_start: Optional[int] = None
+        self.done = False
+        self.truncated = False
+        self.repairs: List[str] = []
+
+    def feed(self, text: str) -> None:
+        """Consume the next piece of the stream"""
+        if not text or self.done:
+            return
+        self._buffer += text
+        self._parse(final=False)
+
+    __call__ = feed
+
+    def partial(self) -> Any:
+        """Copy of the value parsed so far, including a string or number still being read; None before it starts"""
+        if self.done or not self._stack:
+            return copy.deepcopy(self._root)
+        memo = {}
+        snapshot = copy.deepcopy(self._root, memo)
+        pending = self._pending_scalar()
+        if pending is not None:
+            self._attach(memo[id(self._stack[-1].container)], self._stack[-1], pending[0])
+        return snapshot
+
+    def close(self) -> Any:
+        """End of stream: the complete value, or what was parsed of a truncated one"""
+        self._parse(final=True)
+        if self.done:
+            return self._root
+        if self._start is None:
+            raise JSONExtractionError("No JSON object or array found in the response")
+        # Truncated: close everything that is open, dropping a string or key cut off midway
+        self.truncated = True
+        self._note("truncated")
+        self.done = True
+        return self._root
+
+    def _parse(self, final: bool) -> None:
+        buffer = self._buffer
+        end = len(buffer)
+        while not self.done:
+            if self._start is None:
+                if not self._find_start():
+                    return
+                self._pos = self._start + 1
+                self._open(buffer[self._start])
+                continue
+
+            if self._string_quote is not None:
+                match = _STRING_RE[self._string_quote].match(buffer, self._pos)
+                self._pos = match.end()
+                if self._pos >= end or buffer[self._pos] != self._string_quote:
+                    # The closing quote (or the character after a backslash) hasn't arrived yet
+                    return
+                value = _decode_string(buffer[self._string_start:self._pos], self._string_quote)
+                self._pos += 1
+                self._string_quote = None
+                if self._string_is_key:
+                    self._stack[-1].key = value
+                    self._stack[-1].state = "colon"
+                else:
+                    self._add_value(value)
+                continue
+
+            if self._bare_start is not None:
+                self._pos = _BARE_RE.match(buffer, self._pos).end()
+                if self._pos >= end and not final:
+                    return
+                token = buffer[self._bare_start:self._pos]
+                self._bare_start = None
+                ok, value = _decode_bare(token)
+                if not ok:
+                    if final and self._pos >= end:
+                        # A number or literal cut off at the end of the stream
+                        return
+                    self._restart()
+                    continue
+                if token in _PYTHON_LITERALS:
+                    self._note("python literal")
+                self._add_value(value)
+                continue
+
+            self._pos = _WHITESPACE_RE.match(buffer, self._pos).end()
+            if self._pos >= end:
+                return
+            char = buffer[self._pos]
+            self._pos += 1
+            if not self._step(char):
+                self._restart()
+
+    def _find_start(self) -> bool:
+        buffer = self._buffer
+        positions = [i for i in (buffer.find(opener, self._pos) for opener in self._openers) if i >= 0]
+        if not positions:
+            self._pos = max(self._pos, len(buffer) - 3)
+            return False
+        start = min(positions)
+        # Prefer the contents of a code fence over braces in the prose before it
+        fence = buffer.find("```", self._pos, start)
+        if fence >= 0:
+            line_end = buffer.find("\n", fence)
+            if line_end < 0:
+                return False
+            self._pos = line_end + 1
+            return self._find_start()
+        if start > 0:
+            self._note("text around JSON")
+        self._start = start
+        return True
+
+    def _note(self, repair: str) -> None:
+        if repair not in self.repairs:
+            self.repairs.append(repair)
+
+    def _restart(self) -> None:
+        # Not JSON after all: look for the next opener after this start
+        self._pos = self._start + 1
+        self._reset(None)
+
+    def _step(self, char: str) -> bool:
+        """Handle one structural character; False if the text isn't JSON"""
+        frame = self._stack[-1]
+        is_dict = isinstance(frame.container, dict)
+
+        if char in "}]":
+            if frame.state == "colon" or (is_dict and frame.state == "value"):
+                return False
+            if frame.after_comma and frame.state != "comma":
+                self._note("trailing comma")
+            if char != ("}" if is_dict else "]"):
+                self._note("mismatched bracket")
+            self._close()
+            return True
+
+        if char == ",":
+            if frame.state == "comma":
+                frame.state = "key" if is_dict else "value"
+                frame.after_comma = True
+            elif frame.state in ("key", "value") and frame.after_comma:
+                self._note("doubled comma")
+            else:
+                return False
+            return True
+
+        if char == ":":
+            if frame.state != "colon":
+                return False
+            frame.state = "value"
+            return True
+
+        if frame.state == "comma":
+            # A value or key right after the previous one: a comma was left out
+            self._note("missing comma")
+            frame.state = "key" if is_dict else "value"
+
+        if frame.state == "key":
+            if char not in "\"'":
+                return False
+            self._begin_string(char, is_key=True)
+            return True
+
+        if frame.state != "value":
+            return False
+        if char in "\"'":
+            self._begin_string(char, is_key=False)
+        elif char in "{[":
+            self._open(char)
+        else:
+            self._bare_start = self._pos - 1
+        return True
+
+    def _begin_string(self, quote: str, is_key: bool) -> None:
+        if quote == "'":
+            self._note("single quotes")
+        self._string_quote = quote
+        self._string_start = self._pos
+        self._string_is_key = is_key
+
+    def _open(self, char: str) -> None:
+        container: Union[dict, list] = {} if char == "{" else []
+        if self._stack:
+            self._add_value(container)
+        else:
+            self._root = container
+        self._stack.append(_Frame(container))
+
+    def _close(self) -> None:
+        self._stack.pop()
+        if not self._stack:
+            self.done = True
+
+    def _add_value(self, value: Any) -> None:
+        frame = self._stack[-1]
+        self._attach(frame.container, frame, value)
+        frame.key = None
+        frame.state = "comma"
+        frame.after_comma = False
+
+    @staticmethod
+    def _attach(container: Union[dict, list], frame: _Frame, value: Any) -> None:
+        if isinstance(container, dict):
+            container[frame.key] = value
+        else:
+            container.append(value)
+
+    def _pending_scalar(self) -> Optional[Tuple[Any]]:
+        """The value string or number being read, as a 1-tuple, if any"""
+        frame = self._stack[-1]
+        if frame.state != "value":
+            return None
+        if self._string_quote is not None and not self._string_is_key:
+            raw = _PARTIAL_ESCAPE_RE.sub("", self._buffer[self._string_start:self._pos])
+            return (_decode_string(raw, self._string_quote),)
+        if self._bare_start is not None:
+            ok, value = _decode_bare(self._buffer[self._bare_start:self._pos])
+            return (value,) if ok else None
+        return None
+
+
+def extract_json(text: str, expect: Optional[Type] = None) -> Any:
+    """The first JSON object or array in text, repaired where needed.
+
+    expect=dict or list restricts the result to that type. Raises
+    JSONExtractionError if nothing usable is found.
+    """
+    text = text or ""
+    # Well-formed output, bare or in a code fence, needs no repair; the C parser handles it fastest
+    fence = _FENCE_RE.search(text)
+    candidate = (fence.group(1) if fence else text).strip()
+    if candidate[:1] in ("{", "["):
+        try:
+            value = json.loads(candidate)
+            if expect is None or isinstance(value, expect):
+                return value
+        except json.JSONDecodeError:
+            pass
+
+    parser = StreamingJSONParser(expect=expect)
+    parser.feed(text)
+    value = parser.close()
+    if expect is not None and not isinstance(value, expect):
+        raise JSONExtractionError(f"Expected a JSON {'object' if expect is dict else 'array'}")
+    return value
@@ -0,0 +1,232 @@
+"""
+Latency-aware model routing from observed call timings.
+
+The sidebar used to offer a fixed list of models with no indication of how
+fast each one is, and extraction calls (job metadata, requirement lists) ran
+on the same models as cover letter writing. ModelStats records the latency,
+output tokens per second and success of every chat completion the client
+makes, per model and task type, in SQLite so the history survives restarts.
+Timings are kept apart per task because a cover letter takes several times
+longer than a requirement list on the same model. ModelRouter picks, for each
+task type, the fastest or cheapest model whose quality tier meets that task's
+floor.
+
+Exploration is bounded: a model without MIN_SAMPLES calls for the task is only
+tried if its tier is the lowest eligible one, or at most one above the lowest
+tier already measured, cheapest (by catalog price) first. Slower top-tier
+models are not tried just because they have no numbers yet.
+"""
+
+import math
+import sqlite3
+import threading
+import time
+from collections import defaultdict, deque
+from typing import Any, Deque, Dict, Iterable, List, Optional, Tuple
+
+# Quality tiers of the recommended models, 1 (basic) to 4 (best)
+MODEL_QUALITY = {
+    "openai/gpt-3.5-turbo": 1,
+    "openai/gpt-4o-mini": 2,
+    "anthropic/claude-3.5-sonnet": 3,
+    "anthropic/claude-3.5-sonnet:thinking": 4,
+    "anthropic/claude-3-opus": 4,
+}
+QUALITY_LABELS = {1: "Basic", 2: "Good", 3: "Strong", 4: "Best"}
+
+# Task types and the sidebar setting ("analysis" or "generation") whose floor applies
+TASK_SETTINGS = {
+    "job_extraction": "analysis",
+    "job_requirements": "analysis",
+    "profile_extraction": "analysis",
+    "cover_letter": "generation",
+    "resume_bullets": "generation",
+}
+DEFAULT_QUALITY_FLOORS = {"analysis": 2, "generation": 3}
+
+# Observations per model before its numbers are trusted over trying it
+MIN_SAMPLES = 3
+
+
+def percentile(values: List[float], pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+class ModelStats:
+    """Recent call outcomes per model and task, kept in memory and persisted to SQLite.
+
+    Only the last ``window`` calls of each (model, task) pair count, so the
+    numbers follow a model that gets faster or slower. Calls recorded without
+    a task are kept under "". Thread-safe.
+    """
+
+    def __init__(self, path: str = "model_stats.sqlite3", window: int = 30):
+        self.path = path
+        self.window = window
+        self._calls: Dict[Tuple[str, str], Deque[Tuple[float, Optional[float], bool]]] = defaultdict(
+            lambda: deque(maxlen=window)
+        )
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        if path != ":memory:":
+            self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS calls (
+                model TEXT NOT NULL,
+                seconds REAL NOT NULL,
+                tokens_per_second REAL,
+                ok INTEGER NOT NULL,
+                called_at REAL NOT NULL,
+                task TEXT NOT NULL DEFAULT ''
+            )
+        """)
+        # Databases written before timings were split by task lack the column
+        columns = [row[1] for row in self._conn.execute("PRAGMA table_info(calls)")]
+        if "task" not in columns:
+            self._conn.execute("ALTER TABLE calls ADD COLUMN task TEXT NOT NULL DEFAULT ''")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_calls_model_task ON calls (model, task, called_at)")
+        for model, task, seconds, tokens_per_second, ok in self._conn.execute(
+            "SELECT model, task, seconds, tokens_per_second, ok FROM calls ORDER BY called_at"
+        ):
+            self._calls[(model, task)].append((seconds, tokens_per_second, bool(ok)))
+
+    def record(
+        self,
+        model: str,
+        seconds: float,
+        completion_tokens: Optional[int] = None,
+        ok: bool = True,
+        task: Optional[str] = None
+    ) -> None:
+        """Record one chat completion: wall time, output tokens (if known), whether it succeeded and its task type"""
+        tokens_per_second = completion_tokens / seconds if ok and completion_tokens and seconds > 0 else None
+        task = task or ""
+        with self._lock:
+            calls = self._calls[(model, task)]
+            calls.append((seconds, tokens_per_second, ok))
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.execute(
+                    "INSERT INTO calls (model, task, seconds, tokens_per_second, ok, called_at) VALUES (?, ?, ?, ?, ?, ?)",
+                    (model, task, seconds, tokens_per_second, int(ok), time.time())
+                )
+                # Rows beyond the window are no longer used
+                if len(calls) == self.window:
+                    self._conn.execute(
+                        "DELETE FROM calls WHERE model = ? AND task = ? AND rowid NOT IN "
+                        "(SELECT rowid FROM calls WHERE model = ? AND task = ? ORDER BY called_at DESC LIMIT ?)",
+                        (model, task, model, task, self.window)
+                    )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def summary(self, model: str, task: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """Call count, p50/p95 latency of successful calls, tokens per second and failure rate; None if never called.
+
+        With a task, only that task's calls count; without one, all of the model's calls are pooled.
+        """
+        with self._lock:
+            if task is None:
+                calls = [call for (called, _), history in self._calls.items() if called == model for call in history]
+            else:
+                calls = list(self._calls.get((model, task), ()))
+        if not calls:
+            return None
+        latencies = [seconds for seconds, _, ok in calls if ok]
+        rates = [rate for _, rate, ok in calls if ok and rate]
+        return {
+            "calls": len(calls),
+            "p50": percentile(latencies, 50) if latencies else None,
+            "p95": percentile(latencies, 95) if latencies else None,
+            "tokens_per_second": percentile(rates, 50) if rates else None,
+            "failure_rate": 1 - len(latencies) / len(calls),
+        }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM calls")
+            self._calls.clear()
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+def price_per_token(model_info: Optional[Dict[str, Any]]) -> float:
+    """Prompt plus completion price per token from a catalog entry; infinite if unknown"""
+    pricing = (model_info or {}).get("pricing") or {}
+    try:
+        return float(pricing["prompt"]) + float(pricing["completion"])
+    except (KeyError, TypeError, ValueError):
+        return math.inf
+
+
+class ModelRouter:
+    """Picks a model per task type from observed timings and catalog prices.
+
+    Candidates are the models in ``quality`` (model id -> tier). For a task,
+    models below the floor of the task's setting are excluded; the rest are
+    ranked by expected latency for that task (p50 divided by the success
+    rate, since a failed call has to be repeated) or by price per token.
+    """
+
+    def __init__(
+        self,
+        stats: ModelStats,
+        quality: Optional[Dict[str, int]] = None,
+        floors: Optional[Dict[str, int]] = None
+    ):
+        self.stats = stats
+        self.quality = dict(quality or MODEL_QUALITY)
+        self.floors = dict(DEFAULT_QUALITY_FLOORS, **(floors or {}))
+
+    def floor_for(self, task: str) -> int:
+        return self.floors[TASK_SETTINGS.get(task, "analysis")]
+
+    def candidates(self, task: str) -> List[str]:
+        """Models whose quality meets the task's floor, lowest tier first (so untried cheap models are tried first)"""
+        floor = self.floor_for(task)
+        eligible = [model for model, tier in self.quality.items() if tier >= floor]
+        if not eligible:
+            # A floor above every tier means "the best there is"
+            best = max(self.quality.values())
+            eligible = [model for model, tier in self.quality.items() if tier == best]
+        return sorted(eligible, key=lambda model: self.quality[model])
+
+    def expected_latency(self, model: str, task: str) -> Optional[float]:
+        """p50 latency on task inflated by the failure rate, or None until MIN_SAMPLES calls are recorded"""
+        summary = self.stats.summary(model, task)
+        if summary is None or summary["calls"] < MIN_SAMPLES:
+            return None
+        if summary["p50"] is None:
+            return math.inf
+        return summary["p50"] / max(1 - summary["failure_rate"], 0.05)
+
+    def pick(self, task: str, objective: str = "fastest", catalog: Iterable[Dict[str, Any]] = ()) -> str:
+        """The model to use for task; objective is "fastest" or "cheapest" (prices from the model catalog)"""
+        candidates = self.candidates(task)
+        prices = {model.get("id"): price_per_token(model) for model in catalog}
+        latencies = {model: self.expected_latency(model, task) for model in candidates}
+        if objective == "cheapest":
+            # Ties (e.g. unknown prices) go to the faster model
+            return min(candidates, key=lambda model: (
+                prices.get(model, math.inf), self._latency_or_inf(latencies[model]), self.quality[model]
+            ))
+
+        measured = [model for model in candidates if latencies[model] is not None]
+        explore_up_to = min(self.quality[model] for model in measured) + 1 if measured else self.quality[candidates[0]]
+        untried = [
+            model for model in candidates
+            if latencies[model] is None and self.quality[model] <= explore_up_to
+        ]
+        if untried:
+            # Unknown prices fall back to the lower tier
+            return min(untried, key=lambda model: (prices.get(model, math.inf), self.quality[model]))
+        return min(measured, key=lambda model: latencies[model])
+
+    @staticmethod
+    def _latency_or_inf(latency: Optional[float]) -> float:
+        return math.inf if latency is None else latency
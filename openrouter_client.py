@@ -2,31 +2,517 @@
 # This file contains functions to connect to OpenRouter's API
 
 import requests
+from requests.adapters import HTTPAdapter
+import asyncio
+import functools
+import gzip
+import hashlib
 import json
 import os
-from typing import Dict, List, Any, Optional
+import random
+import sqlite3
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from email.utils import parsedate_to_datetime
+from typing import AsyncIterator, Awaitable, Callable, Dict, Iterable, Iterator, List, Any, Optional, Tuple
+
+class ModelCatalogCache:
+    """TTL-bounded cache of the OpenRouter model catalog, shared across sessions.
+
+    Entries are keyed by API base URL. A stale entry is still served while a
+    single background thread refreshes it, unless it is older than ``max_stale``
+    in which case the refresh happens synchronously. When ``persist_path`` is
+    set, the catalog is written to disk so a restarted server starts warm.
+    """
+
+    def __init__(self, ttl: float = 3600, max_stale: float = 86400, persist_path: Optional[str] = None):
+        self.ttl = ttl
+        self.max_stale = max_stale
+        self.persist_path = persist_path
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._refreshing = set()
+        self._lock = threading.Lock()
+        self._load_from_disk()
+
+    def get(self, key: str, fetch: Callable[[], List[Dict[str, Any]]], force_refresh: bool = False) -> List[Dict[str, Any]]:
+        """Return the cached catalog for key, fetching or refreshing it as needed"""
+        with self._lock:
+            entry = self._entries.get(key)
+
+        if entry is not None and not force_refresh:
+            age = time.time() - entry["fetched_at"]
+            if age < self.ttl:
+                return entry["models"]
+            if age < self.max_stale:
+                self.refresh_in_background(key, fetch)
+                return entry["models"]
+
+        return self._refresh(key, fetch)
+
+    def refresh_in_background(self, key: str, fetch: Callable[[], List[Dict[str, Any]]]) -> bool:
+        """Start a background refresh for key unless one is already running"""
+        with self._lock:
+            if key in self._refreshing:
+                return False
+            self._refreshing.add(key)
+
+        def worker():
+            try:
+                self._refresh(key, fetch)
+            except Exception:
+                # Keep serving the stale catalog; the next call will retry
+                pass
+            finally:
+                with self._lock:
+                    self._refreshing.discard(key)
+
+        threading.Thread(target=worker, name="model-catalog-refresh", daemon=True).start()
+        return True
+
+    def peek(self, key: str) -> Optional[List[Dict[str, Any]]]:
+        """The cached catalog for key, however old, without fetching; None if there is none"""
+        with self._lock:
+            entry = self._entries.get(key)
+        return entry["models"] if entry is not None else None
+
+    def invalidate(self, key: Optional[str] = None) -> None:
+        """Drop one cached catalog, or all of them when no key is given"""
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+            self._save_to_disk()
+
+    def _refresh(self, key: str, fetch: Callable[[], List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+        models = fetch()
+        with self._lock:
+            self._entries[key] = {"fetched_at": time.time(), "models": models}
+            self._save_to_disk()
+        return models
+
+    def _load_from_disk(self) -> None:
+        if not self.persist_path or not os.path.exists(self.persist_path):
+            return
+        try:
+            with open(self.persist_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if isinstance(data, dict):
+                self._entries = {
+                    k: v for k, v in data.items()
+                    if isinstance(v, dict) and "fetched_at" in v and "models" in v
+                }
+        except (OSError, ValueError):
+            # A corrupt cache file is treated as a cold start
+            self._entries = {}
+
+    def _save_to_disk(self) -> None:
+        # Caller must hold self._lock
+        if not self.persist_path:
+            return
+        try:
+            directory = os.path.dirname(os.path.abspath(self.persist_path))
+            os.makedirs(directory, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(self._entries, f)
+            os.replace(tmp_path, self.persist_path)
+        except OSError:
+            pass
+
+
+# Shared by every OpenRouterClient in this process, so all Streamlit sessions
+# reuse the same catalog. Set OPENROUTER_MODEL_CACHE to a file path to persist it.
+model_catalog_cache = ModelCatalogCache(
+    ttl=float(os.environ.get("OPENROUTER_MODEL_CACHE_TTL", 3600)),
+    persist_path=os.environ.get("OPENROUTER_MODEL_CACHE") or None,
+)
+
+class ResponseCache:
+    """Content-addressed SQLite cache of chat completion responses.
+    
+    Responses are keyed by the SHA-256 of the canonicalised request payload
+    (model, messages, temperature, ...). Entries older than ``max_age`` seconds
+    expire, and once the stored responses exceed ``max_bytes`` the least
+    recently used ones are evicted.
+    """
+    
+    def __init__(self, path: str = "llm_response_cache.sqlite3", max_bytes: int = 50 * 1024 * 1024, max_age: float = 7 * 86400):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        if path != ":memory:":
+            self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                response TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                last_access REAL NOT NULL
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_responses_last_access ON responses (last_access)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_responses_created_at ON responses (created_at)")
+    
+    @staticmethod
+    def make_key(payload: Dict[str, Any]) -> str:
+        """Hash a request payload; key order and whitespace don't affect the result"""
+        canonical = json.dumps(payload, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+    
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return the cached response for key, or None on a miss"""
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT response, created_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None or now - row[1] > self.max_age:
+                self.misses += 1
+                return None
+            self._conn.execute("UPDATE responses SET last_access = ? WHERE key = ?", (now, key))
+            self.hits += 1
+        return json.loads(row[0])
+    
+    def put(self, key: str, response: Dict[str, Any]) -> None:
+        """Store a response and evict expired or least recently used entries"""
+        data = json.dumps(response, separators=(",", ":"))
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO responses (key, response, size, created_at, last_access) VALUES (?, ?, ?, ?, ?)",
+                    (key, data, len(data), now, now)
+                )
+                self._evict(now)
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+    
+    def _evict(self, now: float) -> None:
+        # Caller must hold self._lock inside a transaction
+        self._conn.execute("DELETE FROM responses WHERE created_at < ?", (now - self.max_age,))
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        freed = 0
+        stale_keys = []
+        for key, size in self._conn.execute("SELECT key, size FROM responses ORDER BY last_access"):
+            if total - freed <= self.max_bytes:
+                break
+            stale_keys.append((key,))
+            freed += size
+        self._conn.executemany("DELETE FROM responses WHERE key = ?", stale_keys)
+    
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters and current size of the cache"""
+        with self._lock:
+            entries, size = self._conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses").fetchone()
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "entries": entries,
+            "bytes": size,
+        }
+    
+    def clear(self) -> None:
+        """Remove every cached response and reset the counters"""
+        with self._lock:
+            self._conn.execute("DELETE FROM responses")
+            self.hits = 0
+            self.misses = 0
+    
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class CassetteMissError(Exception):
+    """Raised in replay mode when a request has no recorded interaction"""
+
+
+class Cassette:
+    """Record/replay store of OpenRouter interactions for offline runs.
+    
+    In ``record`` mode every request the client sends over the network is
+    appended to a JSON-lines file (gzip-compressed if the path ends in .gz)
+    together with its response, wall time and, for streams, the time offset of
+    each text delta. In ``replay`` mode the same requests are answered from the
+    file without touching the network, with the recorded timings when
+    ``realtime`` is set or instantly otherwise.
+    
+    Requests are matched by the SHA-256 of their payload, ignoring ``stream``,
+    so a recorded stream can answer a non-streamed request and vice versa.
+    Repeats of one request are replayed in recorded order, and the last
+    recording is reused once they run out. Prompts are not stored, only their
+    hash. Responses served by the ResponseCache never reach the network, so
+    they are not recorded.
+    """
+    
+    MODES = ("record", "replay")
+    
+    def __init__(self, path: str, mode: str = "replay", realtime: bool = True):
+        if mode not in self.MODES:
+            raise ValueError(f"Cassette mode must be one of {self.MODES}, got {mode!r}")
+        self.path = path
+        self.mode = mode
+        self.realtime = realtime
+        self._lock = threading.Lock()
+        self._interactions: Dict[str, List[Dict[str, Any]]] = {}
+        self._positions: Dict[str, int] = {}
+        if mode == "replay":
+            self._load()
+    
+    @property
+    def replaying(self) -> bool:
+        return self.mode == "replay"
+    
+    @staticmethod
+    def make_key(method: str, path: str, payload: Optional[Dict[str, Any]] = None) -> str:
+        request = {"method": method, "path": path, "payload": {k: v for k, v in (payload or {}).items() if k != "stream"}}
+        return ResponseCache.make_key(request)
+    
+    def _open(self, mode: str):
+        if self.path.endswith(".gz"):
+            return gzip.open(self.path, mode + "t", encoding="utf-8")
+        return open(self.path, mode, encoding="utf-8")
+    
+    def _load(self) -> None:
+        with self._open("r") as f:
+            for line in f:
+                if line.strip():
+                    interaction = json.loads(line)
+                    self._interactions.setdefault(interaction["key"], []).append(interaction)
+    
+    def _append(self, interaction: Dict[str, Any]) -> None:
+        line = json.dumps(interaction, separators=(",", ":"), ensure_ascii=False)
+        with self._lock:
+            with self._open("a") as f:
+                f.write(line + "\n")
+    
+    def _next(self, method: str, path: str, payload: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        key = self.make_key(method, path, payload)
+        with self._lock:
+            recorded = self._interactions.get(key)
+            if not recorded:
+                model = (payload or {}).get("model")
+                raise CassetteMissError(f"No recorded response for {method} {path}" + (f" ({model})" if model else ""))
+            position = self._positions.get(key, 0)
+            self._positions[key] = position + 1
+            return recorded[min(position, len(recorded) - 1)]
+    
+    def record_response(self, method: str, path: str, payload: Optional[Dict[str, Any]], response: Any, elapsed: float) -> None:
+        """Store a complete (non-streamed) response"""
+        self._append({
+            "key": self.make_key(method, path, payload),
+            "method": method,
+            "path": path,
+            "model": (payload or {}).get("model"),
+            "elapsed": round(elapsed, 4),
+            "response": response,
+        })
+    
+    def record_stream(self, payload: Dict[str, Any], chunks: List[Tuple[float, Dict[str, Any]]], elapsed: float) -> None:
+        """Store a streamed completion as timed text deltas plus its aggregate"""
+        result = aggregate_chat_stream(chunk for _, chunk in chunks)
+        deltas = []
+        for offset, chunk in chunks:
+            text = "".join((choice.get("delta") or {}).get("content") or "" for choice in chunk.get("choices", []))
+            if text:
+                deltas.append([round(offset, 4), text])
+        self._append({
+            "key": self.make_key("POST", "/chat/completions", payload),
+            "method": "POST",
+            "path": "/chat/completions",
+            "model": payload.get("model"),
+            "elapsed": round(elapsed, 4),
+            "response": result,
+            "deltas": deltas,
+        })
+    
+    def replay_response(self, method: str, path: str, payload: Optional[Dict[str, Any]] = None) -> Any:
+        """Return the recorded response for a request, after its recorded wall time if realtime"""
+        interaction = self._next(method, path, payload)
+        if self.realtime:
+            time.sleep(interaction.get("elapsed", 0))
+        return interaction["response"]
+    
+    def replay_stream(self, payload: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+        """Yield stream chunks for a recorded completion, paced like the original if realtime"""
+        interaction = self._next("POST", "/chat/completions", payload)
+        response = interaction["response"]
+        choice = response["choices"][0]
+        deltas = interaction.get("deltas")
+        if deltas is None:
+            # Recorded without streaming: deliver the whole answer as one delta
+            deltas = [[interaction.get("elapsed", 0), choice["message"]["content"]]]
+        
+        start = time.monotonic()
+        for i, (offset, text) in enumerate(deltas):
+            if self.realtime:
+                time.sleep(max(0.0, offset - (time.monotonic() - start)))
+            delta = {"role": choice["message"].get("role", "assistant"), "content": text} if i == 0 else {"content": text}
+            yield {"id": response.get("id"), "model": response.get("model"), "choices": [{"index": 0, "delta": delta, "finish_reason": None}]}
+        if self.realtime:
+            time.sleep(max(0.0, interaction.get("elapsed", 0) - (time.monotonic() - start)))
+        yield {
+            "id": response.get("id"),
+            "model": response.get("model"),
+            "choices": [{"index": 0, "delta": {}, "finish_reason": choice.get("finish_reason")}],
+            "usage": response.get("usage"),
+        }
+
+
+# Status codes worth retrying: rate limiting and transient upstream failures
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a Retry-After header (delta-seconds or HTTP date) into seconds"""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError, IndexError, OverflowError):
+        return None
 
 class OpenRouterClient:
     """Client for accessing OpenRouter API with OpenAI-compatible interface"""
     
-    def __init__(self, api_key: str):
+    def __init__(
+        self,
+        api_key: str,
+        model_cache: Optional[ModelCatalogCache] = None,
+        base_url: str = "https://openrouter.ai/api/v1",
+        pool_size: int = 10,
+        connect_timeout: float = 5.0,
+        read_timeout: float = 120.0,
+        max_retries: int = 3,
+        backoff_factor: float = 0.5,
+        max_backoff: float = 30.0,
+        response_cache: Optional[ResponseCache] = None,
+        cassette: Optional[Cassette] = None,
+        model_stats: Optional[Any] = None
+    ):
         self.api_key = api_key
-        self.base_url = "https://openrouter.ai/api/v1"
+        self.base_url = base_url.rstrip("/")
+        self.model_cache = model_cache if model_cache is not None else model_catalog_cache
+        # Opt-in: responses are only cached when a ResponseCache is supplied
+        self.response_cache = response_cache
+        # Opt-in: record network traffic to, or replay it from, a cassette file
+        self.cassette = cassette
+        # Opt-in: an object with record(model, seconds, completion_tokens, ok, task)
+        # (e.g. model_router.ModelStats) told about every completion request
+        self.model_stats = model_stats
         self.headers = {
             "Authorization": f"Bearer {api_key}",
             "Content-Type": "application/json",
             "HTTP-Referer": "Smart Job Application Assistant",  # Identify app to OpenRouter
         }
+        self.timeout: Tuple[float, float] = (connect_timeout, read_timeout)
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        
+        # Keep-alive connection pool owned by this client, so sequential calls
+        # reuse one TCP+TLS connection instead of handshaking every time
+        self.session = requests.Session()
+        self.session.headers.update(self.headers)
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
     
-    def list_models(self) -> List[Dict[str, Any]]:
-        """List available models from OpenRouter"""
-        response = requests.get(
-            f"{self.base_url}/models",
-            headers=self.headers
-        )
+    def close(self) -> None:
+        """Close pooled connections"""
+        self.session.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
+    
+    def _backoff_delay(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        """Delay before retry number `attempt`: Retry-After if given, else full-jitter exponential backoff"""
+        if retry_after is not None:
+            return min(retry_after, self.max_backoff)
+        return random.uniform(0, min(self.max_backoff, self.backoff_factor * (2 ** attempt)))
+    
+    def _request(self, method: str, path: str, **kwargs) -> requests.Response:
+        """Send a request over the pooled session, retrying 429/5xx and connection failures"""
+        kwargs.setdefault("timeout", self.timeout)
+        url = f"{self.base_url}{path}"
+        attempt = 0
+        
+        while True:
+            try:
+                response = self.session.request(method, url, **kwargs)
+            except requests.exceptions.ConnectionError:
+                # Read timeouts are not retried: the request may already be billed
+                if attempt >= self.max_retries:
+                    raise
+                time.sleep(self._backoff_delay(attempt))
+                attempt += 1
+                continue
+            
+            if response.status_code not in RETRY_STATUS_CODES or attempt >= self.max_retries:
+                return response
+            
+            retry_after = parse_retry_after(response.headers.get("Retry-After"))
+            response.close()
+            time.sleep(self._backoff_delay(attempt, retry_after))
+            attempt += 1
+    
+    def check_key(self) -> Dict[str, Any]:
+        """Details of this client's API key (label, usage, limit); raises if OpenRouter rejects the key.
+        
+        Never cached: list_models is answered from a catalog shared by every
+        client, so it can't tell whether this key works.
+        """
+        if self.cassette is not None and self.cassette.replaying:
+            # Replay never calls OpenRouter, so there is no key to check
+            return {}
+        
+        response = self._request("GET", "/key")
+        if response.status_code == 200:
+            return response.json().get("data") or {}
+        if response.status_code in (401, 403):
+            raise Exception("Invalid OpenRouter API key")
+        raise Exception(f"Error checking API key: {response.text}")
+    
+    def list_models(self, use_cache: bool = True, force_refresh: bool = False) -> List[Dict[str, Any]]:
+        """List available models from OpenRouter, served from the shared catalog cache"""
+        if not use_cache:
+            return self._fetch_models()
+        return self.model_cache.get(self.base_url, self._fetch_models, force_refresh=force_refresh)
+
+    def _fetch_models(self) -> List[Dict[str, Any]]:
+        if self.cassette is not None and self.cassette.replaying:
+            return self.cassette.replay_response("GET", "/models")["data"]
+        
+        start = time.monotonic()
+        response = self._request("GET", "/models")
         
         if response.status_code == 200:
-            return response.json()["data"]
+            data = response.json()
+            if self.cassette is not None:
+                self.cassette.record_response("GET", "/models", None, data, time.monotonic() - start)
+            return data["data"]
         else:
             raise Exception(f"Error fetching models: {response.text}")
     
@@ -36,10 +522,129 @@ class OpenRouterClient:
         messages: List[Dict[str, str]], 
         temperature: float = 0.7,
         max_tokens: Optional[int] = None,
-        stream: bool = False
+        stream: bool = False,
+        on_token: Optional[Callable[[str], None]] = None,
+        use_cache: bool = True,
+        response_format: Optional[Dict[str, Any]] = None,
+        task: Optional[str] = None
     ) -> Dict[str, Any]:
-        """Create a chat completion using OpenRouter API"""
+        """Create a chat completion using OpenRouter API.
         
+        With stream=True the completion is streamed over SSE and on_token is
+        called with each text delta as it arrives; the aggregated result has the
+        same shape as a non-streamed response, including the usage block.
+        
+        response_format is an OpenAI-style response_format or a bare JSON
+        schema; see structured_output_params for how it is adapted to what the
+        model supports.
+        
+        If the client has a response_cache, identical requests are answered from
+        it; pass use_cache=False to force a fresh completion.
+        
+        task names the kind of call (e.g. "job_extraction") in the timings
+        reported to model_stats; it is not sent to OpenRouter.
+        """
+        payload = self._build_payload(model, messages, temperature, max_tokens, response_format)
+        cache_key, cached = self._cache_lookup(payload, use_cache)
+        if cached is not None:
+            if on_token is not None:
+                on_token(cached["choices"][0]["message"]["content"])
+            return cached
+        
+        if stream:
+            result = aggregate_chat_stream(self._stream_payload(payload, task), on_token=on_token)
+        else:
+            result = self._complete_payload(payload, task)
+        
+        self._cache_store(cache_key, result)
+        return result
+    
+    def stream_chat_completion(
+        self,
+        model: str,
+        messages: List[Dict[str, str]],
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None,
+        response_format: Optional[Dict[str, Any]] = None,
+        task: Optional[str] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """Stream a chat completion, yielding each parsed SSE chunk as it arrives"""
+        return self._stream_payload(self._build_payload(model, messages, temperature, max_tokens, response_format), task)
+    
+    def _complete_payload(self, payload: Dict[str, Any], task: Optional[str] = None) -> Dict[str, Any]:
+        if self.cassette is not None and self.cassette.replaying:
+            return self.cassette.replay_response("POST", "/chat/completions", payload)
+        
+        start = time.monotonic()
+        try:
+            response = self._request("POST", "/chat/completions", json=payload)
+            if response.status_code != 200:
+                raise Exception(f"Error generating completion: {response.text}")
+            result = response.json()
+        except Exception:
+            self._record_call(payload, start, None, task, ok=False)
+            raise
+        self._record_call(payload, start, result, task)
+        if self.cassette is not None:
+            self.cassette.record_response("POST", "/chat/completions", payload, result, time.monotonic() - start)
+        return result
+    
+    def _record_call(
+        self,
+        payload: Dict[str, Any],
+        start: float,
+        result: Optional[Dict[str, Any]],
+        task: Optional[str] = None,
+        ok: bool = True
+    ) -> None:
+        if self.model_stats is None:
+            return
+        usage = (result or {}).get("usage") or {}
+        self.model_stats.record(payload["model"], time.monotonic() - start, usage.get("completion_tokens"), ok, task)
+    
+    def _stream_payload(self, payload: Dict[str, Any], task: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+        payload = dict(payload, stream=True)
+        if self.cassette is not None and self.cassette.replaying:
+            yield from self.cassette.replay_stream(payload)
+            return
+        
+        start = time.monotonic()
+        try:
+            response = self._request("POST", "/chat/completions", json=payload, stream=True)
+        except Exception:
+            self._record_call(payload, start, None, task, ok=False)
+            raise
+        if response.status_code != 200:
+            self._record_call(payload, start, None, task, ok=False)
+            try:
+                raise Exception(f"Error generating completion: {response.text}")
+            finally:
+                response.close()
+        
+        # Only streams read to the end are recorded
+        timeline: List[Tuple[float, Dict[str, Any]]] = []
+        usage = None
+        with response:
+            for chunk in iter_sse_events(response.iter_lines()):
+                if "error" in chunk:
+                    self._record_call(payload, start, None, task, ok=False)
+                    raise Exception(f"Error generating completion: {json.dumps(chunk['error'])}")
+                usage = chunk.get("usage") or usage
+                if self.cassette is not None:
+                    timeline.append((time.monotonic() - start, chunk))
+                yield chunk
+        self._record_call(payload, start, {"usage": usage}, task)
+        if self.cassette is not None:
+            self.cassette.record_stream(payload, timeline, time.monotonic() - start)
+    
+    def _build_payload(
+        self,
+        model: str,
+        messages: List[Dict[str, str]],
+        temperature: float,
+        max_tokens: Optional[int],
+        response_format: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
         payload = {
             "model": model,
             "messages": messages,
@@ -48,24 +653,50 @@ class OpenRouterClient:
         
         if max_tokens is not None:
             payload["max_tokens"] = max_tokens
-            
-        if stream:
-            payload["stream"] = True
         
-        response = requests.post(
-            f"{self.base_url}/chat/completions",
-            headers=self.headers,
-            json=payload
-        )
+        if response_format is not None:
+            payload.update(self.structured_output_params(model, response_format))
         
-        if response.status_code == 200:
-            return response.json()
-        else:
-            raise Exception(f"Error generating completion: {response.text}")
+        return payload
+    
+    def structured_output_params(self, model: str, response_format: Dict[str, Any]) -> Dict[str, Any]:
+        """Payload fields requesting response_format from model, as far as the model supports it.
+        
+        Uses the supported_parameters of the cached model catalog (never
+        fetched here). A JSON schema is sent as is to models that support
+        structured outputs, downgraded to JSON mode for models that only
+        support response_format, and dropped for models that support neither;
+        in the first two cases the request is only routed to providers that
+        honour it. Models missing from the catalog get the schema unchanged.
+        """
+        response_format = as_response_format(response_format)
+        catalog = self.model_cache.peek(self.base_url) or []
+        info = next((m for m in catalog if m.get("id") == model), None)
+        supported = info.get("supported_parameters") if info else None
+        if supported is None:
+            return {"response_format": response_format}
+        
+        if response_format.get("type") == "json_schema" and "structured_outputs" not in supported:
+            response_format = {"type": "json_object"}
+        if "response_format" not in supported and "structured_outputs" not in supported:
+            return {}
+        return {"response_format": response_format, "provider": {"require_parameters": True}}
+    
+    def _cache_lookup(self, payload: Dict[str, Any], use_cache: bool) -> Tuple[Optional[str], Optional[Dict[str, Any]]]:
+        """Return (cache key, cached response); the key is None when caching is off"""
+        if not use_cache or self.response_cache is None:
+            return None, None
+        key = self.response_cache.make_key(payload)
+        return key, self.response_cache.get(key)
+    
+    def _cache_store(self, cache_key: Optional[str], result: Dict[str, Any]) -> None:
+        if cache_key is not None and result.get("choices"):
+            self.response_cache.put(cache_key, result)
     
     def get_top_models(self, category: str = None, limit: int = 5) -> List[Dict[str, Any]]:
         """Get top models, optionally filtered by category"""
-        models = self.list_models()
+        # Copy so sorting doesn't reorder the shared cached catalog
+        models = list(self.list_models())
         
         # Filter by category if provided
         if category:
@@ -77,7 +708,263 @@ class OpenRouterClient:
         return models[:limit]
 
 
+class AsyncOpenRouterClient:
+    """Asyncio front-end for OpenRouterClient with bounded concurrency.
+    
+    Requests run on a small worker pool over the wrapped client's keep-alive
+    session, and a semaphore caps how many are in flight at once. Streaming
+    callbacks are invoked on the event loop thread, so they can safely update
+    the Streamlit script that called asyncio.run().
+    """
+    
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        max_concurrency: int = 4,
+        sync_client: Optional[OpenRouterClient] = None,
+        **client_kwargs
+    ):
+        if sync_client is None:
+            if api_key is None:
+                raise ValueError("Either api_key or sync_client is required")
+            client_kwargs.setdefault("pool_size", max(10, max_concurrency))
+            sync_client = OpenRouterClient(api_key, **client_kwargs)
+            self._owns_client = True
+        else:
+            self._owns_client = False
+        self.client = sync_client
+        self.max_concurrency = max_concurrency
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix="openrouter")
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._semaphore_loop = None
+    
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        # Semaphores are bound to one event loop; each asyncio.run() gets its own
+        loop = asyncio.get_running_loop()
+        if self._semaphore is None or self._semaphore_loop is not loop:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._semaphore_loop = loop
+        return self._semaphore
+    
+    async def _run(self, fn: Callable, *args, **kwargs):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, functools.partial(fn, *args, **kwargs))
+    
+    async def list_models(self, **kwargs) -> List[Dict[str, Any]]:
+        """List available models from OpenRouter"""
+        async with self._get_semaphore():
+            return await self._run(self.client.list_models, **kwargs)
+    
+    async def chat_completion(
+        self,
+        model: str,
+        messages: List[Dict[str, str]],
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None,
+        stream: bool = False,
+        on_token: Optional[Callable[[str], None]] = None,
+        use_cache: bool = True,
+        response_format: Optional[Dict[str, Any]] = None,
+        task: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Create a chat completion; see OpenRouterClient.chat_completion"""
+        if stream:
+            payload = self.client._build_payload(model, messages, temperature, max_tokens, response_format)
+            cache_key, cached = await self._run(self.client._cache_lookup, payload, use_cache)
+            if cached is not None:
+                if on_token is not None:
+                    on_token(cached["choices"][0]["message"]["content"])
+                return cached
+            chunks = self.stream_chat_completion(
+                model, messages, temperature=temperature, max_tokens=max_tokens, response_format=response_format,
+                task=task
+            )
+            result = await aggregate_chat_stream_async(chunks, on_token=on_token)
+            await self._run(self.client._cache_store, cache_key, result)
+            return result
+        
+        async with self._get_semaphore():
+            return await self._run(
+                self.client.chat_completion, model, messages,
+                temperature=temperature, max_tokens=max_tokens, use_cache=use_cache, response_format=response_format,
+                task=task
+            )
+    
+    async def stream_chat_completion(
+        self,
+        model: str,
+        messages: List[Dict[str, str]],
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None,
+        response_format: Optional[Dict[str, Any]] = None,
+        task: Optional[str] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Stream a chat completion, yielding each parsed SSE chunk as it arrives"""
+        _end = object()
+        async with self._get_semaphore():
+            chunks = self.client.stream_chat_completion(
+                model, messages, temperature=temperature, max_tokens=max_tokens, response_format=response_format,
+                task=task
+            )
+            try:
+                while True:
+                    chunk = await self._run(next, chunks, _end)
+                    if chunk is _end:
+                        break
+                    yield chunk
+            finally:
+                await self._run(chunks.close)
+    
+    async def gather(self, *calls: Awaitable) -> List[Any]:
+        """Await independent calls concurrently, returning results in order"""
+        return list(await asyncio.gather(*calls))
+    
+    def close(self) -> None:
+        """Shut down the worker pool (and the wrapped client if this instance created it)"""
+        self._executor.shutdown(wait=False)
+        if self._owns_client:
+            self.client.close()
+    
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, *exc_info):
+        self.close()
+
+
 # Helper functions
+def iter_sse_events(lines: Iterable[bytes]) -> Iterator[Dict[str, Any]]:
+    """Parse server-sent event lines into JSON payloads, stopping at [DONE].
+    
+    Comment lines (OpenRouter sends ": OPENROUTER PROCESSING" keep-alives) and
+    events without a data field are skipped.
+    """
+    data_lines: List[str] = []
+    done = False
+    for raw in lines:
+        if done:
+            # Keep reading to the end of the body so the connection can go back to the pool
+            continue
+        line = raw.decode("utf-8") if isinstance(raw, bytes) else raw
+        if not line:
+            # Blank line terminates an event
+            if data_lines:
+                data = "\n".join(data_lines)
+                data_lines = []
+                if data.strip() == "[DONE]":
+                    done = True
+                    continue
+                yield json.loads(data)
+            continue
+        if line.startswith(":"):
+            continue
+        if line.startswith("data:"):
+            data_lines.append(line[5:].lstrip(" "))
+    
+    if data_lines and not done:
+        data = "\n".join(data_lines)
+        if data.strip() != "[DONE]":
+            yield json.loads(data)
+
+def aggregate_chat_stream(
+    chunks: Iterable[Dict[str, Any]],
+    on_token: Optional[Callable[[str], None]] = None
+) -> Dict[str, Any]:
+    """Fold streamed chunks into a regular chat completion response.
+    
+    Calls on_token with every non-empty content delta. The usage block, which
+    OpenRouter sends on the final chunk, is preserved.
+    """
+    parts: List[str] = []
+    result: Dict[str, Any] = {"id": None, "model": None, "usage": None}
+    finish_reason = None
+    role = "assistant"
+    
+    for chunk in chunks:
+        result["id"] = chunk.get("id", result["id"])
+        result["model"] = chunk.get("model", result["model"])
+        if chunk.get("usage"):
+            result["usage"] = chunk["usage"]
+        
+        for choice in chunk.get("choices", []):
+            delta = choice.get("delta") or {}
+            role = delta.get("role", role)
+            text = delta.get("content")
+            if text:
+                parts.append(text)
+                if on_token is not None:
+                    on_token(text)
+            if choice.get("finish_reason"):
+                finish_reason = choice["finish_reason"]
+    
+    result["choices"] = [{
+        "index": 0,
+        "message": {"role": role, "content": "".join(parts)},
+        "finish_reason": finish_reason,
+    }]
+    return result
+
+async def aggregate_chat_stream_async(
+    chunks: AsyncIterator[Dict[str, Any]],
+    on_token: Optional[Callable[[str], None]] = None
+) -> Dict[str, Any]:
+    """Async counterpart of aggregate_chat_stream"""
+    collected = []
+    async for chunk in chunks:
+        collected.append(chunk)
+        if on_token is not None:
+            for choice in chunk.get("choices", []):
+                text = (choice.get("delta") or {}).get("content")
+                if text:
+                    on_token(text)
+    
+    return aggregate_chat_stream(collected)
+
+def run_concurrent_completions(
+    client: OpenRouterClient,
+    calls: List[Dict[str, Any]],
+    max_concurrency: Optional[int] = None
+) -> List[Dict[str, Any]]:
+    """Run independent chat completions concurrently from synchronous code.
+    
+    Each entry in calls holds the keyword arguments of one chat_completion call.
+    Wall time is roughly that of the slowest call rather than the sum of all of
+    them. Results are returned in the same order as calls.
+    """
+    async_client = AsyncOpenRouterClient(sync_client=client, max_concurrency=max_concurrency or max(1, len(calls)))
+    
+    async def gather_all():
+        return await async_client.gather(*(async_client.chat_completion(**call) for call in calls))
+    
+    try:
+        return run_coroutine_sync(gather_all())
+    finally:
+        async_client.close()
+
+def run_coroutine_sync(coro: Awaitable) -> Any:
+    """Run a coroutine to completion from synchronous code.
+    
+    Uses asyncio.run() normally; if the calling thread already has a running
+    event loop, the coroutine is run on a fresh loop in a helper thread instead.
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+    
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        return executor.submit(asyncio.run, coro).result()
+
+def json_schema_format(name: str, schema: Dict[str, Any], strict: bool = True) -> Dict[str, Any]:
+    """OpenAI-style response_format asking for output that matches a JSON schema"""
+    return {"type": "json_schema", "json_schema": {"name": name, "strict": strict, "schema": schema}}
+
+def as_response_format(value: Dict[str, Any]) -> Dict[str, Any]:
+    """value if it already is a response_format, otherwise value is a JSON schema to wrap"""
+    if value.get("type") in ("json_schema", "json_object", "text"):
+        return value
+    return json_schema_format(value.get("title", "response"), value)
+
 def get_recommended_models() -> Dict[str, str]:
     """Return a curated list of recommended models for different tasks"""
     return {
@@ -0,0 +1,86 @@
+"""
+JSON schemas for the structured outputs of every extraction call.
+
+Each call passes its schema as response_format, so models that support
+structured outputs are constrained to produce exactly this shape (see
+OpenRouterClient.structured_output_params for models that don't). The
+schemas follow the strict-mode rules: every property is required, no extra
+properties are allowed, and the top level is an object. Fields a model
+can't fill come back as empty strings or lists.
+
+Responses still go through json_extraction.extract_json, which passes
+schema-conforming JSON straight to json.loads and repairs output from
+models without structured output support.
+"""
+
+from typing import Any, Dict
+
+from openrouter_client import json_schema_format
+
+
+def _object(**properties: Dict[str, Any]) -> Dict[str, Any]:
+    return {"type": "object", "properties": properties, "required": list(properties), "additionalProperties": False}
+
+
+_STRING = {"type": "string"}
+_STRINGS = {"type": "array", "items": _STRING}
+
+JOB_METADATA_SCHEMA = _object(
+    title=_STRING,
+    company=_STRING,
+    location=_STRING,
+    job_type=_STRING,
+)
+
+JOB_DETAILS_SCHEMA = _object(
+    **JOB_METADATA_SCHEMA["properties"],
+    requirements=_STRINGS,
+)
+
+# Strict mode needs an object at the top level, so the array is wrapped
+JOB_REQUIREMENTS_SCHEMA = _object(requirements=_STRINGS)
+
+# Designers' resumes lean on projects and portfolio links, so those sections are
+# kept alongside experience (strict mode drops anything not listed here)
+PROFILE_SCHEMA = _object(
+    personal_info=_object(name=_STRING, email=_STRING, phone=_STRING, location=_STRING),
+    summary=_STRING,
+    skills=_object(technical=_STRINGS, soft_skills=_STRINGS, certifications=_STRINGS),
+    experience={"type": "array", "items": _object(
+        company=_STRING,
+        position=_STRING,
+        duration=_STRING,
+        location=_STRING,
+        responsibilities=_STRINGS,
+        achievements=_STRINGS,
+    )},
+    education={"type": "array", "items": _object(
+        institution=_STRING,
+        degree=_STRING,
+        graduation_date=_STRING,
+        gpa=_STRING,
+        relevant_coursework=_STRINGS,
+    )},
+    projects={"type": "array", "items": _object(
+        title=_STRING,
+        description=_STRING,
+        technologies=_STRINGS,
+        duration=_STRING,
+        url=_STRING,
+    )},
+    languages={"type": "array", "items": _object(language=_STRING, proficiency=_STRING)},
+    # Portfolio, LinkedIn, personal site, Behance and the like
+    links={"type": "array", "items": _object(label=_STRING, url=_STRING)},
+)
+
+# Position titles are open-ended, which strict mode can't express as object
+# keys, so positions come as a list and are turned back into a map
+RESUME_BULLETS_SCHEMA = _object(
+    positions={"type": "array", "items": _object(position=_STRING, bullets=_STRINGS)},
+)
+
+JOB_METADATA_FORMAT = json_schema_format("job_metadata", JOB_METADATA_SCHEMA)
+JOB_DETAILS_FORMAT = json_schema_format("job_details", JOB_DETAILS_SCHEMA)
+JOB_REQUIREMENTS_FORMAT = json_schema_format("job_requirements", JOB_REQUIREMENTS_SCHEMA)
+PROFILE_FORMAT = json_schema_format("career_profile", PROFILE_SCHEMA)
+RESUME_BULLETS_FORMAT = json_schema_format("resume_bullets", RESUME_BULLETS_SCHEMA)
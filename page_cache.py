@@ -0,0 +1,166 @@
+"""
+On-disk cache of fetched job pages for conditional GETs.
+
+Re-checking saved postings used to download every page in full each time.
+PageCache keeps each page's ETag and Last-Modified validators, its body
+(zlib-compressed) and the job data parsed from it, in SQLite. UrlIngestor
+sends the validators as If-None-Match / If-Modified-Since, and when the
+server answers 304 Not Modified it returns the stored parse without
+downloading or parsing anything.
+
+Parses are stored with the parser's name and parsers.PARSER_VERSION, so a
+parser change re-parses the cached body instead of serving stale fields.
+"""
+
+import json
+import sqlite3
+import threading
+import time
+import zlib
+from typing import Any, Dict, NamedTuple, Optional
+
+
+class CachedPage(NamedTuple):
+    url: str
+    etag: Optional[str]
+    last_modified: Optional[str]
+    compressed_body: bytes
+    parser: Optional[str]
+    parsed: Optional[Dict[str, Any]]
+
+    @property
+    def body(self) -> bytes:
+        # Decompressed only when the stored parse can't be used
+        return zlib.decompress(self.compressed_body)
+
+    def conditional_headers(self) -> Dict[str, str]:
+        """Request headers that let the server answer 304 if the page is unchanged"""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class PageCache:
+    """SQLite store of page validators, compressed bodies and parsed job data.
+
+    Pages not checked for ``max_age`` seconds expire, and once the stored
+    bodies exceed ``max_bytes`` (compressed) the least recently checked pages
+    are evicted. Thread-safe.
+    """
+
+    def __init__(self, path: str = "job_page_cache.sqlite3", max_bytes: int = 100 * 1024 * 1024, max_age: float = 30 * 86400):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.not_modified = 0
+        self.stored = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        if path != ":memory:":
+            self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS pages (
+                url TEXT PRIMARY KEY,
+                etag TEXT,
+                last_modified TEXT,
+                body BLOB NOT NULL,
+                size INTEGER NOT NULL,
+                parser TEXT,
+                parsed TEXT,
+                fetched_at REAL NOT NULL,
+                checked_at REAL NOT NULL
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_pages_checked_at ON pages (checked_at)")
+
+    def get(self, url: str) -> Optional[CachedPage]:
+        """The cached page for url, or None if it isn't cached or has expired"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT etag, last_modified, body, parser, parsed, checked_at FROM pages WHERE url = ?", (url,)
+            ).fetchone()
+        if row is None or time.time() - row[5] > self.max_age:
+            return None
+        etag, last_modified, body, parser, parsed, _ = row
+        return CachedPage(url, etag, last_modified, body, parser, json.loads(parsed) if parsed else None)
+
+    def put(
+        self,
+        url: str,
+        body: bytes,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+        parser: Optional[str] = None,
+        parsed: Optional[Dict[str, Any]] = None
+    ) -> None:
+        """Store a freshly downloaded page (and its parse), evicting old pages if needed"""
+        compressed = zlib.compress(body, 6)
+        now = time.time()
+        with self._lock:
+            self.stored += 1
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO pages (url, etag, last_modified, body, size, parser, parsed, fetched_at, checked_at)"
+                    " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (url, etag, last_modified, compressed, len(compressed), parser,
+                     json.dumps(parsed) if parsed is not None else None, now, now)
+                )
+                self._evict(now)
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def revalidated(self, url: str, parser: Optional[str] = None, parsed: Optional[Dict[str, Any]] = None) -> None:
+        """Record a 304 for url; pass parser and parsed to replace a stale parse"""
+        now = time.time()
+        with self._lock:
+            self.not_modified += 1
+            if parser is None:
+                self._conn.execute("UPDATE pages SET checked_at = ? WHERE url = ?", (now, url))
+            else:
+                self._conn.execute(
+                    "UPDATE pages SET checked_at = ?, parser = ?, parsed = ? WHERE url = ?",
+                    (now, parser, json.dumps(parsed), url)
+                )
+
+    def _evict(self, now: float) -> None:
+        # Caller must hold self._lock inside a transaction
+        self._conn.execute("DELETE FROM pages WHERE checked_at < ?", (now - self.max_age,))
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM pages").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        freed = 0
+        stale_urls = []
+        for url, size in self._conn.execute("SELECT url, size FROM pages ORDER BY checked_at"):
+            if total - freed <= self.max_bytes:
+                break
+            stale_urls.append((url,))
+            freed += size
+        self._conn.executemany("DELETE FROM pages WHERE url = ?", stale_urls)
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters of 304s and stored downloads, and current size of the cache"""
+        with self._lock:
+            entries, size = self._conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM pages").fetchone()
+        return {
+            "not_modified": self.not_modified,
+            "stored": self.stored,
+            "entries": entries,
+            "bytes": size,
+        }
+
+    def clear(self) -> None:
+        """Remove every cached page and reset the counters"""
+        with self._lock:
+            self._conn.execute("DELETE FROM pages")
+            self.not_modified = 0
+            self.stored = 0
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
@@ -1,253 +1,165 @@
 """
 Job description parsers for different job sites.
 This module contains specialized parsers for popular job listing sites.
+
+Every parser takes the page URL and, optionally, the page's already-fetched
+HTML (content); without it the parser fetches the page itself. Concurrent
+fetching of many URLs lives in url_ingestion.py. Fields are pulled out in a
+single pass over the page by dom_extractor.extract_fields().
 """
 
 import requests
-from bs4 import BeautifulSoup
 from urllib.parse import urlparse
 
-def parse_seek_job(url):
+from dom_extractor import Rule, extract_fields, first_text, tags
+
+HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+}
+
+# Bump when parsing changes, so parses stored in the page cache are redone
+PARSER_VERSION = 2
+
+# (connect, read) timeouts in seconds for job page requests
+DEFAULT_TIMEOUT = (5, 20)
+
+def fetch_page(url, session=None, timeout=DEFAULT_TIMEOUT):
+    """
+    Fetch a job page's HTML; raises requests.HTTPError for error responses
+    """
+    response = (session or requests).get(url, headers=HEADERS, timeout=timeout)
+    response.raise_for_status()
+    return response.content
+
+def company_from_domain(url):
+    """
+    Fallback company name taken from the URL, e.g. "Acme" for jobs.acme.com
+    """
+    return urlparse(url).netloc.replace('www.', '').split('.')[0].capitalize()
+
+# Fields of each site's job pages, as rules in priority order (see dom_extractor.Rule)
+SEEK_FIELDS = {
+    "title": [Rule(tags('h1'), 'class', 'yvsb870 _14uh9944i'), Rule(tags('h1'))],
+    "company": [Rule(tags('span'), 'class', '_y1frqlc'), Rule(tags('span'), 'class', '_1tkhm9a8')],
+    "description": [
+        Rule(tags('div'), 'data-automation', 'jobAdDetails', 'equals'),
+        Rule(tags('div'), 'class', 'yvsb870 _14uh9947m'),
+    ],
+    "location": [Rule(tags('div'), 'data-automation', 'job-location', 'equals')],
+    "job_type": [Rule(tags('div'), 'data-automation', 'job-work-type', 'equals')],
+}
+
+_INDEED_COMPANY_RATING = Rule(tags('div'), 'class', 'jobsearch-InlineCompanyRating')
+_INDEED_SUBTITLE = Rule(tags('div'), 'class', 'jobsearch-JobInfoHeader-subtitle')
+_INDEED_SECTION_ITEM = Rule(tags('div'), 'class', 'jobsearch-JobDescriptionSection-sectionItem')
+
+INDEED_FIELDS = {
+    "title": [Rule(tags('h1'), 'class', 'jobsearch-JobInfoHeader-title'), Rule(tags('h1'))],
+    "company": [Rule(tags('a'), inside=_INDEED_COMPANY_RATING), Rule(tags('div'), 'class', 'icl-u-lg-mr--sm')],
+    "description": [Rule(tags('div'), 'id', 'jobDescriptionText', 'equals')],
+    # The second div inside the subtitle holds the location
+    "location": [Rule(tags('div'), inside=_INDEED_SUBTITLE, nth=1)],
+    "job_type": [Rule(tags('div'), inside=_INDEED_SECTION_ITEM)],
+}
+
+LINKEDIN_FIELDS = {
+    "title": [Rule(tags('h1'), 'class', 'top-card-layout__title'), Rule(tags('h1'))],
+    "company": [Rule(tags('a'), 'class', 'topcard__org-name-link'), Rule(tags('span'), 'class', 'topcard__flavor')],
+    "description": [Rule(tags('div'), 'class', 'show-more-less-html__markup')],
+    "location": [Rule(tags('span'), 'class', 'topcard__flavor--bullet')],
+}
+
+# Generic pages: elements whose class contains one of these words, in order of preference
+GENERIC_FIELDS = {
+    "title": [Rule(tags('h1')), Rule(tags('h2'))],
+    "company": [
+        Rule(tags('span', 'div', 'a'), 'class', word, 'contains')
+        for word in ['company', 'organization', 'employer', 'company-name']
+    ],
+    "description": [
+        Rule(tags('div', 'section'), 'class', word, 'contains')
+        for word in ['description', 'job-description', 'details', 'content', 'job_description', 'jobdescription']
+    ],
+    # Main content, used when no description element is found
+    "content": [Rule(tags('main')), Rule(tags('article')), Rule(tags('body'))],
+    "location": [
+        Rule(tags('span', 'div'), 'class', word, 'contains')
+        for word in ['location', 'job-location', 'city', 'address']
+    ],
+    "job_type": [
+        Rule(tags('span', 'div'), 'class', word, 'contains')
+        for word in ['job-type', 'employment-type', 'work-type']
+    ],
+}
+
+def parse_seek_job(url, content=None):
     """
     Parser for seek.com.au job listings
     """
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-    }
-    
-    response = requests.get(url, headers=headers)
-    soup = BeautifulSoup(response.content, 'html.parser')
-    
-    # Job title
-    try:
-        job_title = soup.find('h1', class_='yvsb870 _14uh9944i').text.strip()
-    except:
-        try:
-            job_title = soup.find('h1').text.strip()
-        except:
-            job_title = "Unknown Position"
-    
-    # Company name
-    try:
-        company = soup.find('span', class_='_y1frqlc').text.strip()
-    except:
-        try:
-            company = soup.find('span', class_='_1tkhm9a8').text.strip()
-        except:
-            company = urlparse(url).netloc.replace('www.', '').split('.')[0].capitalize()
+    if content is None:
+        content = fetch_page(url)
+    found = extract_fields(content, SEEK_FIELDS)
     
-    # Job description
-    try:
-        description_div = soup.find('div', attrs={'data-automation': 'jobAdDetails'})
-        description = description_div.text.strip() if description_div else ""
-    except:
-        description = ""
-        
-    if not description:
-        try:
-            description_div = soup.find('div', class_='yvsb870 _14uh9947m')
-            description = description_div.text.strip() if description_div else ""
-        except:
-            description = ""
-    
-    # Location
-    try:
-        location = soup.find('div', attrs={'data-automation': 'job-location'}).text.strip()
-    except:
-        location = "Unknown Location"
-        
-    # Job type
-    try:
-        job_type = soup.find('div', attrs={'data-automation': 'job-work-type'}).text.strip()
-    except:
-        job_type = "Not specified"
-        
     return {
-        "title": job_title,
-        "company": company,
-        "description": description,
-        "location": location,
-        "job_type": job_type,
+        "title": first_text(found["title"], "Unknown Position"),
+        "company": first_text(found["company"], company_from_domain(url)),
+        # The first description container is sometimes an empty placeholder
+        "description": first_text(found["description"], skip_empty=True),
+        "location": first_text(found["location"], "Unknown Location"),
+        "job_type": first_text(found["job_type"], "Not specified"),
         "url": url
     }
     
-def parse_indeed_job(url):
+def parse_indeed_job(url, content=None):
     """
     Parser for indeed.com job listings
     """
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-    }
-    
-    response = requests.get(url, headers=headers)
-    soup = BeautifulSoup(response.content, 'html.parser')
-    
-    # Job title
-    try:
-        job_title = soup.find('h1', class_='jobsearch-JobInfoHeader-title').text.strip()
-    except:
-        try:
-            job_title = soup.find('h1').text.strip()
-        except:
-            job_title = "Unknown Position"
-    
-    # Company name
-    try:
-        company = soup.find('div', class_='jobsearch-InlineCompanyRating').find('a').text.strip()
-    except:
-        try:
-            company = soup.find('div', class_='icl-u-lg-mr--sm').text.strip()
-        except:
-            company = urlparse(url).netloc.replace('www.', '').split('.')[0].capitalize()
+    if content is None:
+        content = fetch_page(url)
+    found = extract_fields(content, INDEED_FIELDS)
     
-    # Job description
-    try:
-        description_div = soup.find('div', id='jobDescriptionText')
-        description = description_div.text.strip() if description_div else ""
-    except:
-        description = ""
-    
-    # Location
-    try:
-        location = soup.find('div', class_='jobsearch-JobInfoHeader-subtitle').find_all('div')[1].text.strip()
-    except:
-        location = "Unknown Location"
-        
-    # Job type
-    try:
-        job_type = soup.find('div', class_='jobsearch-JobDescriptionSection-sectionItem').find('div').text.strip()
-    except:
-        job_type = "Not specified"
-        
     return {
-        "title": job_title,
-        "company": company,
-        "description": description,
-        "location": location,
-        "job_type": job_type,
+        "title": first_text(found["title"], "Unknown Position"),
+        "company": first_text(found["company"], company_from_domain(url)),
+        "description": first_text(found["description"]),
+        "location": first_text(found["location"], "Unknown Location"),
+        "job_type": first_text(found["job_type"], "Not specified"),
         "url": url
     }
     
-def parse_linkedin_job(url):
+def parse_linkedin_job(url, content=None):
     """
     Parser for LinkedIn job listings
     Note: LinkedIn may have protections against scraping that limit functionality
     """
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-    }
-    
-    response = requests.get(url, headers=headers)
-    soup = BeautifulSoup(response.content, 'html.parser')
-    
-    # Job title
-    try:
-        job_title = soup.find('h1', class_='top-card-layout__title').text.strip()
-    except:
-        try:
-            job_title = soup.find('h1').text.strip()
-        except:
-            job_title = "Unknown Position"
-    
-    # Company name
-    try:
-        company = soup.find('a', class_='topcard__org-name-link').text.strip()
-    except:
-        try:
-            company = soup.find('span', class_='topcard__flavor').text.strip()
-        except:
-            company = urlparse(url).netloc.replace('www.', '').split('.')[0].capitalize()
+    if content is None:
+        content = fetch_page(url)
+    found = extract_fields(content, LINKEDIN_FIELDS)
     
-    # Job description
-    try:
-        description_div = soup.find('div', class_='show-more-less-html__markup')
-        description = description_div.text.strip() if description_div else ""
-    except:
-        description = ""
-    
-    # Location
-    try:
-        location = soup.find('span', class_='topcard__flavor--bullet').text.strip()
-    except:
-        location = "Unknown Location"
-        
-    # Job type is typically within the description for LinkedIn
-    job_type = "Not specified"
-        
     return {
-        "title": job_title,
-        "company": company,
-        "description": description,
-        "location": location,
-        "job_type": job_type,
+        "title": first_text(found["title"], "Unknown Position"),
+        "company": first_text(found["company"], company_from_domain(url)),
+        "description": first_text(found["description"]),
+        "location": first_text(found["location"], "Unknown Location"),
+        # Job type is typically within the description for LinkedIn
+        "job_type": "Not specified",
         "url": url
     }
 
-def parse_generic_job(url):
+def parse_generic_job(url, content=None):
     """
     Generic parser that attempts to extract job information from any site
     """
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-    }
-    
-    response = requests.get(url, headers=headers)
-    soup = BeautifulSoup(response.content, 'html.parser')
-    
-    # Job title - typically in h1 or h2 tags
-    job_title = "Unknown Position"
-    for tag in ['h1', 'h2']:
-        if soup.find(tag):
-            job_title = soup.find(tag).text.strip()
-            break
-    
-    # Company name - look for common patterns or extract from domain
-    company = ""
-    for company_class in ['company', 'organization', 'employer', 'company-name']:
-        company_element = soup.find(['span', 'div', 'a'], class_=lambda x: x and company_class in x.lower())
-        if company_element:
-            company = company_element.text.strip()
-            break
-    
-    if not company:
-        company = urlparse(url).netloc.replace('www.', '').split('.')[0].capitalize()
-    
-    # Job description - look for content divs
-    description = ""
-    for desc_class in ['description', 'job-description', 'details', 'content', 'job_description', 'jobdescription']:
-        desc_div = soup.find(['div', 'section'], class_=lambda x: x and desc_class in x.lower())
-        if desc_div:
-            description = desc_div.text.strip()
-            break
-    
-    # If no specific div found, try to get main content
-    if not description:
-        main_content = soup.find('main') or soup.find('article') or soup.body
-        if main_content:
-            description = main_content.text.strip()
-    
-    # Location - look for location indicators
-    location = "Unknown Location"
-    for loc_class in ['location', 'job-location', 'city', 'address']:
-        loc_elem = soup.find(['span', 'div'], class_=lambda x: x and loc_class in x.lower())
-        if loc_elem:
-            location = loc_elem.text.strip()
-            break
-    
-    # Job type
-    job_type = "Not specified"
-    for type_class in ['job-type', 'employment-type', 'work-type']:
-        type_elem = soup.find(['span', 'div'], class_=lambda x: x and type_class in x.lower())
-        if type_elem:
-            job_type = type_elem.text.strip()
-            break
+    if content is None:
+        content = fetch_page(url)
+    found = extract_fields(content, GENERIC_FIELDS)
     
     return {
-        "title": job_title,
-        "company": company,
-        "description": description,
-        "location": location,
-        "job_type": job_type,
+        "title": first_text(found["title"], "Unknown Position"),
+        "company": first_text(found["company"]) or company_from_domain(url),
+        "description": first_text(found["description"]) or first_text(found["content"]),
+        "location": first_text(found["location"], "Unknown Location"),
+        "job_type": first_text(found["job_type"], "Not specified"),
         "url": url
     }
 
@@ -0,0 +1,190 @@
+"""
+Precomputed profile index for job matching.
+
+analyze_job_fit needs the same flattened view of a profile (skills,
+certifications, entry components, experience highlights) for every job it
+scores. ProfileIndex builds that view once per profile content hash and keeps
+it in a small process-wide cache, so matching one profile against many jobs
+doesn't re-walk the profile each time.
+"""
+
+import hashlib
+import json
+import re
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, FrozenSet, List, Optional
+
+from semantic_matcher import SemanticSkillMatcher
+from skill_matcher import SkillMatcher
+
+_TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9+#./-]*")
+
+
+def profile_content_hash(profile: Any) -> str:
+    """Stable SHA-256 of a profile's content; key order doesn't matter"""
+    canonical = json.dumps(profile, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def extract_profile_skills(profile: Dict[str, Any]) -> List[str]:
+    """Collect skills from every place a profile may keep them"""
+    all_skills = []
+
+    # Standard format: categorized dict or flat list
+    skills = profile.get("skills")
+    if isinstance(skills, dict):
+        for skills_list in skills.values():
+            if isinstance(skills_list, list):
+                all_skills.extend(skills_list)
+    elif isinstance(skills, list):
+        all_skills.extend(skills)
+
+    # Alternative locations
+    metadata = profile.get("professional_metadata")
+    if isinstance(metadata, dict) and isinstance(metadata.get("key_skills"), list):
+        all_skills.extend(metadata["key_skills"])
+
+    if isinstance(profile.get("certifications"), list):
+        all_skills.extend(profile["certifications"])
+
+    # Professional database entries
+    for entry in profile.get("entries", []) or []:
+        if not isinstance(entry, dict):
+            continue
+        if isinstance(entry.get("components"), list):
+            all_skills.extend(entry["components"])
+        content = entry.get("content")
+        if isinstance(content, dict) and isinstance(content.get("technologies"), list):
+            all_skills.extend(content["technologies"])
+
+    # Unique, keeping first-seen order
+    return list(dict.fromkeys(skill for skill in all_skills if isinstance(skill, str) and skill.strip()))
+
+
+def extract_experience_highlights(profile: Dict[str, Any]) -> List[str]:
+    """Collect role titles plus top responsibilities and achievements"""
+    highlights = []
+
+    # Standard format
+    experience = profile.get("experience")
+    if isinstance(experience, list):
+        for exp in experience:
+            if not isinstance(exp, dict):
+                continue
+            position = exp.get("position", "")
+            company = exp.get("company", "")
+            if position and company:
+                highlights.append(f"{position} at {company}")
+            elif position:
+                highlights.append(position)
+
+            if isinstance(exp.get("responsibilities"), list):
+                highlights.extend(exp["responsibilities"][:3])  # Limit to top 3
+            if isinstance(exp.get("achievements"), list):
+                highlights.extend(exp["achievements"][:2])  # Limit to top 2
+
+    # Professional database format
+    for entry in profile.get("entries", []) or []:
+        if not isinstance(entry, dict) or entry.get("type") != "employment":
+            continue
+        title = entry.get("title", "")
+        if " - " in title:
+            company, position = title.split(" - ", 1)
+            highlights.append(f"{position} at {company}")
+
+        content = entry.get("content")
+        if isinstance(content, dict):
+            if isinstance(content.get("responsibilities"), list):
+                highlights.extend(content["responsibilities"][:3])
+            if isinstance(content.get("achievements"), list):
+                highlights.extend(content["achievements"][:2])
+
+    return [str(item) for item in highlights if item]
+
+
+class ProfileIndex:
+    """Normalised, lookup-ready view of one profile's skills and experience"""
+
+    def __init__(self, content_hash: str, skills: List[str], experience_highlights: List[str]):
+        self.content_hash = content_hash
+        self.skills = skills
+        self.skills_lower = [skill.lower() for skill in skills]
+        self.skill_set: FrozenSet[str] = frozenset(self.skills_lower)
+        self.experience_highlights = experience_highlights
+        self.experience_text = " ".join(experience_highlights).lower()
+        self.experience_terms: FrozenSet[str] = frozenset(_TOKEN_RE.findall(self.experience_text))
+        self._matcher: Optional[SkillMatcher] = None
+        self._semantic_matcher: Optional[SemanticSkillMatcher] = None
+
+    @classmethod
+    def from_profile(cls, profile: Dict[str, Any], content_hash: Optional[str] = None) -> "ProfileIndex":
+        if content_hash is None:
+            content_hash = profile_content_hash(profile)
+        if not isinstance(profile, dict):
+            return cls(content_hash, [], [])
+        return cls(content_hash, extract_profile_skills(profile), extract_experience_highlights(profile))
+
+    @property
+    def matcher(self) -> SkillMatcher:
+        """Multi-pattern matcher over the skills, built on first use"""
+        if self._matcher is None:
+            self._matcher = SkillMatcher(self.skills_lower)
+        return self._matcher
+
+    @property
+    def semantic_matcher(self) -> SemanticSkillMatcher:
+        """NumPy n-gram similarity model over the skills, built on first use"""
+        if self._semantic_matcher is None:
+            self._semantic_matcher = SemanticSkillMatcher(self.skills)
+        return self._semantic_matcher
+
+    @property
+    def is_empty(self) -> bool:
+        return not self.skills and not self.experience_highlights
+
+    def mentions_term(self, term: str) -> bool:
+        """True if term occurs in the experience text (whole token first, then substring)"""
+        return term in self.experience_terms or term in self.experience_text
+
+
+class _ProfileIndexCache:
+    """Thread-safe LRU of ProfileIndex objects keyed by profile content hash"""
+
+    def __init__(self, max_entries: int = 64):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, ProfileIndex]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, content_hash: str) -> Optional[ProfileIndex]:
+        with self._lock:
+            index = self._entries.get(content_hash)
+            if index is not None:
+                self._entries.move_to_end(content_hash)
+            return index
+
+    def put(self, index: ProfileIndex) -> None:
+        with self._lock:
+            self._entries[index.content_hash] = index
+            self._entries.move_to_end(index.content_hash)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+# Shared by all sessions and worker threads in this process
+profile_index_cache = _ProfileIndexCache()
+
+
+def get_profile_index(profile: Dict[str, Any], content_hash: Optional[str] = None) -> ProfileIndex:
+    """Return the ProfileIndex for profile, building it only if its content is new"""
+    if content_hash is None:
+        content_hash = profile_content_hash(profile)
+    index = profile_index_cache.get(content_hash)
+    if index is None:
+        index = ProfileIndex.from_profile(profile, content_hash)
+        profile_index_cache.put(index)
+    return index
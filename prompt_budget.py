@@ -0,0 +1,273 @@
+"""
+Token-budgeted prompt assembly.
+
+Prompts used to cut their inputs at fixed character offsets
+(raw_posting[:5000], description[:800]) and pasted the profile's experience
+in full, so long postings lost their requirements section while big profiles
+could overflow the model's context. PromptBudget instead gives each task a
+token budget, capped by the model's context window from the catalog, splits
+it across the prompt's sections, and fills every section with its most
+relevant parts (requirement lines of a posting, experience bullets that
+mention the job's terms) rather than its first N characters.
+
+Token counts come from a local estimator that errs slightly high, so no
+tokenizer download or API call is needed.
+"""
+
+import json
+import math
+import re
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+DEFAULT_CONTEXT_WINDOW = 8192
+
+# Largest share of the context window any single prompt may use; the rest is
+# left for the completion and the system message
+MAX_CONTEXT_SHARE = 0.6
+
+# Token budget per task for the system prompt and the variable inputs (posting,
+# skills, experience), before the context-window cap; the fixed instruction
+# text of each prompt comes on top
+TASK_BUDGETS = {
+    "job_extraction": 1600,
+    "job_requirements": 1600,
+    "cover_letter": 1400,
+    "resume_bullets": 1400,
+}
+
+_TOKEN_RE = re.compile(r"\w+|[^\w\s]", re.UNICODE)
+_TERM_RE = re.compile(r"[a-z0-9][a-z0-9+#./-]*")
+
+STOPWORDS = frozenset("""
+a an and are as at be by for from has have in is it its of on or our that the this to we will with you your
+experience work working team ability strong excellent including years year role job position candidate
+""".split())
+
+
+def estimate_tokens(text: str) -> int:
+    """Approximate BPE token count: words cost about one token per four characters, punctuation one each"""
+    if not text:
+        return 0
+    return sum(max(1, math.ceil(len(piece) / 4)) for piece in _TOKEN_RE.findall(text))
+
+
+def context_window_for(model: str, catalog: Optional[Iterable[Dict[str, Any]]]) -> int:
+    """Context length of model from the OpenRouter catalog, or DEFAULT_CONTEXT_WINDOW"""
+    for entry in catalog or []:
+        if entry.get("id") == model:
+            try:
+                return int(entry.get("context_length") or DEFAULT_CONTEXT_WINDOW)
+            except (TypeError, ValueError):
+                break
+    return DEFAULT_CONTEXT_WINDOW
+
+
+def key_terms(*texts: Any) -> frozenset:
+    """Lowercased content words of texts (strings or lists of strings), for relevance scoring"""
+    terms = set()
+    for text in texts:
+        if isinstance(text, (list, tuple)):
+            terms |= key_terms(*text)
+        elif text:
+            terms.update(term for term in _TERM_RE.findall(str(text).lower()) if len(term) > 2 and term not in STOPWORDS)
+    return frozenset(terms)
+
+
+def term_overlap(text: str, terms: frozenset) -> float:
+    if not terms:
+        return 0.0
+    return float(len(key_terms(text) & terms))
+
+
+# Words that mark the parts of a posting the model needs most
+_POSTING_KEYWORDS = re.compile(
+    r"\b(require|requirement|qualification|must|skill|experience (?:with|in)|proficien|knowledge of|degree|"
+    r"responsibilit|you will|you'll|familiar|expert|years of|nice to have|preferred|bonus)", re.IGNORECASE
+)
+
+
+def posting_line_score(index: int, line: str) -> float:
+    """Relevance of a posting line: requirement-like lines and bullets first, then the opening lines (title, company)"""
+    score = 0.0
+    if _POSTING_KEYWORDS.search(line):
+        score += 3.0
+    if re.match(r"\s*([-*•·▪●]|\d+[.)])\s+", line):
+        score += 1.5
+    if index < 5:
+        score += 4.0 - 0.5 * index
+    return score
+
+
+def select_by_relevance(
+    items: Sequence[str],
+    budget: int,
+    score: Callable[[int, str], float],
+    separator: str = "\n"
+) -> Tuple[List[int], int]:
+    """Indexes of the highest-scoring items that fit in budget tokens, in original order.
+
+    Ties keep document order. Returns (indexes, tokens used).
+    """
+    separator_cost = estimate_tokens(separator)
+    ranked = sorted(range(len(items)), key=lambda i: (-score(i, items[i]), i))
+    chosen, used = [], 0
+    for i in ranked:
+        cost = estimate_tokens(items[i]) + separator_cost
+        if used + cost <= budget:
+            chosen.append(i)
+            used += cost
+    return sorted(chosen), used
+
+
+# Sentence ends, and bullets run together on one line
+_SENTENCE_SPLIT_RE = re.compile(r"(?<=[.!?;])\s+|\s+(?=[•·▪●]\s)")
+
+# Longest piece an over-budget sentence is cut into, so relevance still picks among its parts
+MAX_PIECE_TOKENS = 100
+
+
+def truncate_to_budget(text: str, budget: int) -> str:
+    """Leading words of text that fit in budget tokens; at least the start of the first word"""
+    words, used = [], 0
+    for word in text.split():
+        cost = estimate_tokens(word)
+        if used + cost > budget:
+            break
+        words.append(word)
+        used += cost
+    if words:
+        return " ".join(words)
+    return text.strip()[:max(1, budget) * 4]
+
+
+def _split_line(line: str, budget: int) -> List[str]:
+    """line as pieces of at most budget tokens: whole if it fits, else sentences, else runs of words"""
+    if estimate_tokens(line) <= budget:
+        return [line]
+    pieces = []
+    limit = max(1, min(budget, MAX_PIECE_TOKENS))
+    for sentence in _SENTENCE_SPLIT_RE.split(line):
+        if not sentence.strip():
+            continue
+        if estimate_tokens(sentence) <= limit:
+            pieces.append(sentence.strip())
+            continue
+        words, used = [], 0
+        for word in sentence.split():
+            cost = estimate_tokens(word)
+            if words and used + cost > limit:
+                pieces.append(" ".join(words))
+                words, used = [], 0
+            if cost > limit:
+                # A single token run longer than the budget (e.g. a long URL) is cut
+                word = word[:limit * 4]
+                cost = estimate_tokens(word)
+            words.append(word)
+            used += cost
+        if words:
+            pieces.append(" ".join(words))
+    return pieces
+
+
+def fit_text(text: str, budget: int, score: Callable[[int, str], float] = posting_line_score) -> str:
+    """Text trimmed to budget tokens by keeping its most relevant lines.
+
+    Lines longer than the whole budget (a posting pasted as one line) are
+    split into sentences first, so they compete piece by piece instead of
+    being dropped. Non-empty text never comes back empty.
+    """
+    if estimate_tokens(text) <= budget:
+        return text
+    pieces: List[str] = []
+    line_of: List[int] = []
+    for line_index, line in enumerate(line for line in text.splitlines() if line.strip()):
+        for piece in _split_line(line, budget):
+            pieces.append(piece)
+            line_of.append(line_index)
+    chosen, _ = select_by_relevance(pieces, budget, score)
+    if not chosen:
+        best = min(range(len(pieces)), key=lambda i: (-score(i, pieces[i]), i)) if pieces else None
+        return truncate_to_budget(pieces[best], budget) if best is not None else text.strip()[:max(1, budget) * 4]
+    # Pieces of the same line rejoin with a space, lines with a newline
+    parts = [pieces[chosen[0]]]
+    for previous, i in zip(chosen, chosen[1:]):
+        parts.append((" " if line_of[i] == line_of[previous] else "\n") + pieces[i])
+    return "".join(parts)
+
+
+def fit_list(items: Sequence[str], budget: int, terms: frozenset) -> List[str]:
+    """Items (e.g. skills) most related to terms that fit in budget tokens, in original order"""
+    items = [str(item) for item in items]
+    if estimate_tokens(json.dumps(items)) <= budget:
+        return items
+    chosen, _ = select_by_relevance(items, budget, lambda i, item: term_overlap(item, terms), separator='", "')
+    return [items[i] for i in chosen]
+
+
+def fit_experience(experience: List[Dict[str, Any]], budget: int, terms: frozenset) -> List[Dict[str, Any]]:
+    """Experience entries trimmed to budget tokens of JSON.
+
+    Every role keeps its company, position and duration; responsibilities and
+    achievements compete for the remaining budget by overlap with terms, so
+    the bullets that speak to the job survive.
+    """
+    if estimate_tokens(json.dumps(experience)) <= budget:
+        return experience
+
+    skeleton = []
+    bullets: List[Tuple[int, str, str]] = []
+    for entry_index, entry in enumerate(experience):
+        if not isinstance(entry, dict):
+            continue
+        skeleton.append({key: value for key, value in entry.items() if key not in ("responsibilities", "achievements")})
+        for field in ("achievements", "responsibilities"):
+            for bullet in entry.get(field) or []:
+                bullets.append((len(skeleton) - 1, field, str(bullet)))
+
+    remaining = budget - estimate_tokens(json.dumps(skeleton))
+    texts = [text for _, _, text in bullets]
+    # Achievements get a small bonus over responsibilities at equal relevance
+    chosen, _ = select_by_relevance(
+        texts, max(0, remaining),
+        lambda i, text: term_overlap(text, terms) + (0.5 if bullets[i][1] == "achievements" else 0.0),
+        separator='", "'
+    )
+    for i in chosen:
+        entry_index, field, text = bullets[i]
+        skeleton[entry_index].setdefault(field, []).append(text)
+    return skeleton
+
+
+class PromptBudget:
+    """Token budget for one prompt, split across its variable sections.
+
+    The budget is the task's allowance capped by MAX_CONTEXT_SHARE of the
+    model's context window, minus the fixed instructions. allocate() divides
+    what's left by weight; a section needing less than its share hands the
+    rest to the others.
+    """
+
+    def __init__(self, task: str, context_window: int = DEFAULT_CONTEXT_WINDOW, instructions: str = ""):
+        self.task = task
+        self.context_window = context_window
+        limit = min(TASK_BUDGETS.get(task, 1500), int(context_window * MAX_CONTEXT_SHARE))
+        self.total = max(0, limit - estimate_tokens(instructions))
+
+    def allocate(self, sections: Dict[str, Tuple[float, int]]) -> Dict[str, int]:
+        """Budgets for sections given {name: (weight, tokens it would use untrimmed)}"""
+        budgets = {name: 0 for name in sections}
+        pending = dict(sections)
+        remaining = self.total
+        while pending and remaining > 0:
+            total_weight = sum(weight for weight, _ in pending.values()) or 1.0
+            shares = {name: int(remaining * weight / total_weight) for name, (weight, _) in pending.items()}
+            # Sections that fit in their share take only what they need
+            satisfied = {name for name, (_, need) in pending.items() if need <= shares[name]}
+            if not satisfied:
+                budgets.update(shares)
+                break
+            for name in satisfied:
+                budgets[name] = pending[name][1]
+                remaining -= pending[name][1]
+                del pending[name]
+        return budgets
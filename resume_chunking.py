@@ -0,0 +1,216 @@
+"""
+Chunked (map-reduce) profile extraction helpers.
+
+Profile extraction used to send only the first 7000-10000 characters of a
+document to the model, silently dropping the rest of long CVs. Instead, the
+document is split on section boundaries into prompt-sized chunks, each chunk
+is extracted separately (concurrently, by the caller), and the partial
+profiles are merged here. Merging is deterministic: chunk order decides which
+value wins, and list entries are deduplicated case-insensitively.
+"""
+
+import json
+import re
+from typing import Any, Dict, Iterable, List, Optional
+
+# Headings that start a new resume section
+SECTION_HEADINGS = (
+    "summary", "profile", "about", "objective", "contact", "experience", "work experience",
+    "employment", "employment history", "work history", "professional experience", "career history",
+    "education", "skills", "technical skills", "core skills", "competencies", "projects",
+    "selected projects", "portfolio", "certifications", "certificates", "awards", "publications",
+    "languages", "interests", "volunteering", "references",
+)
+
+_HEADING_RE = re.compile(r"^[#*\s]*([A-Za-z][A-Za-z &/]{1,40}?)[\s:*]*$")
+
+
+def is_section_heading(line: str) -> bool:
+    """True for lines like "EXPERIENCE", "Work History:" or "## Skills\""""
+    stripped = line.strip()
+    if not stripped or len(stripped) > 45:
+        return False
+    match = _HEADING_RE.match(stripped)
+    if not match:
+        return False
+    words = match.group(1).strip().lower()
+    return words in SECTION_HEADINGS or (stripped.isupper() and len(words.split()) <= 4)
+
+
+def split_sections(text: str) -> List[str]:
+    """Split text before each section heading; the text before the first heading is its own section"""
+    sections: List[List[str]] = [[]]
+    for line in text.splitlines():
+        if is_section_heading(line) and any(l.strip() for l in sections[-1]):
+            sections.append([])
+        sections[-1].append(line)
+    return ["\n".join(lines).strip() for lines in sections if any(l.strip() for l in lines)]
+
+
+def _split_oversized(section: str, max_chars: int) -> List[str]:
+    """Split text longer than max_chars at line boundaries (hard-splitting only overlong lines)"""
+    pieces: List[str] = []
+    current = ""
+    for line in section.split("\n"):
+        while len(line) > max_chars:
+            if current:
+                pieces.append(current)
+                current = ""
+            pieces.append(line[:max_chars])
+            line = line[max_chars:]
+        candidate = f"{current}\n{line}" if current else line
+        if len(candidate) <= max_chars:
+            current = candidate
+        else:
+            pieces.append(current)
+            current = line
+    if current:
+        pieces.append(current)
+    return pieces
+
+
+def chunk_document(text: str, max_chars: int = 7000, max_chunks: Optional[int] = None) -> List[str]:
+    """Pack whole sections into chunks of at most max_chars characters.
+
+    A section is only split when it is longer than max_chars on its own. If
+    max_chunks is set, chunks beyond it are dropped.
+    """
+    chunks: List[str] = []
+    current = ""
+    for section in split_sections(text):
+        candidate = f"{current}\n\n{section}" if current else section
+        if len(candidate) <= max_chars:
+            current = candidate
+        elif len(section) <= max_chars:
+            chunks.append(current)
+            current = section
+        else:
+            # Oversized section: top up the current chunk with its start rather than leave a tiny chunk
+            parts = _split_oversized(candidate, max_chars)
+            chunks.extend(parts[:-1])
+            current = parts[-1]
+    if current:
+        chunks.append(current)
+    return chunks[:max_chunks] if max_chunks is not None else chunks
+
+
+def _norm(value: Any) -> str:
+    if isinstance(value, str):
+        return " ".join(value.lower().split())
+    return json.dumps(value, sort_keys=True, ensure_ascii=False).lower()
+
+
+def _is_empty(value: Any) -> bool:
+    return value is None or value == "" or value == [] or value == {}
+
+
+def _dedupe(items: Iterable[Any]) -> List[Any]:
+    seen, unique = set(), []
+    for item in items:
+        if _is_empty(item):
+            continue
+        key = _norm(item)
+        if key not in seen:
+            seen.add(key)
+            unique.append(item)
+    return unique
+
+
+def _entry_key(entry: Dict[str, Any], fields: Iterable[str]) -> Optional[str]:
+    values = [_norm(entry.get(field, "")) for field in fields]
+    return "|".join(values) if any(values) else None
+
+
+def _merge_entries(entries: Iterable[Any], key_fields: List[List[str]]) -> List[Any]:
+    """Merge list-of-dict entries (jobs, degrees) that describe the same thing.
+
+    Entries match on the first field group they have values for (e.g. company
+    and position). Matching entries are combined: list fields are unioned and
+    other fields keep their first non-empty value.
+    """
+    merged: List[Any] = []
+    index: Dict[str, Dict[str, Any]] = {}
+    for entry in entries:
+        if not isinstance(entry, dict):
+            merged.append(entry)
+            continue
+        key = None
+        for fields in key_fields:
+            key = _entry_key(entry, fields)
+            if key is not None:
+                key = "/".join(fields) + ":" + key
+                break
+        target = index.get(key) if key is not None else None
+        if target is None:
+            target = {}
+            merged.append(target)
+            if key is not None:
+                index[key] = target
+        _merge_dict_into(target, entry)
+    return _dedupe(merged)
+
+
+def _merge_dict_into(target: Dict[str, Any], source: Dict[str, Any]) -> None:
+    for field, value in source.items():
+        if _is_empty(value):
+            target.setdefault(field, value)
+        elif isinstance(value, list):
+            target[field] = _dedupe(list(target.get(field) or []) + value)
+        elif isinstance(value, dict) and isinstance(target.get(field), dict):
+            _merge_dict_into(target[field], value)
+        elif _is_empty(target.get(field)):
+            target[field] = value
+
+
+def _merge_skills(values: List[Any]) -> Any:
+    """Union skills across chunks; categorised if any chunk categorised them"""
+    if not any(isinstance(value, dict) for value in values):
+        flat: List[Any] = []
+        for value in values:
+            flat.extend(value if isinstance(value, list) else [value])
+        return _dedupe(flat)
+
+    categories: Dict[str, List[Any]] = {}
+    for value in values:
+        if isinstance(value, dict):
+            for category, skills in value.items():
+                categories.setdefault(category, []).extend(skills if isinstance(skills, list) else [skills])
+        else:
+            categories.setdefault("general", []).extend(value if isinstance(value, list) else [value])
+    return {category: _dedupe(skills) for category, skills in categories.items()}
+
+
+# Fields that identify the same job or degree across chunks, in order of preference
+EXPERIENCE_KEYS = [["company", "position"], ["company", "title"], ["company", "role"], ["position"], ["title"]]
+EDUCATION_KEYS = [["institution", "degree"], ["school", "degree"], ["institution"], ["school"], ["degree"]]
+
+
+def merge_profiles(partials: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+    """Merge partial profiles extracted from consecutive chunks into one profile"""
+    partials = [partial for partial in partials if isinstance(partial, dict)]
+    merged: Dict[str, Any] = {}
+    for field in _dedupe_keys(partials):
+        values = [partial[field] for partial in partials if not _is_empty(partial.get(field))]
+        if not values:
+            merged[field] = partials[0].get(field) if partials else None
+        elif field == "skills":
+            merged[field] = _merge_skills(values)
+        elif field == "experience" and all(isinstance(v, list) for v in values):
+            merged[field] = _merge_entries([entry for v in values for entry in v], EXPERIENCE_KEYS)
+        elif field == "education" and all(isinstance(v, list) for v in values):
+            merged[field] = _merge_entries([entry for v in values for entry in v], EDUCATION_KEYS)
+        elif all(isinstance(v, list) for v in values):
+            merged[field] = _dedupe([item for v in values for item in v])
+        elif all(isinstance(v, dict) for v in values):
+            combined: Dict[str, Any] = {}
+            for value in values:
+                _merge_dict_into(combined, value)
+            merged[field] = combined
+        else:
+            merged[field] = values[0]
+    return merged
+
+
+def _dedupe_keys(partials: List[Dict[str, Any]]) -> List[str]:
+    """Top-level fields in first-seen order"""
+    return list(dict.fromkeys(field for partial in partials for field in partial))
@@ -0,0 +1,157 @@
+"""
+Multi-pattern skill matching for job requirements.
+
+A requirement counts as covered by the profile's skills when some skill
+occurs inside it, or it occurs inside some skill (case-insensitive). Checking
+that with a loop over every skill for every requirement is
+O(requirements x skills), which collapses on merged professional-database
+profiles with thousands of components. SkillMatcher answers both questions in
+time linear in the requirement's length:
+
+- "skill in requirement" is an Aho-Corasick scan of the requirement over an
+  automaton built once from all skills.
+- "requirement in skill" is one substring search over all skills joined with
+  a separator that cannot occur inside a skill.
+
+Below SCAN_MAX_SKILLS skills the plain loop is faster than the automaton (and
+needs no build), so small profiles are still scanned skill by skill.
+"""
+
+from collections import deque
+from typing import Dict, Iterable, List, Optional, Tuple
+
+_SEPARATOR = "\x00"
+
+# Profiles with at most this many skills are scanned directly; the automaton
+# overtakes the loop at about 25-30 skills for a posting's requirements
+SCAN_MAX_SKILLS = 24
+
+
+class AhoCorasick:
+    """Aho-Corasick automaton reporting whether (and which) pattern occurs in a text"""
+
+    def __init__(self, patterns: Iterable[str]):
+        self.patterns: List[str] = []
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        # Index of a pattern ending at this state (directly or via fail links), or -1
+        self._output: List[int] = [-1]
+
+        for pattern in patterns:
+            if pattern:
+                self._insert(pattern)
+        self._build_fail_links()
+
+    def _insert(self, pattern: str) -> None:
+        state = 0
+        for ch in pattern:
+            next_state = self._goto[state].get(ch)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append(-1)
+                self._goto[state][ch] = next_state
+            state = next_state
+        if self._output[state] == -1:
+            self._output[state] = len(self.patterns)
+        self.patterns.append(pattern)
+
+    def _build_fail_links(self) -> None:
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fail = self._fail[state]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                target = self._goto[fail].get(ch, 0)
+                self._fail[next_state] = target if target != next_state else 0
+                if self._output[next_state] == -1:
+                    self._output[next_state] = self._output[self._fail[next_state]]
+
+    def search(self, text: str) -> Optional[str]:
+        """Return the first pattern found in text, or None"""
+        goto, fail, output = self._goto, self._fail, self._output
+        state = 0
+        for ch in text:
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if output[state] != -1:
+                return self.patterns[output[state]]
+        return None
+
+
+class SkillMatcher:
+    """Answers "is this requirement covered by any skill?" without scanning every skill"""
+
+    def __init__(self, skills_lower: Iterable[str], scan_max_skills: int = SCAN_MAX_SKILLS):
+        skills = [skill.replace(_SEPARATOR, "") for skill in skills_lower if skill]
+        self._skills = skills
+        self._automaton: Optional[AhoCorasick] = None
+        if len(skills) > scan_max_skills:
+            self._automaton = AhoCorasick(skills)
+            self._joined = _SEPARATOR + _SEPARATOR.join(skills) + _SEPARATOR
+
+    def matching_skill(self, requirement_lower: str) -> Optional[str]:
+        """Return a skill that covers the (lowercased) requirement, or None.
+
+        An empty requirement occurs in every skill, so it is covered by the
+        first one, as in the former nested loop.
+        """
+        if not requirement_lower:
+            return self._skills[0] if self._skills else None
+        if self._automaton is None:
+            for skill in self._skills:
+                if skill in requirement_lower or requirement_lower in skill:
+                    return skill
+            return None
+        skill = self._automaton.search(requirement_lower)
+        if skill is not None:
+            return skill
+        position = self._joined.find(requirement_lower.replace(_SEPARATOR, ""))
+        if position == -1:
+            return None
+        start = self._joined.rfind(_SEPARATOR, 0, position) + 1
+        end = self._joined.find(_SEPARATOR, position)
+        return self._joined[start:end]
+
+    def matches(self, requirement_lower: str) -> bool:
+        return self.matching_skill(requirement_lower) is not None
+
+
+def match_requirements(
+    requirements: Iterable[str],
+    profile_index,
+    semantic_threshold: Optional[float] = None
+) -> Tuple[List[str], List[str]]:
+    """Split requirements into (matching, missing) against a ProfileIndex.
+
+    A requirement matches if a skill covers it by substring; otherwise, when
+    semantic_threshold is set, if its n-gram similarity to some skill reaches
+    the threshold; otherwise if any of its words longer than three characters
+    appears in the experience text. Order within each list follows requirements.
+    """
+    requirements = list(requirements)
+    matcher = profile_index.matcher
+    covered = [matcher.matches(req.lower()) for req in requirements]
+
+    if semantic_threshold is not None and profile_index.skills:
+        # Score every still-unmatched requirement in a single matrix product
+        pending = [i for i, ok in enumerate(covered) if not ok]
+        if pending:
+            matches = profile_index.semantic_matcher.best_matches(
+                [requirements[i] for i in pending], threshold=semantic_threshold
+            )
+            for i, match in zip(pending, matches):
+                covered[i] = match is not None
+
+    matching, missing = [], []
+    for req, ok in zip(requirements, covered):
+        if not ok:
+            key_terms = [term.strip() for term in req.lower().split() if len(term.strip()) > 3]
+            ok = any(profile_index.mentions_term(term) for term in key_terms)
+        (matching if ok else missing).append(req)
+    return matching, missing
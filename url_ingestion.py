@@ -0,0 +1,228 @@
+"""
+Concurrent ingestion of job posting URLs.
+
+The site parsers in parsers.py each fetched their page with a one-off
+requests.get: no connection reuse, no timeout, and nothing stopping a batch
+of links from hitting one job board with every request at once. UrlIngestor
+fetches pages over one pooled session on a thread pool and hands the HTML to
+the parser chosen by get_appropriate_parser().
+
+Each domain gets its own limits: at most max_per_domain requests in flight
+and at least min_interval seconds between request starts, and a 429/503 with
+Retry-After holds back the domain's queued requests rather than retrying
+straight away. Every fetch has connect/read timeouts plus an overall deadline
+for the whole body, and bodies larger than max_bytes are rejected.
+
+With a PageCache attached, pages are fetched with conditional GETs and a 304
+Not Modified answer returns the job data parsed last time.
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+from typing import Any, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from page_cache import PageCache
+from parsers import DEFAULT_TIMEOUT, HEADERS, PARSER_VERSION, get_appropriate_parser
+
+# Statuses that ask us to slow down; their Retry-After delays the whole domain
+THROTTLE_STATUS_CODES = {429, 503}
+
+# Longest Retry-After we honour, in seconds
+MAX_RETRY_AFTER = 60.0
+
+
+class UrlFetchError(Exception):
+    """Raised when a job page can't be fetched (bad URL, deadline, size limit)"""
+
+
+def domain_of(url: str) -> str:
+    """Host of url without a leading www., used as the rate-limit key"""
+    host = urlparse(url).netloc.lower()
+    return host[4:] if host.startswith("www.") else host
+
+
+class DomainLimiter:
+    """Per-domain concurrency cap and minimum spacing between request starts.
+
+    Thread-safe. acquire() blocks until the domain has a free slot and its
+    next start time has passed; release() frees the slot.
+    """
+
+    def __init__(self, max_per_domain: int = 2, min_interval: float = 1.0):
+        self.max_per_domain = max_per_domain
+        self.min_interval = min_interval
+        self._active: Dict[str, int] = {}
+        self._next_start: Dict[str, float] = {}
+        self._condition = threading.Condition()
+
+    def acquire(self, domain: str) -> None:
+        with self._condition:
+            while True:
+                now = time.monotonic()
+                wait = self._next_start.get(domain, 0.0) - now
+                if self._active.get(domain, 0) < self.max_per_domain and wait <= 0:
+                    self._active[domain] = self._active.get(domain, 0) + 1
+                    self._next_start[domain] = now + self.min_interval
+                    return
+                self._condition.wait(timeout=wait if wait > 0 else None)
+
+    def release(self, domain: str) -> None:
+        with self._condition:
+            self._active[domain] -= 1
+            if not self._active[domain]:
+                del self._active[domain]
+            self._condition.notify_all()
+
+    def defer(self, domain: str, seconds: float) -> None:
+        """Hold back the domain's next request start by seconds (e.g. from Retry-After)"""
+        with self._condition:
+            self._next_start[domain] = max(self._next_start.get(domain, 0.0), time.monotonic() + seconds)
+            self._condition.notify_all()
+
+
+class FetchedPage(NamedTuple):
+    status: int
+    body: bytes
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+
+
+def _retry_after_seconds(value: Optional[str]) -> Optional[float]:
+    try:
+        return min(max(float(value), 0.0), MAX_RETRY_AFTER) if value is not None else None
+    except ValueError:
+        return None
+
+
+class UrlIngestor:
+    """Fetches and parses job posting URLs concurrently over one pooled session.
+
+    Thread-safe; one instance is shared by all sessions in the process, so the
+    per-domain limits also hold across users.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = 8,
+        max_per_domain: int = 2,
+        min_interval: float = 1.0,
+        timeout: Tuple[float, float] = DEFAULT_TIMEOUT,
+        deadline: float = 30.0,
+        max_bytes: int = 5 * 1024 * 1024,
+        session: Optional[requests.Session] = None,
+        page_cache: Optional[PageCache] = None
+    ):
+        self.max_workers = max_workers
+        self.page_cache = page_cache
+        self.timeout = timeout
+        self.deadline = deadline
+        self.max_bytes = max_bytes
+        self.limiter = DomainLimiter(max_per_domain, min_interval)
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=max_workers, pool_maxsize=max_workers)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+        session.headers.update(HEADERS)
+        self.session = session
+
+    def fetch(self, url: str, headers: Optional[Dict[str, str]] = None) -> FetchedPage:
+        """Page at url, within the domain's limits, the timeouts and the size cap.
+
+        headers are added to the request (e.g. conditional headers); a 304
+        comes back as a FetchedPage with an empty body.
+        """
+        if urlparse(url).scheme not in ("http", "https"):
+            raise UrlFetchError(f"Not an http(s) URL: {url}")
+        domain = domain_of(url)
+        self.limiter.acquire(domain)
+        try:
+            with self.session.get(url, headers=headers, timeout=self.timeout, stream=True) as response:
+                if response.status_code in THROTTLE_STATUS_CODES:
+                    retry_after = _retry_after_seconds(response.headers.get("Retry-After"))
+                    if retry_after:
+                        self.limiter.defer(domain, retry_after)
+                response.raise_for_status()
+                body = b"" if response.status_code == 304 else self._read_body(response)
+                return FetchedPage(
+                    response.status_code, body,
+                    response.headers.get("ETag"), response.headers.get("Last-Modified")
+                )
+        finally:
+            self.limiter.release(domain)
+
+    def _read_body(self, response: requests.Response) -> bytes:
+        # The read timeout only bounds the gap between chunks, so a slow-dripping
+        # server is cut off by the overall deadline instead
+        give_up = time.monotonic() + self.deadline
+        body = bytearray()
+        for chunk in response.iter_content(chunk_size=65536):
+            body.extend(chunk)
+            if len(body) > self.max_bytes:
+                raise UrlFetchError(f"Page is larger than {self.max_bytes // 1024} KiB: {response.url}")
+            if time.monotonic() > give_up:
+                raise UrlFetchError(f"Page took longer than {self.deadline:.0f}s to download: {response.url}")
+        return bytes(body)
+
+    def ingest(self, url: str) -> Dict[str, Any]:
+        """Fetch url and parse it with the matching site parser into job data.
+
+        With a page cache, an unchanged page (304) returns the stored parse,
+        or re-parses the stored body if it was parsed by an older parser.
+        """
+        parser = get_appropriate_parser(url)
+        parser_key = f"{parser.__name__}/{PARSER_VERSION}"
+        cached = self.page_cache.get(url) if self.page_cache is not None else None
+        page = self.fetch(url, cached.conditional_headers() if cached is not None else None)
+
+        if page.status == 304 and cached is not None:
+            if cached.parser == parser_key and cached.parsed is not None:
+                job_data = cached.parsed
+                self.page_cache.revalidated(url)
+            else:
+                job_data = parser(url, cached.body)
+                self.page_cache.revalidated(url, parser_key, job_data)
+        else:
+            job_data = parser(url, page.body)
+            # Without validators the page can't be revalidated, so it isn't worth storing
+            if self.page_cache is not None and (page.etag or page.last_modified):
+                self.page_cache.put(url, page.body, page.etag, page.last_modified, parser_key, job_data)
+        return dict(job_data, date_found=datetime.now().strftime("%Y-%m-%d"))
+
+    def ingest_many(self, urls: Iterable[str]) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """Yield (url, job data) as each page is parsed, in completion order.
+
+        Failures are yielded as {"error": message} instead of raised.
+        Duplicate URLs are fetched once.
+        """
+        urls = list(dict.fromkeys(url.strip() for url in urls if url and url.strip()))
+        if not urls:
+            return
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(urls))) as executor:
+            futures = {executor.submit(self.ingest, url): url for url in urls}
+            for future in as_completed(futures):
+                url = futures[future]
+                try:
+                    result = future.result()
+                except Exception as e:
+                    result = {"error": f"Error fetching {url}: {str(e)}"}
+                yield url, result
+
+    def close(self) -> None:
+        self.session.close()
+
+
+def parse_url_list(text: str) -> List[str]:
+    """http(s) URLs from text, one per line (other lines are ignored), without duplicates"""
+    urls = [line.strip() for line in (text or "").splitlines()]
+    return list(dict.fromkeys(url for url in urls if url.startswith(("http://", "https://"))))
+
+
+# Shared by all sessions in this process
+url_ingestor = UrlIngestor()